@@ -17,6 +17,8 @@ from app.models.user import User
 from app.models.video import Video
 from app.models.event import Event
 from app.models.comment import Comment
+from app.models.job import Job
+from app.models.upload_session import UploadSession
 
 # Load environment variables
 load_dotenv()
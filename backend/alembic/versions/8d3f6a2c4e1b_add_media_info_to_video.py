@@ -0,0 +1,34 @@
+"""add_media_info_to_video
+
+Revision ID: 8d3f6a2c4e1b
+Revises: 5c1e2f0a9b7d
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f6a2c4e1b'
+down_revision: Union[str, None] = '5c1e2f0a9b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('video', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('video', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('video', sa.Column('video_codec', sa.String(length=50), nullable=True))
+    op.add_column('video', sa.Column('bitrate', sa.Integer(), nullable=True))
+    op.add_column('video', sa.Column('keyframe_interval', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video', 'keyframe_interval')
+    op.drop_column('video', 'bitrate')
+    op.drop_column('video', 'video_codec')
+    op.drop_column('video', 'height')
+    op.drop_column('video', 'width')
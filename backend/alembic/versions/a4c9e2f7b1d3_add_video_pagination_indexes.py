@@ -0,0 +1,28 @@
+"""add_video_pagination_indexes
+
+Revision ID: a4c9e2f7b1d3
+Revises: f3b8d6e1a5c7
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e2f7b1d3'
+down_revision: Union[str, None] = 'f3b8d6e1a5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One index per branch of the public-or-own filter, both in (created_at, id) order
+    op.create_index('ix_video_visibility_created_at_id', 'video', ['visibility', 'created_at', 'id'], unique=False)
+    op.create_index('ix_video_user_id_created_at_id', 'video', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_video_user_id_created_at_id', table_name='video')
+    op.drop_index('ix_video_visibility_created_at_id', table_name='video')
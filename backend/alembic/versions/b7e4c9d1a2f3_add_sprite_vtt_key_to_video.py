@@ -0,0 +1,26 @@
+"""add_sprite_vtt_key_to_video
+
+Revision ID: b7e4c9d1a2f3
+Revises: 8d3f6a2c4e1b
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c9d1a2f3'
+down_revision: Union[str, None] = '8d3f6a2c4e1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('video', sa.Column('sprite_vtt_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video', 'sprite_vtt_key')
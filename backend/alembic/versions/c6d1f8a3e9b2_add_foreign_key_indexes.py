@@ -0,0 +1,40 @@
+"""add_foreign_key_indexes
+
+Revision ID: c6d1f8a3e9b2
+Revises: a4c9e2f7b1d3
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d1f8a3e9b2'
+down_revision: Union[str, None] = 'a4c9e2f7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# video.user_id is already the leading column of ix_video_user_id_created_at_id
+INDEXES = [
+    ('ix_comment_video_id_created_at', 'comment', ['video_id', 'created_at']),
+    ('ix_comment_event_id_created_at', 'comment', ['event_id', 'created_at']),
+    ('ix_comment_parent_id', 'comment', ['parent_id']),
+    ('ix_comment_user_id', 'comment', ['user_id']),
+    ('ix_event_video_id_video_timestamp', 'event', ['video_id', 'video_timestamp']),
+    ('ix_event_user_id', 'event', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so comment and event stay writable on a live database
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""add_comment_timeline_index
+
+Revision ID: d8e3a1c5f7b9
+Revises: c6d1f8a3e9b2
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e3a1c5f7b9'
+down_revision: Union[str, None] = 'c6d1f8a3e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # event (video_id, video_timestamp) already exists; comments need the same for time-window queries
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_comment_video_id_video_timestamp', 'comment', ['video_id', 'video_timestamp'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_comment_video_id_video_timestamp', table_name='comment', postgresql_concurrently=True)
@@ -0,0 +1,26 @@
+"""add_hls_master_key_to_video
+
+Revision ID: e2a7c5b9d4f6
+Revises: b7e4c9d1a2f3
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5b9d4f6'
+down_revision: Union[str, None] = 'b7e4c9d1a2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('video', sa.Column('hls_master_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video', 'hls_master_key')
@@ -0,0 +1,28 @@
+"""add_job_dedupe_key
+
+Revision ID: e9f4b2c7d1a8
+Revises: d8e3a1c5f7b9
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9f4b2c7d1a8'
+down_revision: Union[str, None] = 'd8e3a1c5f7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('dedupe_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('uq_job_dedupe_key', 'job', ['dedupe_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_job_dedupe_key', 'job', type_='unique')
+    op.drop_column('job', 'dedupe_key')
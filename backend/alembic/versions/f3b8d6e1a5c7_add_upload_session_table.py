@@ -0,0 +1,37 @@
+"""add_upload_session_table
+
+Revision ID: f3b8d6e1a5c7
+Revises: e2a7c5b9d4f6
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d6e1a5c7'
+down_revision: Union[str, None] = 'e2a7c5b9d4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'uploadsession',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uploadsession_expires_at'), 'uploadsession', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_uploadsession_expires_at'), table_name='uploadsession')
+    op.drop_table('uploadsession')
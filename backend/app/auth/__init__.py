@@ -5,7 +5,10 @@ from .auth import (
     AUTH0_DOMAIN,
     AUTH0_AUDIENCE,
     ALGORITHMS,
-    security
+    security,
+    jwks_cache,
+    token_cache,
+    user_cache
 )
 
 __all__ = [
@@ -15,5 +18,8 @@ __all__ = [
     'AUTH0_DOMAIN',
     'AUTH0_AUDIENCE',
     'ALGORITHMS',
-    'security'
+    'security',
+    'jwks_cache',
+    'token_cache',
+    'user_cache'
 ] 
\ No newline at end of file
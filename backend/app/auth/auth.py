@@ -3,13 +3,19 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 import os
-import requests
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response, JSONResponse
+import re
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from ..db.database import get_db
 from ..models.user import User
+from .jwks import create_jwks_cache
+from .token_cache import create_token_cache
+from .user_cache import create_user_cache
+from ..services.http_client import get_http_session
 
 security = HTTPBearer()
 
@@ -17,9 +23,35 @@ security = HTTPBearer()
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
 AUTH0_AUDIENCE = os.getenv("AUTH0_AUDIENCE")
 ALGORITHMS = ["RS256"]
+AUTH0_USERINFO_URL = f"https://{AUTH0_DOMAIN}/userinfo"
 
-def get_token_payload(token: str):
+# Signing keys are cached in-process and only refetched on expiry or rotation
+jwks_cache = create_jwks_cache(AUTH0_DOMAIN)
+
+# Validated payloads are cached so a browser session's repeated token skips
+# signature verification and /userinfo calls until the token expires
+token_cache = create_token_cache()
+
+# User rows are cached by auth0_id to skip the per-request lookup query
+user_cache = create_user_cache()
+
+async def fetch_userinfo(token: str):
+    """Call Auth0 /userinfo on the shared async client, returns (status, body)"""
+    session = await get_http_session()
+    async with session.get(
+        AUTH0_USERINFO_URL,
+        headers={"Authorization": f"Bearer {token}"}
+    ) as response:
+        if response.status != 200:
+            return response.status, None
+        return response.status, await response.json()
+
+async def get_token_payload(token: str):
     """Verify and decode the JWT token or validate opaque token"""
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+
     try:
         # First, check if this is a JWT (has 3 parts separated by dots)
         token_parts = token.split('.')
@@ -37,35 +69,9 @@ def get_token_payload(token: str):
                 print(f"Error parsing token header: {str(e)}")
                 raise
             
-            # Fetch JWKS
-            try:
-                jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-                jwks_response = requests.get(jwks_url)
-                
-                if jwks_response.status_code != 200:
-                    raise ValueError(f"Failed to fetch JWKS: {jwks_response.status_code}")
-                    
-                jwks = jwks_response.json()
-            except Exception as e:
-                print(f"Error fetching JWKS: {str(e)}")
-                raise
-            
-            # Find the signing key in the JWKS
+            # Look up the signing key in the cached JWKS
             try:
-                rsa_key = {}
-                for key in jwks.get("keys", []):
-                    if key.get("kid") == kid:
-                        rsa_key = {
-                            "kty": key.get("kty"),
-                            "kid": key.get("kid"),
-                            "use": key.get("use"),
-                            "n": key.get("n"),
-                            "e": key.get("e")
-                        }
-                        break
-                                
-                if not rsa_key:
-                    raise ValueError(f"No matching key found for kid: {kid}")
+                rsa_key = await jwks_cache.get_key(kid)
             except Exception as e:
                 print(f"Error finding signing key: {str(e)}")
                 raise
@@ -88,38 +94,31 @@ def get_token_payload(token: str):
             if "email" not in payload and "sub" in payload:
                 try:
                     # Call userinfo endpoint to get additional user information
-                    userinfo_url = f"https://{AUTH0_DOMAIN}/userinfo"
-                    userinfo_response = requests.get(
-                        userinfo_url,
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
+                    status, userinfo = await fetch_userinfo(token)
                     
-                    if userinfo_response.status_code == 200:
-                        userinfo = userinfo_response.json()
+                    if status == 200:
                         # Add email to payload if available
                         if "email" in userinfo:
                             payload["email"] = userinfo["email"]
                 except Exception as e:
                     print(f"Error fetching userinfo: {str(e)}")
                     
+            token_cache.set(token, payload, is_jwt=True)
             return payload
         else:
             print("Processing token as opaque token")
             # For opaque tokens, we need to validate with Auth0's userinfo endpoint
-            userinfo_url = f"https://{AUTH0_DOMAIN}/userinfo"
-            response = requests.get(
-                userinfo_url,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+            status, payload = await fetch_userinfo(token)
             
-            if response.status_code != 200:
+            if status != 200:
                 raise HTTPException(
                     status_code=401,
-                    detail=f"Invalid token: Auth0 userinfo returned {response.status_code}"
+                    detail=f"Invalid token: Auth0 userinfo returned {status}"
                 )
                 
             # Return the userinfo as payload
-            return response.json()
+            token_cache.set(token, payload, is_jwt=False)
+            return payload
     except Exception as e:
         print(f"Token verification failed: {str(e)}")
         raise HTTPException(
@@ -127,27 +126,116 @@ def get_token_payload(token: str):
             detail=f"Invalid token: {str(e)}"
         )
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # Skip auth for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
-            
-        # Skip auth for public endpoints
-        if request.url.path in ["/docs", "/redoc", "/openapi.json", "/", "/api/v1/health"]:
-            return await call_next(request)
+# Paths that don't require a bearer token
+PUBLIC_PATHS = ["/docs", "/redoc", "/openapi.json", "/", "/api/v1/health"]
+
+# HLS playlists are fetched by the video element, which can't send a bearer
+# token; those routes check a signed query string from /stream instead
+SIGNED_PATH_PATTERN = re.compile(r"^/api/v1/videos/[^/]+/hls/")
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware that verifies the bearer token once per request.
+
+    The validated claims are stored on ``request.state.auth_claims`` so
+    get_current_user doesn't verify the token again. The request body is
+    never touched, which keeps large upload streams unbuffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Just check if token exists and has correct format
-        auth_header = request.headers.get("Authorization")
+        # Skip auth for OPTIONS requests (CORS preflight) and public endpoints
+        if (
+            scope["method"] == "OPTIONS"
+            or scope["path"] in PUBLIC_PATHS
+            or SIGNED_PATH_PATTERN.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = Headers(scope=scope).get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Missing or invalid token format"}
             )
-        
-        return await call_next(request)
+            await response(scope, receive, send)
+            return
+
+        try:
+            payload = await get_token_payload(auth_header[len("Bearer "):])
+        except HTTPException as e:
+            response = JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["auth_claims"] = payload
+        await self.app(scope, receive, send)
+
+def get_or_create_user(db: Session, auth0_id: str, email: str = None) -> User:
+    """
+    Fetch the user for an Auth0 ID, creating it on first login.
+    Runs synchronously, so async callers should use run_in_threadpool.
+    """
+    cached_user = user_cache.get(db, auth0_id)
+    if cached_user is not None:
+        return cached_user
+    
+    # Try to get existing user first
+    try:
+        user = db.query(User).filter(User.auth0_id == auth0_id).first()
+    except Exception as db_error:
+        print(f"Database error when querying for user: {str(db_error)}")
+        raise
+    
+    if not user:
+        try:
+            # Try to create new user
+            print(f"Creating new user with auth0_id: {auth0_id} and email: {email}")
+            
+            # Use a placeholder email if none is provided
+            if not email:
+                email = f"{auth0_id.replace('|', '-')}@placeholder.com"
+                print(f"Using placeholder email: {email}")
+            
+            # Generate a temporary username based on auth0_id
+            temp_username = f"user_{auth0_id.split('|')[-1]}"
+            print(f"Using temporary username: {temp_username}")
+            
+            user = User(
+                auth0_id=auth0_id,
+                email=email,
+                username=temp_username  # Add temporary username
+            )
+            db.add(user)
+            db.commit()
+            print("User successfully added to database and committed")
+            db.refresh(user)
+            print("User successfully refreshed")
+        except IntegrityError as e:
+            print(f"IntegrityError when creating user: {str(e)}")
+            db.rollback()
+            # Try to get the user again
+            user = db.query(User).filter(User.auth0_id == auth0_id).first()
+            if not user:
+                print("Failed to retrieve user after IntegrityError")
+                raise HTTPException(status_code=500, detail="Failed to create or retrieve user")
+            print(f"Retrieved user after IntegrityError: {user.auth0_id}")
+        except Exception as create_error:
+            print(f"Unexpected error when creating user: {str(create_error)}")
+            raise
+    
+    user_cache.set(user)
+    return user
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
     require_username: bool = True
@@ -162,9 +250,13 @@ async def get_current_user(
     try:
         token = credentials.credentials
         
+        # Reuse the claims AuthMiddleware already verified, if any
+        payload = getattr(request.state, "auth_claims", None) if request else None
+        
         # Verify and decode the token
         try:
-            payload = get_token_payload(token)
+            if payload is None:
+                payload = await get_token_payload(token)
         except Exception as token_error:
             print(f"Error decoding token: {str(token_error)}")
             raise
@@ -178,49 +270,8 @@ async def get_current_user(
             print(f"Available claims: {list(payload.keys())}")
             raise
         
-        # Try to get existing user first
-        try:
-            user = db.query(User).filter(User.auth0_id == auth0_id).first()
-        except Exception as db_error:
-            print(f"Database error when querying for user: {str(db_error)}")
-            raise
-        
-        if not user:
-            try:
-                # Try to create new user
-                print(f"Creating new user with auth0_id: {auth0_id} and email: {email}")
-                
-                # Use a placeholder email if none is provided
-                if not email:
-                    email = f"{auth0_id.replace('|', '-')}@placeholder.com"
-                    print(f"Using placeholder email: {email}")
-                
-                # Generate a temporary username based on auth0_id
-                temp_username = f"user_{auth0_id.split('|')[-1]}"
-                print(f"Using temporary username: {temp_username}")
-                
-                user = User(
-                    auth0_id=auth0_id,
-                    email=email,
-                    username=temp_username  # Add temporary username
-                )
-                db.add(user)
-                db.commit()
-                print("User successfully added to database and committed")
-                db.refresh(user)
-                print("User successfully refreshed")
-            except IntegrityError as e:
-                print(f"IntegrityError when creating user: {str(e)}")
-                db.rollback()
-                # Try to get the user again
-                user = db.query(User).filter(User.auth0_id == auth0_id).first()
-                if not user:
-                    print("Failed to retrieve user after IntegrityError")
-                    raise HTTPException(status_code=500, detail="Failed to create or retrieve user")
-                print(f"Retrieved user after IntegrityError: {user.auth0_id}")
-            except Exception as create_error:
-                print(f"Unexpected error when creating user: {str(create_error)}")
-                raise
+        # Look up (or create) the user off the event loop
+        user = await run_in_threadpool(get_or_create_user, db, auth0_id, email)
         
         # Check if username is required
         if require_username and not user.username:
@@ -0,0 +1,110 @@
+import os
+import asyncio
+import time
+from typing import Dict, Optional
+
+from ..services.http_client import get_http_session
+
+
+class JWKSCache:
+    """
+    In-process cache of Auth0 signing keys keyed by ``kid``.
+
+    Keys are served from memory until ``ttl`` expires. Shortly before expiry a
+    background task refreshes the key set so requests never wait on Auth0.
+    Expired keys keep being served while the refresh runs, and an unknown
+    ``kid`` (key rotation) triggers a forced, rate-limited refetch.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: int = 3600,
+        refresh_margin: int = 300,
+        min_refetch_interval: int = 30
+    ):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.min_refetch_interval = min_refetch_interval
+
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._fetch_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _fetch(self) -> None:
+        """Fetch the key set from Auth0 and replace the cached keys"""
+        self._last_fetch = time.time()
+        session = await get_http_session()
+        async with session.get(self.jwks_url) as response:
+            if response.status != 200:
+                raise ValueError(f"Failed to fetch JWKS: {response.status}")
+            jwks = await response.json()
+
+        keys = {}
+        for key in jwks.get("keys", []):
+            if key.get("kid"):
+                keys[key["kid"]] = {
+                    "kty": key.get("kty"),
+                    "kid": key.get("kid"),
+                    "use": key.get("use"),
+                    "n": key.get("n"),
+                    "e": key.get("e")
+                }
+
+        self._keys = keys
+        self._expires_at = time.time() + self.ttl
+        print(f"[JWKS] Cached {len(keys)} signing keys for {self.ttl}s")
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._fetch()
+        except Exception as e:
+            # Keep serving the keys we have; the next access retries
+            print(f"[JWKS] Background refresh failed: {str(e)}")
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def get_key(self, kid: str) -> dict:
+        """Return the RSA key for ``kid``, fetching the key set only when needed"""
+        key = self._keys.get(kid)
+
+        if key is not None:
+            if time.time() >= self._expires_at - self.refresh_margin:
+                self._schedule_refresh()
+            return key
+
+        # Unknown kid: either the cache is cold or Auth0 rotated its keys.
+        # Concurrent misses share one fetch, and refetches never happen more
+        # often than min_refetch_interval so bogus kids can't hammer Auth0.
+        if self._fetch_lock is None:
+            self._fetch_lock = asyncio.Lock()
+        async with self._fetch_lock:
+            key = self._keys.get(kid)
+            if key is None and (not self._keys or time.time() - self._last_fetch >= self.min_refetch_interval):
+                await self._fetch()
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise ValueError(f"No matching key found for kid: {kid}")
+        return key
+
+    def clear(self) -> None:
+        """Drop all cached keys"""
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+
+
+def create_jwks_cache(auth0_domain: Optional[str]) -> JWKSCache:
+    """Build the JWKS cache for an Auth0 tenant using environment overrides"""
+    return JWKSCache(
+        f"https://{auth0_domain}/.well-known/jwks.json",
+        ttl=int(os.getenv("JWKS_CACHE_TTL", "3600")),
+        refresh_margin=int(os.getenv("JWKS_REFRESH_MARGIN", "300")),
+        min_refetch_interval=int(os.getenv("JWKS_MIN_REFETCH_INTERVAL", "30"))
+    )
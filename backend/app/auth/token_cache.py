@@ -0,0 +1,97 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of validated token payloads.
+
+    Entries are keyed by a SHA-256 hash of the bearer token so raw tokens are
+    never kept in memory. JWT payloads expire at their ``exp`` claim, opaque
+    tokens (validated through /userinfo) after ``opaque_ttl`` seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, opaque_ttl: int = 60, max_ttl: int = 3600):
+        self.max_entries = max_entries
+        self.opaque_ttl = opaque_ttl
+        self.max_ttl = max_ttl
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload for ``token`` or None if missing/expired"""
+        key = self._hash(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def set(self, token: str, payload: dict, is_jwt: bool = True) -> None:
+        """Cache a validated payload until the token expires"""
+        now = time.time()
+        expires_at = now + self.opaque_ttl
+        if is_jwt:
+            exp = payload.get("exp")
+            if not isinstance(exp, (int, float)):
+                return
+            expires_at = min(exp, now + self.max_ttl)
+        if expires_at <= now:
+            return
+
+        key = self._hash(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached payloads and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def create_token_cache() -> TokenCache:
+    """Build the verified-token cache using environment overrides"""
+    return TokenCache(
+        max_entries=int(os.getenv("TOKEN_CACHE_SIZE", "1024")),
+        opaque_ttl=int(os.getenv("TOKEN_CACHE_OPAQUE_TTL", "60")),
+        max_ttl=int(os.getenv("TOKEN_CACHE_MAX_TTL", "3600"))
+    )
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..models.user import User
+
+
+class UserCache:
+    """
+    TTL cache of user rows keyed by ``auth0_id``.
+
+    Only column values are cached, never session-bound instances. On a hit the
+    snapshot is merged into the caller's session without a SELECT, so routes
+    can still modify and commit ``current_user`` as usual.
+
+    Routes that change a user must call ``invalidate`` after committing. Other
+    uvicorn workers don't see that invalidation, so ``ttl`` is kept short to
+    bound how long they may serve a stale row.
+    """
+
+    def __init__(self, ttl: int = 30, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._columns = [attr.key for attr in inspect(User).column_attrs]
+
+    def get(self, db: Session, auth0_id: str) -> Optional[User]:
+        """Return the cached user attached to ``db``, or None on a miss"""
+        if self.ttl <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(auth0_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if time.time() >= expires_at:
+                del self._entries[auth0_id]
+                return None
+            self._entries.move_to_end(auth0_id)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def set(self, user: User) -> None:
+        """Snapshot a freshly loaded user's columns"""
+        if self.ttl <= 0:
+            return
+
+        values = {key: getattr(user, key) for key in self._columns}
+        with self._lock:
+            self._entries[user.auth0_id] = (time.time() + self.ttl, values)
+            self._entries.move_to_end(user.auth0_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, auth0_id: Optional[str]) -> None:
+        """Drop a user after it has been changed"""
+        if not auth0_id:
+            return
+        with self._lock:
+            self._entries.pop(auth0_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def create_user_cache() -> UserCache:
+    """Build the user cache using environment overrides (USER_CACHE_TTL=0 disables it)"""
+    return UserCache(
+        ttl=int(os.getenv("USER_CACHE_TTL", "30")),
+        max_entries=int(os.getenv("USER_CACHE_SIZE", "4096"))
+    )
@@ -3,12 +3,17 @@ from .user import User
 from .video import Video, VideoVisibility
 from .comment import Comment
 from .event import Event
+from .job import Job, JobStatus
+from .upload_session import UploadSession
 
 __all__ = [
     "Base",
     "User",
     "Video",
     "VideoVisibility",
-    "Comment"
-    "Event"
+    "Comment",
+    "Event",
+    "Job",
+    "JobStatus",
+    "UploadSession"
 ] 
\ No newline at end of file
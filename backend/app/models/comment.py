@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Float, DateTime, Integer
+from sqlalchemy import Column, String, ForeignKey, Float, DateTime, Integer, Index
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.dialects.postgresql import UUID
 from typing import List, TYPE_CHECKING, Optional
@@ -23,6 +23,16 @@ class Comment(Base):
     # Timestamp indicating the position in the video (in seconds) where the comment refers to
     # Should only be set for top-level comments (parent_id is None)
     video_timestamp: Mapped[Optional[float]] = Column(Float, nullable=True)
+
+    __table_args__ = (
+        # Foreign keys: a video's and an event's comments are listed newest first
+        Index("ix_comment_video_id_created_at", "video_id", "created_at"),
+        Index("ix_comment_event_id_created_at", "event_id", "created_at"),
+        Index("ix_comment_parent_id", "parent_id"),
+        Index("ix_comment_user_id", "user_id"),
+        # Timeline range and density queries
+        Index("ix_comment_video_id_video_timestamp", "video_id", "video_timestamp"),
+    )
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="comments")
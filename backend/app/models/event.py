@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Float, String
+from sqlalchemy import Column, ForeignKey, Float, String, Index
 from sqlalchemy.orm import Mapped, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from typing import TYPE_CHECKING, List
@@ -22,6 +22,12 @@ class Event(Base):
     description: Mapped[str] = Column(String(500), nullable=True)
     event_type: Mapped[str] = Column(String(50), nullable=True)
 
+    __table_args__ = (
+        # A video's events are listed in timeline order
+        Index("ix_event_video_id_video_timestamp", "video_id", "video_timestamp"),
+        Index("ix_event_user_id", "user_id"),
+    )
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="events")
     video: Mapped["Video"] = relationship("Video", back_populates="events")
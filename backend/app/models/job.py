@@ -0,0 +1,42 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped
+from sqlalchemy.dialects.postgresql import UUID
+from typing import Optional
+
+from .base import Base
+
+from enum import Enum
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class Job(Base):
+    """
+    A unit of background work (thumbnails, media processing) run by worker.py.
+
+    Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED. A claimed job
+    is leased until ``locked_until``; if the worker dies it becomes claimable
+    again once the lease expires.
+    """
+    id: Mapped[str] = Column(UUID(as_uuid=True), primary_key=True, default=Base.generate_uuid)
+
+    kind: Mapped[str] = Column(String(50), nullable=False)
+    payload: Mapped[dict] = Column(JSON, nullable=False, default=dict)
+    status: Mapped[str] = Column(String(20), nullable=False, default=JobStatus.PENDING.value)
+
+    attempts: Mapped[int] = Column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = Column(Integer, nullable=False, default=5)
+    run_at: Mapped[datetime] = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until: Mapped[Optional[datetime]] = Column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = Column(Text, nullable=True)
+    # Jobs that must run at most once (e.g. "hls:<video_id>") share a key; NULL for the rest
+    dedupe_key: Mapped[Optional[str]] = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_status_run_at", "status", "run_at"),
+        UniqueConstraint("dedupe_key", name="uq_job_dedupe_key"),
+    )
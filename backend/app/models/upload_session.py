@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.orm import Mapped
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .base import Base
+
+class UploadSession(Base):
+    """
+    State of an in-flight upload (streamed or chunked), shared by every API worker.
+
+    Used by PostgresUploadStore; ``data`` holds the same dict the in-memory
+    store keeps, and rows past ``expires_at`` are treated as gone.
+    """
+    id: Mapped[str] = Column(String(64), primary_key=True)
+    data: Mapped[dict] = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False, default=dict)
+    expires_at: Mapped[datetime] = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, ARRAY, Enum as SQLAlchemyEnum, Text, Integer
+from sqlalchemy import Column, String, ForeignKey, ARRAY, Enum as SQLAlchemyEnum, Text, Integer, Float, Index
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.dialects.postgresql import UUID
 from typing import List, Optional, TYPE_CHECKING
@@ -17,6 +17,12 @@ class VideoVisibility(str, Enum):
     PRIVATE = "private"
 
 class Video(Base):
+    __table_args__ = (
+        # Keyset pagination of the public and per-user video lists, newest first
+        Index("ix_video_visibility_created_at_id", "visibility", "created_at", "id"),
+        Index("ix_video_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id: Mapped[str] = Column(UUID(as_uuid=True), primary_key=True, index=True, default=Base.generate_uuid)
     user_id: Mapped[str] = Column(UUID(as_uuid=True), ForeignKey("user.id"))
     
@@ -28,7 +34,16 @@ class Video(Base):
     file_path: Mapped[Optional[str]] = Column(String, nullable=True)  # Local file path (not used with Cloudinary)
     video_url: Mapped[Optional[str]] = Column(String, nullable=True)  # URL for streaming
     thumbnail_url: Mapped[Optional[str]] = Column(String, nullable=True)
-    duration: Mapped[Optional[int]] = Column(Integer, nullable=True)
+    duration: Mapped[Optional[int]] = Column(Integer, nullable=True)  # Seconds, rounded up
+
+    # Media info, probed at ingest
+    width: Mapped[Optional[int]] = Column(Integer, nullable=True)
+    height: Mapped[Optional[int]] = Column(Integer, nullable=True)
+    video_codec: Mapped[Optional[str]] = Column(String(50), nullable=True)
+    bitrate: Mapped[Optional[int]] = Column(Integer, nullable=True)  # Bits per second
+    keyframe_interval: Mapped[Optional[float]] = Column(Float, nullable=True)  # Seconds between keyframes
+    sprite_vtt_key: Mapped[Optional[str]] = Column(String, nullable=True)  # WebVTT index of the scrub-preview sprite sheet
+    hls_master_key: Mapped[Optional[str]] = Column(String, nullable=True)  # HLS master playlist, set once every rendition is uploaded
 
     # TFT specific
     game_version: Mapped[str] = Column(String(20), nullable=True)  # TFT patch
@@ -44,6 +59,16 @@ class Video(Base):
     user: Mapped["User"] = relationship("User", back_populates="videos")
     comments: Mapped[List["Comment"]] = relationship("Comment", back_populates="video", cascade="all, delete-orphan")
     events: Mapped[List["Event"]] = relationship("Event", back_populates="video", cascade="all, delete-orphan")
-    
-    
-    
\ No newline at end of file
+
+
+def validate_video_timestamp(video: Video, video_timestamp: Optional[float]) -> None:
+    """
+    Check that a timestamp falls inside the video.
+
+    Videos whose duration hasn't been probed yet accept any timestamp.
+    Raises ValueError with an explanation otherwise.
+    """
+    if video_timestamp is None or video.duration is None:
+        return
+    if video_timestamp > video.duration:
+        raise ValueError({"video_timestamp": f"Timestamp is past the end of the video ({video.duration}s)"})
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from ..auth import token_cache
+from ..services.wasabi_storage import wasabi_storage
+
 router = APIRouter(
     prefix="/api/v1",
     tags=["health"]
@@ -11,4 +14,18 @@ async def health_check():
     Simple health check endpoint to verify the API is running.
     Returns a 200 OK response when the API is operational.
     """
-    return {"status": "ok", "message": "Service is healthy"} 
\ No newline at end of file
+    return {"status": "ok", "message": "Service is healthy"}
+
+@router.get("/health/auth-cache")
+async def auth_cache_stats():
+    """
+    Report hit/miss counters for the verified-token cache of this worker.
+    """
+    return {"token_cache": token_cache.stats()}
+
+@router.get("/health/presign-cache")
+async def presign_cache_stats():
+    """
+    Report hit/miss counters for the signed URL cache of this worker.
+    """
+    return {"presign_cache": wasabi_storage.url_cache.stats()}
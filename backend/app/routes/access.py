@@ -0,0 +1,29 @@
+import os
+import uuid
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_user
+from ..models.user import User
+from ..models.video import Video, VideoVisibility
+
+# Comma-separated user ids allowed to run maintenance endpoints
+ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
+
+def get_accessible_video(db: Session, video_id: uuid.UUID, current_user: User) -> Video:
+    """Load a video the current user may see, 404/403 otherwise"""
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    if video.visibility != VideoVisibility.PUBLIC and video.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You don't have access to this video")
+    return video
+
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Dependency that only lets users listed in ADMIN_USER_IDS through"""
+    if str(current_user.id) not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -9,7 +9,7 @@ from typing import Optional
 
 from ..db.database import get_db
 from ..models.user import User
-from ..auth import get_current_user
+from ..auth import get_current_user, user_cache
 
 router = APIRouter(
     prefix="/auth",
@@ -177,7 +177,9 @@ async def riot_callback(
         user.verified_riot_account = True
         
         # Update the database
+        auth0_id = user.auth0_id
         db.commit()
+        user_cache.invalidate(auth0_id)
         
         # Redirect back to the frontend with success message
         return RedirectResponse(url=f"{FRONTEND_URL}/{redirect_after}?success=riot_connected")
@@ -201,6 +203,8 @@ async def disconnect_riot_account(
     current_user.riot_refresh_token = None
     current_user.verified_riot_account = False
     
+    auth0_id = current_user.auth0_id
     db.commit()
+    user_cache.invalidate(auth0_id)
     
     return {"message": "Riot account disconnected successfully"} 
\ No newline at end of file
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import uuid
 
 from ..db.database import get_db
 from ..models.comment import Comment, validate_comment_data
 from ..models.user import User
-from ..models.video import Video
+from ..models.video import validate_video_timestamp
 from ..models.event import Event
 from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from ..auth import get_current_user
+from .access import get_accessible_video
+from ..services.comment_thread import load_comment_thread
+from ..services.timeline import load_comments_in_range
 
 router = APIRouter(
     prefix="/comments", 
@@ -19,25 +22,57 @@ router = APIRouter(
 @router.get("/{video_id}", response_model=List[CommentResponse])
 async def get_comments(
     video_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all comments for a video"""
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
+    get_accessible_video(db, video_id, current_user)
 
     comments = db.query(Comment).filter(Comment.video_id == video_id).order_by(Comment.created_at.desc()).all()
     return comments
 
+@router.get("/{video_id}/thread", response_model=List[CommentResponse])
+async def get_comment_thread(
+    video_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a video's comments as threads: top-level comments newest first, each
+    with its replies nested under it and effective_timestamp filled in.
+    """
+    get_accessible_video(db, video_id, current_user)
+    return [CommentResponse.model_validate(root) for root in load_comment_thread(db, video_id)]
+
+@router.get("/{video_id}/range", response_model=List[CommentResponse])
+async def get_comments_in_range(
+    video_id: uuid.UUID,
+    start: float = Query(0, alias="from", ge=0),
+    end: Optional[float] = Query(None, alias="to", ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the top-level comments placed in [from, to) seconds of a video, in
+    timeline order. Event-linked comments sit at their event's timestamp.
+    Replies come from /comments/{video_id}/thread.
+    """
+    if end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="'to' must be greater than 'from'")
+    get_accessible_video(db, video_id, current_user)
+    return [CommentResponse.model_validate(comment) for comment in load_comments_in_range(db, video_id, start, end)]
+
 @router.get("/event/{event_id}", response_model=List[CommentResponse])
 async def get_comments_by_event(
     event_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all comments for a specific event"""
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+    get_accessible_video(db, event.video_id, current_user)
 
     comments = db.query(Comment).filter(Comment.event_id == event_id).order_by(Comment.created_at.desc()).all()
     return comments
@@ -62,10 +97,10 @@ async def create_comment(
         comment_data.video_timestamp = validated_data["video_timestamp"]
         comment_data.event_id = validated_data["event_id"]
         
-        # Verify video exists
-        video = db.query(Video).filter(Video.id == comment_data.video_id).first()
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
+        # Verify the video exists and the user can see it
+        video = get_accessible_video(db, comment_data.video_id, current_user)
+        
+        validate_video_timestamp(video, comment_data.video_timestamp)
         
         # If event_id is provided, verify it exists and belongs to the same video
         if comment_data.event_id:
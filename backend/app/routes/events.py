@@ -1,51 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 import uuid
 
 from ..models.event import Event
-from ..models.video import Video
+from ..models.video import Video, validate_video_timestamp
 from ..models.user import User
 from ..schemas.event import EventResponse, EventCreate, EventUpdate
 from ..db.database import get_db
 from ..auth import get_current_user
+from .access import get_accessible_video
 
 router = APIRouter(
     prefix="/events", 
     tags=["events"]
 )
 
+def event_response(event: Event) -> dict:
+    """An event with its author's username, shaped like EventResponse"""
+    return {
+        "id": event.id,
+        "title": event.title,
+        "description": event.description,
+        "video_timestamp": event.video_timestamp,
+        "event_type": event.event_type,
+        "user_id": event.user_id,
+        "video_id": event.video_id,
+        "user_username": event.user.username if event.user else "Unknown",
+        "user_profile_picture": event.user.profile_picture if event.user else None,
+        "created_at": event.created_at,
+        "updated_at": event.updated_at
+    }
+
 @router.get("/{video_id}", response_model=List[EventResponse])
 async def get_events(
     video_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all events for a video"""
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
+    get_accessible_video(db, video_id, current_user)
 
     events = db.query(Event).options(joinedload(Event.user)).filter(Event.video_id == video_id).order_by(Event.video_timestamp.asc()).all()
-    
-    # Create event responses with usernames
-    event_responses = []
-    for event in events:
-        event_dict = {
-            "id": event.id,
-            "title": event.title,
-            "description": event.description,
-            "video_timestamp": event.video_timestamp,
-            "event_type": event.event_type,
-            "user_id": event.user_id,
-            "video_id": event.video_id,
-            "user_username": event.user.username if event.user else "Unknown",
-            "user_profile_picture": event.user.profile_picture if event.user else None,
-            "created_at": event.created_at,
-            "updated_at": event.updated_at
-        }
-        event_responses.append(event_dict)
-    
-    return event_responses
+    return [event_response(event) for event in events]
+
+@router.get("/{video_id}/range", response_model=List[EventResponse])
+async def get_events_in_range(
+    video_id: uuid.UUID,
+    start: float = Query(0, alias="from", ge=0),
+    end: Optional[float] = Query(None, alias="to", ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the events in [from, to) seconds of a video, in timeline order"""
+    if end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="'to' must be greater than 'from'")
+    get_accessible_video(db, video_id, current_user)
+
+    # Range scan on the (video_id, video_timestamp) index
+    query = db.query(Event).options(joinedload(Event.user)).filter(
+        Event.video_id == video_id,
+        Event.video_timestamp >= start
+    )
+    if end is not None:
+        query = query.filter(Event.video_timestamp < end)
+    events = query.order_by(Event.video_timestamp.asc()).all()
+    return [event_response(event) for event in events]
 
 @router.post("/", response_model=EventResponse)
 async def create_event(
@@ -62,6 +82,11 @@ async def create_event(
     if video.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Unauthorized to create event for this video")
     
+    try:
+        validate_video_timestamp(video, event_data.video_timestamp)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     event = Event(
         **event_data.model_dump(),
         user_id=current_user.id
@@ -103,6 +128,11 @@ async def update_event(
     if not event.user_id == current_user.id:
         raise HTTPException(status_code=403, detail="Unauthorized to update this event")
     
+    try:
+        validate_video_timestamp(event.video, event_data.video_timestamp)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     for key, value in event_data.model_dump(exclude_unset=True).items():
         setattr(event, key, value)
     
@@ -10,7 +10,7 @@ import uuid
 from ..db.database import get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate, UserResponse
-from ..auth import get_current_user, get_token_payload, AUTH0_DOMAIN, AUTH0_AUDIENCE, ALGORITHMS, security
+from ..auth import get_current_user, get_token_payload, AUTH0_DOMAIN, AUTH0_AUDIENCE, ALGORITHMS, security, user_cache
 
 router = APIRouter(
     prefix="/users",
@@ -19,11 +19,12 @@ router = APIRouter(
 
 # Create a proper async dependency for users without username requirement
 async def get_user_for_onboarding(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """Get current user without requiring username (for onboarding)"""
-    return await get_current_user(credentials=credentials, db=db, require_username=False)
+    return await get_current_user(request=request, credentials=credentials, db=db, require_username=False)
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
@@ -57,6 +58,7 @@ async def update_user_profile(
     
     db.commit()
     db.refresh(current_user)
+    user_cache.invalidate(current_user.auth0_id)
     return current_user
 
 @router.get("/{username}", response_model=UserResponse)
@@ -108,6 +110,7 @@ async def complete_onboarding(
         print(f"User update committed successfully")
         db.refresh(current_user)
         print(f"User refreshed: username='{current_user.username}'")
+        user_cache.invalidate(current_user.auth0_id)
         return current_user
     except Exception as e:
         print(f"Error updating user: {str(e)}")
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body, Request, Query
+from fastapi.responses import Response
+from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import json
 import os
 import uuid
@@ -12,6 +14,7 @@ import io
 import tempfile
 import psutil
 import math
+import re
 
 from ..db.database import get_db
 from ..models.comment import Comment
@@ -21,14 +24,31 @@ from ..models.event import Event
 from ..schemas.video import (
     VideoCreate, VideoResponse, VideoDetailResponse, VideoUpdate,
     ChunkedUploadInit, ChunkedUploadInitResponse, ChunkedUploadComplete,
-    ChunkedUploadStatus
+    ChunkedUploadStatus, ChunkedUploadParts, ChunkedUploadResumeResponse, ChunkedUploadPartUrls
 )
 from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from ..schemas.event import EventResponse
 from ..auth import get_current_user
+from .access import get_accessible_video, require_admin
 # from ..services.storage import upload_to_cloud_storage  # Old Cloudinary service
 from ..services.wasabi_storage import wasabi_storage  # New Wasabi service
-from ..services.thumbnail import generate_thumbnail, generate_thumbnail_from_file, generate_thumbnail_from_file_key
+from ..services.media_jobs import enqueue_ingest
+from ..services.pagination import keyset_page
+from ..services.video_detail import load_video_detail
+from ..services.timeline import DENSITY_BUCKET_SECONDS, MIN_DENSITY_BUCKET_SECONDS, timeline_density
+from ..services.hls import (
+    CONTENT_TYPES as HLS_CONTENT_TYPES,
+    hls_signing_enabled,
+    sign_master_playlist,
+    sign_media_playlist,
+    signed_playlist_query,
+    verify_playlist_signature
+)
+from ..services.sprites import SPRITE_IMAGE_REF, sprite_image_key
+from ..services.upload_stream import StreamingFormFile
+from ..services.upload_events import FINAL_STATUSES, UPLOAD_PROGRESS_INTERVAL, UPLOAD_WAIT_TIMEOUT, upload_notifier
+from ..services.upload_store import upload_store
+from ..services.orphan_sweeper import ORPHAN_SWEEP_DRY_RUN, run_sweep
 
 router = APIRouter(
     prefix="/videos",
@@ -39,11 +59,33 @@ router = APIRouter(
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# In-memory storage for upload progress (in production, use Redis or database)
-upload_progress = {}
+# Upload sessions ("stream" for /start-upload, "chunked" for presigned parts)
+# live in upload_store so any worker can serve status, complete and cancel
+STREAM_UPLOAD = "stream"
+CHUNKED_UPLOAD = "chunked"
+
+# Body chunks buffered between /start-upload and its background Wasabi upload
+STREAM_UPLOAD_QUEUE_CHUNKS = int(os.getenv("STREAM_UPLOAD_QUEUE_CHUNKS", "64"))
+# Keeps a reference to running /start-upload background uploads
+_stream_uploads = set()
+# Sweeps started from /cleanup-uploads in this process
+_sweeps = set()
+
+# Presigned chunk URLs are issued this many at a time instead of all up front
+CHUNK_URL_WINDOW = int(os.getenv("CHUNK_URL_WINDOW", "50"))
+
+# Video lists are keyset-paged; the token for the next page comes back in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 100
 
-# Storage for chunked upload progress
-chunked_uploads = {}
+async def get_upload_session(upload_id: str, kind: str, current_user: User, forbidden_detail: str = "Unauthorized") -> dict:
+    """Load an upload session of the given kind owned by the current user"""
+    session = await upload_store.get(upload_id)
+    if session is None or session.get("kind") != kind:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if session["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    return session
 
 def get_memory_usage():
     """Get current memory usage of the process"""
@@ -56,227 +98,172 @@ def get_memory_usage():
 
 @router.post("/start-upload")
 async def start_video_upload(
-    file: UploadFile = File(...),
+    request: Request,
+    upload_id: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Start video upload immediately and return an upload ID.
-    This allows the frontend to begin upload while user fills out details.
+    Stream a video upload into Wasabi and return its upload ID.
+    
+    The multipart body is read as it arrives and pushed to an S3 multipart
+    upload part by part, so memory use stays at a few parts regardless of
+    file size. The response comes back once the body is received; the last
+    parts finish in the background, so poll /upload-status or call
+    /complete-upload. Clients may pass their own upload_id (a UUID) to do
+    that while the body is still streaming.
     """
     start_time = time.time()
-    upload_id = str(uuid.uuid4())
+    
+    if upload_id is None:
+        upload_id = str(uuid.uuid4())
+    else:
+        try:
+            upload_id = str(uuid.UUID(upload_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="upload_id must be a UUID")
     
     print(f"[UPLOAD_START] Starting upload {upload_id} at {time.time()}")
     print(f"[UPLOAD_START] User: {current_user.username}")
-    print(f"[UPLOAD_START] File: {file.filename}, Content-Type: {file.content_type}")
-    print(f"[UPLOAD_START] File object type: {type(file.file)}")
-    print(f"[UPLOAD_START] File size: {file.size if hasattr(file, 'size') else 'Unknown'}")
+    
+    form_file = StreamingFormFile(request)
+    try:
+        await form_file.open()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    print(f"[UPLOAD_START] File: {form_file.filename}, Content-Type: {form_file.content_type}")
+    print(f"[UPLOAD_START] Request size: {form_file.total_size or 'Unknown'}")
     
     # Validate file type
-    if not file.content_type.startswith("video/"):
-        print(f"[UPLOAD_START] Invalid file type: {file.content_type}")
+    if not form_file.content_type.startswith("video/"):
+        print(f"[UPLOAD_START] Invalid file type: {form_file.content_type}")
         raise HTTPException(status_code=400, detail="File must be a video")
     
     # Initialize upload progress
-    upload_progress[upload_id] = {
-        "status": "uploading",
+    created = await upload_store.create(upload_id, {
+        "kind": STREAM_UPLOAD,
+        "status": "uploading_video",
         "progress": 0,
         "file_key": None,
-        "thumbnail_key": None,
         "error": None,
         "user_id": current_user.id,
-        "filename": file.filename,
-        "content_type": file.content_type,
+        "filename": form_file.filename,
+        "content_type": form_file.content_type,
         "started_at": time.time()
-    }
-    
-    # Start upload in background
-    asyncio.create_task(process_video_upload(upload_id, file))
+    })
+    if not created:
+        raise HTTPException(status_code=409, detail="Upload ID already in use")
+    
+    mem_start = get_memory_usage()
+    print(f"[MEMORY] Initial memory usage: RSS={mem_start['rss']:.1f}MB, VMS={mem_start['vms']:.1f}MB")
+    
+    file_extension = wasabi_storage._get_file_extension(form_file.filename)
+    file_key = f"videos/{uuid.uuid4()}{file_extension}"
+    
+    # The body is handed to a background task through a bounded queue, so
+    # Wasabi sees parts while the client is still sending and this request
+    # can answer as soon as the body is in, without waiting on the last parts
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_UPLOAD_QUEUE_CHUNKS)
+    task = asyncio.create_task(finish_stream_upload(
+        upload_id, queue, file_key, form_file.content_type, form_file.total_size, current_user.id, start_time
+    ))
+    _stream_uploads.add(task)
+    task.add_done_callback(_stream_uploads.discard)
+    
+    reported = 0
+    last_saved = time.monotonic()
+    try:
+        async for chunk in form_file.chunks():
+            if task.done():
+                break
+            await queue.put(chunk)
+            if form_file.total_size:
+                progress = int(min(99, 100 * form_file.bytes_received / form_file.total_size))
+                # Pollers of the store only need a few updates a second
+                if progress > reported and time.monotonic() - last_saved >= UPLOAD_PROGRESS_INTERVAL:
+                    reported = progress
+                    last_saved = time.monotonic()
+                    await upload_store.update(upload_id, {"progress": reported})
+    except Exception as e:
+        # Client went away mid-body: abort the multipart upload instead of completing it
+        if not task.done():
+            await queue.put(e)
+        raise
+    if task.done():
+        session = await upload_store.get(upload_id)
+        raise HTTPException(status_code=500, detail=f"Failed to upload video: {(session or {}).get('error')}")
+    await queue.put(None)
     
     return {
         "upload_id": upload_id,
-        "status": "uploading",
-        "message": "Video upload started. You can now fill out the details while upload continues."
+        "status": "uploading_video",
+        "message": "Video received and uploading. Poll /upload-status or call /complete-upload to save it."
     }
 
-async def process_video_upload(upload_id: str, file: UploadFile):
+async def queued_chunks(queue: asyncio.Queue):
+    """Yield body chunks from the request handler until None, raising a queued exception"""
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
+
+async def finish_stream_upload(
+    upload_id: str,
+    queue: asyncio.Queue,
+    file_key: str,
+    content_type: str,
+    total_size: int,
+    user_id,
+    start_time: float
+):
     """
-    Process the video upload in the background and update progress.
-    Uses streaming with temporary files to avoid memory issues.
+    Push a /start-upload body to Wasabi and record the outcome in the
+    upload session (runs as a background task).
     """
-    temp_file = None
     try:
-        print(f"[UPLOAD_PROCESS] Processing upload {upload_id}")
-        print(f"[UPLOAD_PROCESS] Initial file object state: {file.file.closed=}")
-        
-        # Log initial memory usage
-        mem_start = get_memory_usage()
-        print(f"[MEMORY] Initial memory usage: RSS={mem_start['rss']:.1f}MB, VMS={mem_start['vms']:.1f}MB")
-        
-        # Update progress
-        upload_progress[upload_id]["status"] = "uploading_video"
-        upload_progress[upload_id]["progress"] = 10
-        
-        # Read the entire file content first
-        print(f"[UPLOAD_PROCESS] Reading file content")
-        file_content = await file.read()
-        total_size = len(file_content)
-        print(f"[UPLOAD_PROCESS] Read {total_size} bytes")
-        
-        # Log memory after reading file
-        mem_after_read = get_memory_usage()
-        print(f"[MEMORY] After reading file: RSS={mem_after_read['rss']:.1f}MB, VMS={mem_after_read['vms']:.1f}MB")
-        print(f"[MEMORY] Memory increase: RSS={mem_after_read['rss'] - mem_start['rss']:.1f}MB")
-        
-        # Create a SpooledTemporaryFile with a larger max_size
-        temp_file = tempfile.SpooledTemporaryFile(max_size=10*1024*1024)  # 10MB before spilling to disk
-        
-        try:
-            # Write content in chunks to show progress
-            chunk_size = 8192  # 8KB chunks
-            total_written = 0
-            
-            print(f"[UPLOAD_PROCESS] Writing to temporary file")
-            
-            while total_written < total_size:
-                # Calculate chunk size
-                current_chunk_size = min(chunk_size, total_size - total_written)
-                # Write chunk
-                chunk = file_content[total_written:total_written + current_chunk_size]
-                temp_file.write(chunk)
-                total_written += current_chunk_size
-                
-                # Update progress
-                progress = min(30, 10 + (total_written / (1024 * 1024)))
-                upload_progress[upload_id]["progress"] = progress
-            
-            print(f"[UPLOAD_PROCESS] All data written to temp file: {total_written} bytes")
-            
-            # Log memory after writing to temp file
-            mem_after_write = get_memory_usage()
-            print(f"[MEMORY] After writing to temp file: RSS={mem_after_write['rss']:.1f}MB, VMS={mem_after_write['vms']:.1f}MB")
-            
-            # Reset file pointer for reading
-            temp_file.flush()
-            temp_file.seek(0)
-            
-            print(f"[UPLOAD_PROCESS] Temp file ready for upload")
-            
-            # Create a file-like object that wraps our temporary file
-            class TempFileWrapper:
-                def __init__(self, temp_file, filename: str, content_type: str):
-                    self.temp_file = temp_file
-                    self.filename = filename
-                    self.content_type = content_type
-                    
-                async def seek(self, position: int):
-                    self.temp_file.seek(position)
-                    
-                async def read(self, size: int = -1):
-                    return self.temp_file.read(size)
-                
-                @property
-                def file(self):
-                    return self.temp_file
-                
-                def close(self):
-                    try:
-                        self.temp_file.close()
-                    except:
-                        pass
-            
-            # Create wrapper around our temp file
-            temp_upload = TempFileWrapper(temp_file, file.filename, file.content_type)
-            
-            # Upload to Wasabi
-            upload_start = time.time()
-            try:
-                file_key = await wasabi_storage.upload_video(temp_upload)
-                upload_duration = time.time() - upload_start
-                print(f"[UPLOAD_PROCESS] Upload {upload_id} completed in {upload_duration:.2f}s")
-                
-                # Log memory after Wasabi upload
-                mem_after_upload = get_memory_usage()
-                print(f"[MEMORY] After Wasabi upload: RSS={mem_after_upload['rss']:.1f}MB, VMS={mem_after_upload['vms']:.1f}MB")
-            except Exception as e:
-                print(f"[UPLOAD_PROCESS] Wasabi upload failed for {upload_id}: {str(e)}")
-                raise e
-            finally:
-                temp_upload.close()
-            
-            # Update progress
-            upload_progress[upload_id]["file_key"] = file_key
-            upload_progress[upload_id]["status"] = "generating_thumbnail"
-            upload_progress[upload_id]["progress"] = 70
-            
-            # Generate thumbnail
-            try:
-                print(f"[UPLOAD_PROCESS] Starting thumbnail generation for {upload_id}")
-                
-                # Create new temporary file for thumbnail generation
-                thumb_temp_file = tempfile.SpooledTemporaryFile(max_size=10*1024*1024)
-                thumb_temp_file.write(file_content)  # Write the content we already have
-                thumb_temp_file.seek(0)
-                
-                # Create wrapper for thumbnail generation
-                thumb_upload = TempFileWrapper(thumb_temp_file, file.filename, file.content_type)
-                
-                try:
-                    thumbnail_key = await generate_thumbnail_from_file(thumb_upload)
-                    
-                    # Log memory after thumbnail generation
-                    mem_after_thumb = get_memory_usage()
-                    print(f"[MEMORY] After thumbnail generation: RSS={mem_after_thumb['rss']:.1f}MB, VMS={mem_after_thumb['vms']:.1f}MB")
-                finally:
-                    thumb_upload.close()
-                
-                upload_progress[upload_id]["thumbnail_key"] = thumbnail_key
-                print(f"[UPLOAD_PROCESS] Thumbnail generation completed for {upload_id}")
-            except Exception as e:
-                print(f"[UPLOAD_PROCESS] Thumbnail generation failed for {upload_id}: {str(e)}")
-                import traceback
-                print(f"[UPLOAD_PROCESS] Thumbnail error traceback: {traceback.format_exc()}")
-                # Continue without thumbnail - not critical
-                upload_progress[upload_id]["thumbnail_key"] = None
-            
-            # Update final progress
-            upload_progress[upload_id]["status"] = "completed"
-            upload_progress[upload_id]["progress"] = 100
-            upload_progress[upload_id]["completed_at"] = time.time()
-            
-            print(f"[UPLOAD_PROCESS] Upload {upload_id} fully completed")
-            
-            # Log final memory usage
-            mem_final = get_memory_usage()
-            print(f"[MEMORY] Final memory usage: RSS={mem_final['rss']:.1f}MB, VMS={mem_final['vms']:.1f}MB")
-            print(f"[MEMORY] Total memory increase: RSS={mem_final['rss'] - mem_start['rss']:.1f}MB")
-            
-        except Exception as e:
-            print(f"[UPLOAD_PROCESS] Error in file processing: {str(e)}")
-            print(f"[UPLOAD_PROCESS] Error type: {type(e)}")
-            import traceback
-            print(f"[UPLOAD_PROCESS] Traceback: {traceback.format_exc()}")
-            raise e
-        
+        total_bytes = await wasabi_storage.upload_stream(queued_chunks(queue), file_key, content_type, expected_size=total_size)
     except Exception as e:
-        print(f"[UPLOAD_PROCESS] Error in upload {upload_id}: {str(e)}")
+        print(f"[UPLOAD_START] Streamed upload {upload_id} failed: {str(e)}")
         import traceback
-        print(f"[UPLOAD_PROCESS] Error traceback: {traceback.format_exc()}")
-        upload_progress[upload_id]["status"] = "error"
-        upload_progress[upload_id]["error"] = str(e)
-        upload_progress[upload_id]["progress"] = 0
-        
-    finally:
-        # Clean up temporary file
-        if temp_file:
-            try:
-                temp_file.close()
-            except:
-                pass
-        
-        # Log memory after cleanup
-        mem_cleanup = get_memory_usage()
-        print(f"[MEMORY] After cleanup: RSS={mem_cleanup['rss']:.1f}MB, VMS={mem_cleanup['vms']:.1f}MB")
+        print(f"[UPLOAD_START] Error traceback: {traceback.format_exc()}")
+        await upload_store.update(upload_id, {"status": "error", "error": str(e), "progress": 0})
+        await upload_notifier.publish(upload_id, {
+            "status": "error",
+            "progress": 0,
+            "error": str(e),
+            "user_id": user_id
+        })
+        # Free a handler blocked on the full queue; it sees this task is done and stops reading
+        while not queue.empty():
+            queue.get_nowait()
+        return
+    
+    upload_duration = time.time() - start_time
+    print(f"[UPLOAD_START] Upload {upload_id} streamed {total_bytes} bytes in {upload_duration:.2f}s")
+    mem_after_upload = get_memory_usage()
+    print(f"[MEMORY] After streamed upload: RSS={mem_after_upload['rss']:.1f}MB, VMS={mem_after_upload['vms']:.1f}MB")
+    
+    # The thumbnail is queued once /complete-upload has created the video row
+    session = await upload_store.transition(upload_id, ["uploading_video"], {
+        "file_key": file_key,
+        "status": "completed",
+        "progress": 100,
+        "completed_at": time.time()
+    })
+    if session is None:
+        # Cancelled (or expired) while the body was streaming
+        print(f"[UPLOAD_START] Upload {upload_id} was cancelled, deleting {file_key}")
+        await wasabi_storage.delete_file_by_key(file_key)
+        return
+    await upload_notifier.publish(upload_id, {
+        "status": "completed",
+        "progress": 100,
+        "file_key": file_key,
+        "user_id": user_id
+    })
 
 @router.get("/upload-status/{upload_id}")
 async def get_upload_status(
@@ -286,14 +273,7 @@ async def get_upload_status(
     """
     Get the status of an ongoing upload.
     """
-    if upload_id not in upload_progress:
-        raise HTTPException(status_code=404, detail="Upload not found")
-    
-    progress = upload_progress[upload_id]
-    
-    # Check if user owns this upload
-    if progress["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    progress = await get_upload_session(upload_id, STREAM_UPLOAD, current_user)
     
     return {
         "upload_id": upload_id,
@@ -323,38 +303,42 @@ async def complete_video_upload(
     start_time = time.time()
     print(f"[UPLOAD_COMPLETE] Completing upload {upload_id}")
     
-    if upload_id not in upload_progress:
-        raise HTTPException(status_code=404, detail="Upload not found")
-    
-    progress = upload_progress[upload_id]
+    session = await get_upload_session(upload_id, STREAM_UPLOAD, current_user)
     
-    # Check if user owns this upload
-    if progress["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    # Another /complete-upload already claimed it; the upload itself is done
+    if session["status"] == "saving":
+        raise HTTPException(status_code=409, detail="Upload is already being saved")
     
-    # Wait for upload to complete if still in progress
-    max_wait = 300  # 5 minutes max wait
-    wait_start = time.time()
-    
-    while progress["status"] not in ["completed", "error"] and (time.time() - wait_start) < max_wait:
-        print(f"[UPLOAD_COMPLETE] Waiting for upload {upload_id} to complete... Status: {progress['status']}")
-        await asyncio.sleep(1)
+    # Long-poll until the upload finishes, here or on another worker
+    if session["status"] not in FINAL_STATUSES:
+        print(f"[UPLOAD_COMPLETE] Waiting for upload {upload_id} to complete...")
+        await upload_notifier.wait(upload_id, UPLOAD_WAIT_TIMEOUT)
+        session = await upload_store.get(upload_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        if session["status"] == "saving":
+            raise HTTPException(status_code=409, detail="Upload is already being saved")
+        if session["status"] not in FINAL_STATUSES:
+            raise HTTPException(status_code=408, detail="Upload timed out")
     
-    if progress["status"] == "error":
-        error_msg = progress.get("error", "Unknown upload error")
+    if session["status"] == "error":
+        error_msg = session.get("error") or "Unknown upload error"
         # Clean up
-        del upload_progress[upload_id]
+        await upload_store.delete(upload_id)
+        await upload_notifier.discard(upload_id)
         raise HTTPException(status_code=500, detail=f"Upload failed: {error_msg}")
     
-    if progress["status"] != "completed":
-        raise HTTPException(status_code=408, detail="Upload timed out")
+    # Claim the upload so a concurrent /complete-upload can't save it twice
+    session = await upload_store.transition(upload_id, ["completed"], {"status": "saving"})
+    if session is None:
+        raise HTTPException(status_code=409, detail="Upload is already being saved")
     
-    file_key = progress["file_key"]
-    thumbnail_key = progress.get("thumbnail_key")
+    file_key = session.get("file_key")
     
     if not file_key:
         # Clean up
-        del upload_progress[upload_id]
+        await upload_store.delete(upload_id)
+        await upload_notifier.discard(upload_id)
         raise HTTPException(status_code=500, detail="Upload completed but no file key found")
     
     try:
@@ -370,7 +354,7 @@ async def complete_video_upload(
             description=description,
             file_path="",  # Not needed with Wasabi
             video_url=file_key,  # Store the file key
-            thumbnail_url=thumbnail_key,  # Store the thumbnail key
+            thumbnail_url=None,  # Generated by the job worker
             visibility=visibility,
             user_id=current_user.id,
             game_version=game_version,
@@ -384,7 +368,10 @@ async def complete_video_upload(
         db.refresh(new_video)
         
         # Clean up upload progress
-        del upload_progress[upload_id]
+        await upload_store.delete(upload_id)
+        await upload_notifier.discard(upload_id)
+        
+        enqueue_ingest(db, new_video.id, file_key)
         
         total_time = time.time() - start_time
         print(f"[UPLOAD_COMPLETE] Upload {upload_id} completed in {total_time:.2f}s")
@@ -401,20 +388,14 @@ async def complete_video_upload(
             except Exception as e:
                 print(f"[UPLOAD_COMPLETE] Error generating fresh video URL: {str(e)}")
         
-        # Add fresh thumbnail URL
-        if new_video.thumbnail_url:
-            try:
-                fresh_thumbnail_url = await wasabi_storage.get_video_url(new_video.thumbnail_url)
-                response_dict["thumbnail_url"] = fresh_thumbnail_url
-            except Exception as e:
-                print(f"[UPLOAD_COMPLETE] Error generating fresh thumbnail URL: {str(e)}")
+        # Thumbnail will be None initially, but will be generated by the job worker
+        response_dict["thumbnail_url"] = None
         
         return VideoResponse.model_validate(response_dict)
         
     except Exception as e:
         # Clean up on error
-        if upload_id in upload_progress:
-            del upload_progress[upload_id]
+        await upload_store.delete(upload_id)
         
         error_time = time.time() - start_time
         print(f"[UPLOAD_COMPLETE] Error after {error_time:.2f}s: {str(e)}")
@@ -476,7 +457,7 @@ async def upload_video(
             description=description,
             file_path="",  # Not needed with Wasabi
             video_url=file_key,  # Store the file key, not the full URL
-            thumbnail_url=None,  # Will be updated asynchronously
+            thumbnail_url=None,  # Will be set by the ingest job
             visibility=visibility,
             user_id=current_user.id,
             game_version=game_version,
@@ -492,9 +473,9 @@ async def upload_video(
         db_end = time.time()
         print(f"[VIDEO_UPLOAD] Database operations completed in {db_end - db_start:.2f}s")
         
-        # Start thumbnail generation in the background (don't wait for it)
-        print(f"[VIDEO_UPLOAD] Starting background thumbnail generation...")
-        asyncio.create_task(generate_thumbnail_async(new_video.id, file_key))
+        # Queue probing and thumbnail generation for the job worker (don't wait for it)
+        print(f"[VIDEO_UPLOAD] Queueing media ingest...")
+        enqueue_ingest(db, new_video.id, file_key)
         
         total_time = time.time() - start_time
         print(f"[VIDEO_UPLOAD] Total upload completed in {total_time:.2f}s")
@@ -511,7 +492,7 @@ async def upload_video(
             except Exception as e:
                 print(f"[VIDEO_UPLOAD] Error generating fresh video URL: {str(e)}")
         
-        # Thumbnail will be None initially, but will be generated in background
+        # Thumbnail will be None initially, but will be generated by the job worker
         response_dict["thumbnail_url"] = None
         
         return VideoResponse.model_validate(response_dict)
@@ -524,57 +505,52 @@ async def upload_video(
         print(f"[VIDEO_UPLOAD] Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Failed to upload video: {str(e)}")
 
-async def generate_thumbnail_async(video_id: uuid.UUID, file_key: str):
+def accessible_video_queries(base, user_id: uuid.UUID) -> list:
     """
-    Generate thumbnail asynchronously in the background and update the database.
-    This doesn't block the main upload response.
+    Public videos plus the user's own other ones, as keyset_page branches
+    served by their own indexes. Rows with no visibility count as private.
     """
+    return [
+        base.filter(Video.visibility == VideoVisibility.PUBLIC),
+        base.filter(
+            Video.user_id == user_id,
+            or_(Video.visibility.is_(None), Video.visibility != VideoVisibility.PUBLIC)
+        )
+    ]
+
+def get_page(model, queries: list, limit: int, cursor: Optional[str]):
+    """keyset_page with a malformed cursor reported as a 400"""
     try:
-        print(f"[THUMBNAIL_ASYNC] Starting background thumbnail generation for video {video_id}")
-        
-        # Generate thumbnail from the file key
-        thumbnail_key = await generate_thumbnail_from_file_key(file_key)
-        
-        if thumbnail_key:
-            print(f"[THUMBNAIL_ASYNC] Thumbnail generated: {thumbnail_key}")
-            
-            # Create a new database session for this background task
-            from ..db.database import SessionLocal
-            db = SessionLocal()
-            
-            try:
-                # Update the video record with the thumbnail
-                video = db.query(Video).filter(Video.id == video_id).first()
-                if video:
-                    video.thumbnail_url = thumbnail_key
-                    db.commit()
-                    print(f"[THUMBNAIL_ASYNC] Updated video {video_id} with thumbnail")
-                else:
-                    print(f"[THUMBNAIL_ASYNC] Video {video_id} not found in database")
-            finally:
-                db.close()
-        else:
-            print(f"[THUMBNAIL_ASYNC] Thumbnail generation failed for video {video_id}")
-            
-    except Exception as e:
-        print(f"[THUMBNAIL_ASYNC] Error in background thumbnail generation: {str(e)}")
-        import traceback
-        print(f"[THUMBNAIL_ASYNC] Traceback: {traceback.format_exc()}")
+        return keyset_page(model, queries, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=List[VideoResponse])
 async def get_videos(
-    skip: int = 0,
-    limit: int = 10,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, deprecated=True),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    print('running')
-    """Get a list of videos accessible to the current user"""
-    # Get public videos and user's own videos
-    videos = db.query(Video).options(joinedload(Video.user)).filter(
-        (Video.visibility == VideoVisibility.PUBLIC) | 
-        (Video.user_id == current_user.id)
-    ).offset(skip).limit(limit).all()
+    """
+    Get a page of videos accessible to the current user, newest first.
+
+    Pass the X-Next-Cursor header of a response as ``cursor`` to get the next
+    page; the header is absent on the last page.
+    """
+    base = db.query(Video).options(joinedload(Video.user))
+    if skip and not cursor:
+        # Legacy offset paging, kept for old clients
+        videos = base.filter(
+            (Video.visibility == VideoVisibility.PUBLIC) |
+            (Video.user_id == current_user.id)
+        ).order_by(Video.created_at.desc(), Video.id.desc()).offset(skip).limit(limit).all()
+    else:
+        videos, next_cursor = get_page(Video, accessible_video_queries(base, current_user.id), limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     # Generate fresh pre-signed URLs for all videos and thumbnails
     file_keys = [video.video_url for video in videos if video.video_url]
@@ -600,13 +576,21 @@ async def get_videos(
 
 @router.get("/my-videos", response_model=List[VideoResponse])
 async def get_my_videos(
-    skip: int = 0,
-    limit: int = 10,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, deprecated=True),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get videos uploaded by the current user"""
-    videos = db.query(Video).filter(Video.user_id == current_user.id).offset(skip).limit(limit).all()
+    """Get a page of videos uploaded by the current user, newest first (paged like GET /videos/)"""
+    base = db.query(Video).filter(Video.user_id == current_user.id)
+    if skip and not cursor:
+        videos = base.order_by(Video.created_at.desc(), Video.id.desc()).offset(skip).limit(limit).all()
+    else:
+        videos, next_cursor = get_page(Video, [base], limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     # Generate fresh pre-signed URLs for all videos and thumbnails
     file_keys = [video.video_url for video in videos if video.video_url]
@@ -637,90 +621,24 @@ async def get_video(
     db: Session = Depends(get_db)
 ):
     """Get a specific video by ID with its comments and events"""
-    video = db.query(Video).options(joinedload(Video.user)).filter(Video.id == video_id).first()
+    detail = load_video_detail(db, video_id)
     
-    if not video:
+    if not detail:
         raise HTTPException(status_code=404, detail="Video not found")
     
     # Check if user has access to this video
-    if video.visibility != VideoVisibility.PUBLIC and video.user_id != current_user.id:
+    if detail["visibility"] != VideoVisibility.PUBLIC and detail["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="You don't have access to this video")
     
-    # Get comments for this video
-    comments = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.video_id == video_id).all()
-    comment_responses = []
-    for comment in comments:
-      # Get the username from the user relationship
-      user_username = comment.user.username if comment.user else "Unknown"
-      user_profile_picture = comment.user.profile_picture if comment.user else None
-    
-      # Create a CommentResponse object
-      comment_response = CommentResponse(
-        id=comment.id,
-        content=comment.content,
-        user_username=user_username,
-        user_profile_picture=user_profile_picture,
-        created_at=comment.created_at,
-        updated_at=comment.updated_at,
-        parent_id=comment.parent_id,
-        event_id=comment.event_id,
-        video_timestamp=comment.video_timestamp
-      )
-      comment_responses.append(comment_response)
-    
-    # Get events for this video
-    events = db.query(Event).options(joinedload(Event.user)).filter(Event.video_id == video_id).order_by(Event.video_timestamp.asc()).all()
-    event_responses = []
-    for event in events:
-      # Get the username from the user relationship
-      user_username = event.user.username if event.user else "Unknown"
-      user_profile_picture = event.user.profile_picture if event.user else None
-    
-      # Create an EventResponse object
-      event_response = EventResponse(
-        id=event.id,
-        title=event.title,
-        description=event.description,
-        event_type=event.event_type,
-        user_id=event.user_id,
-        video_id=event.video_id,
-        user_username=user_username,
-        user_profile_picture=user_profile_picture,
-        created_at=event.created_at,
-        updated_at=event.updated_at,
-        video_timestamp=event.video_timestamp
-      )
-      event_responses.append(event_response)
-    
-    # Create video response with username and fresh URLs
-    video_dict = VideoResponse.model_validate(video).model_dump()
-    video_dict["user_username"] = video.user.username if video.user else "Unknown"
-    
-    # Generate fresh pre-signed URLs for video and thumbnail
-    if video.video_url:
-        try:
-            fresh_video_url = await wasabi_storage.get_video_url(video.video_url)
-            video_dict["video_url"] = fresh_video_url
-        except Exception as e:
-            print(f"[VIDEO_DETAIL] Error generating fresh video URL: {str(e)}")
-            # Keep the original key as fallback
-    
-    if video.thumbnail_url:
-        try:
-            fresh_thumbnail_url = await wasabi_storage.get_video_url(video.thumbnail_url)
-            video_dict["thumbnail_url"] = fresh_thumbnail_url
-        except Exception as e:
-            print(f"[VIDEO_DETAIL] Error generating fresh thumbnail URL: {str(e)}")
-            # Keep the original key as fallback
-    
-    video_data = VideoResponse.model_validate(video_dict)
+    # Replace stored file keys with fresh pre-signed URLs, signed in one batch
+    # (keys that fail to sign come back unchanged)
+    file_keys = [detail[field] for field in ("video_url", "thumbnail_url") if detail[field]]
+    fresh_urls = await wasabi_storage.get_multiple_video_urls(file_keys) if file_keys else {}
+    for field in ("video_url", "thumbnail_url"):
+        if detail[field] in fresh_urls:
+            detail[field] = fresh_urls[detail[field]]
     
-    # Create the detailed response with comments and events
-    return VideoDetailResponse(
-        **video_data.model_dump(),
-        comments=comment_responses,
-        events=event_responses
-    )
+    return VideoDetailResponse.model_validate(detail)
 
 @router.delete("/{video_id}", status_code=204)
 async def delete_video(
@@ -740,21 +658,42 @@ async def delete_video(
     db.commit()
     return {"message": "Video deleted successfully"}
 
+@router.get("/{video_id}/density")
+async def get_timeline_density(
+    video_id: uuid.UUID,
+    bucket: int = Query(DENSITY_BUCKET_SECONDS, ge=MIN_DENSITY_BUCKET_SECONDS, description="Bin width in seconds"),
+    start: float = Query(0, alias="from", ge=0),
+    end: Optional[float] = Query(None, alias="to", ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Count comments and events per ``bucket``-second bin for the timeline
+    heatmap. Empty bins are left out.
+    """
+    if end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="'to' must be greater than 'from'")
+    get_accessible_video(db, video_id, current_user)
+
+    return {
+        "video_id": str(video_id),
+        "bucket_seconds": bucket,
+        "buckets": timeline_density(db, video_id, bucket, start, end)
+    }
+
 @router.get("/{video_id}/stream")
 async def stream_video(
     video_id: uuid.UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get the streaming URL for a video"""
-    video = db.query(Video).filter(Video.id == video_id).first()
-    
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
-    
-    # Check if user has access to this video
-    if video.visibility != VideoVisibility.PUBLIC and video.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You don't have access to this video")
+    """
+    Get the streaming URL for a video.
+    Returns the signed HLS master playlist once the ladder is packaged, with
+    the original MP4 as fallback_url for players without HLS support.
+    """
+    video = get_accessible_video(db, video_id, current_user)
     
     if not video.video_url:
         raise HTTPException(status_code=404, detail="Video URL not found")
@@ -768,11 +707,104 @@ async def stream_video(
         print(f"[VIDEO_STREAM] Generating fresh pre-signed URL for: {video.video_url}")
         fresh_url = await wasabi_storage.get_video_url(video.video_url)
         print(f"[VIDEO_STREAM] Generated fresh URL")
-        return {"url": fresh_url}
     except Exception as e:
         print(f"[VIDEO_STREAM] Error generating fresh URL: {str(e)}")
         # Fallback to stored URL (might be expired but better than nothing)
-        return {"url": video.video_url}
+        fresh_url = video.video_url
+    
+    if video.hls_master_key and hls_signing_enabled():
+        master_url = request.url_for("get_hls_master_playlist", video_id=str(video.id))
+        return {
+            "url": f"{master_url}?{signed_playlist_query(str(video.id))}",
+            "format": "hls",
+            "fallback_url": fresh_url
+        }
+    return {"url": fresh_url, "format": "mp4", "fallback_url": fresh_url}
+
+def _get_hls_video(video_id: uuid.UUID, expires: int, sig: str, db: Session) -> Video:
+    """Check a playlist request's signature and return its packaged video"""
+    if not verify_playlist_signature(str(video_id), expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired playlist signature")
+    
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video or not video.hls_master_key:
+        raise HTTPException(status_code=404, detail="HLS stream not found")
+    return video
+
+@router.get("/{video_id}/hls/master.m3u8")
+async def get_hls_master_playlist(
+    video_id: uuid.UUID,
+    expires: int,
+    sig: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a video's HLS master playlist.
+    Authorized by the signed query from /stream rather than a bearer token,
+    which is passed on to the rendition playlists.
+    """
+    video = _get_hls_video(video_id, expires, sig, db)
+    
+    try:
+        playlist = (await wasabi_storage.get_object_bytes(video.hls_master_key)).decode("utf-8")
+    except Exception as e:
+        print(f"[VIDEO_HLS] Error loading master playlist: {str(e)}")
+        raise HTTPException(status_code=502, detail="Failed to load playlist")
+    
+    playlist = sign_master_playlist(playlist, f"expires={expires}&sig={sig}")
+    return Response(content=playlist, media_type=HLS_CONTENT_TYPES[".m3u8"])
+
+@router.get("/{video_id}/hls/{rendition}/index.m3u8")
+async def get_hls_rendition_playlist(
+    video_id: uuid.UUID,
+    rendition: str,
+    expires: int,
+    sig: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get one rendition's HLS playlist with pre-signed segment URLs.
+    """
+    if not re.fullmatch(r"v\d+", rendition):
+        raise HTTPException(status_code=404, detail="Rendition not found")
+    
+    video = _get_hls_video(video_id, expires, sig, db)
+    rendition_prefix = f"{video.hls_master_key.rsplit('/', 1)[0]}/{rendition}"
+    
+    try:
+        playlist = (await wasabi_storage.get_object_bytes(f"{rendition_prefix}/index.m3u8")).decode("utf-8")
+    except Exception as e:
+        print(f"[VIDEO_HLS] Error loading {rendition} playlist: {str(e)}")
+        raise HTTPException(status_code=404, detail="Rendition not found")
+    
+    playlist = sign_media_playlist(playlist, rendition_prefix)
+    return Response(content=playlist, media_type=HLS_CONTENT_TYPES[".m3u8"])
+
+@router.get("/{video_id}/sprites.vtt")
+async def get_video_sprites(
+    video_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the WebVTT scrub-preview track for a video.
+    Cues point into a single sprite sheet through a fresh pre-signed URL.
+    """
+    video = get_accessible_video(db, video_id, current_user)
+    
+    if not video.sprite_vtt_key:
+        raise HTTPException(status_code=404, detail="Scrub previews not available yet")
+    
+    try:
+        vtt = (await wasabi_storage.get_object_bytes(video.sprite_vtt_key)).decode("utf-8")
+        sprite_url = await wasabi_storage.get_video_url(sprite_image_key(video.sprite_vtt_key))
+    except Exception as e:
+        print(f"[VIDEO_SPRITES] Error loading sprite track: {str(e)}")
+        raise HTTPException(status_code=502, detail="Failed to load scrub previews")
+    
+    # Every cue references the same sheet, so the player fetches it once
+    vtt = vtt.replace(f"{SPRITE_IMAGE_REF}#", f"{sprite_url}#")
+    return Response(content=vtt, media_type="text/vtt")
 
 @router.patch("/{video_id}", response_model=VideoResponse)
 async def update_video(
@@ -812,14 +844,7 @@ async def cancel_upload(
     Cancel an ongoing upload and clean up resources.
     This prevents orphaned files in Wasabi when users exit before completing.
     """
-    if upload_id not in upload_progress:
-        raise HTTPException(status_code=404, detail="Upload not found")
-    
-    progress = upload_progress[upload_id]
-    
-    # Check if user owns this upload
-    if progress["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    progress = await get_upload_session(upload_id, STREAM_UPLOAD, current_user)
     
     # Clean up uploaded file from Wasabi if it exists
     file_key = progress.get("file_key")
@@ -845,66 +870,26 @@ async def cancel_upload(
         except Exception as e:
             print(f"[UPLOAD_CANCEL] Error deleting thumbnail file {thumbnail_key}: {str(e)}")
     
-    # Clean up from memory
-    del upload_progress[upload_id]
+    # Remove the session (an in-flight stream sees this and deletes its file)
+    # and wake anyone waiting on /complete-upload
+    await upload_store.delete(upload_id)
+    await upload_notifier.discard(upload_id)
     
     return {"message": "Upload cancelled and resources cleaned up successfully"}
 
-@router.get("/cleanup-uploads")
-async def cleanup_old_uploads(current_user: User = Depends(get_current_user)):
+@router.post("/cleanup-uploads", status_code=202)
+async def cleanup_old_uploads(current_user: User = Depends(require_admin)):
     """
-    Clean up uploads older than 1 hour and their associated Wasabi files.
-    This prevents orphaned files from abandoned uploads.
-    In production, this should be a background task.
+    Start an orphan sweep now instead of waiting for the worker's schedule.
+    Admin only; the sweep runs in the background and logs its report.
     """
-    current_time = time.time()
-    old_uploads = []
-    cleanup_summary = {
-        "cleaned_uploads": 0,
-        "deleted_video_files": 0,
-        "deleted_thumbnail_files": 0,
-        "errors": []
-    }
-    
-    for upload_id, progress in list(upload_progress.items()):
-        # Remove uploads older than 1 hour
-        if current_time - progress["started_at"] > 3600:
-            print(f"[CLEANUP] Processing old upload: {upload_id}")
-            
-            # Clean up files from Wasabi
-            file_key = progress.get("file_key")
-            thumbnail_key = progress.get("thumbnail_key")
-            
-            if file_key:
-                try:
-                    await wasabi_storage.delete_video(file_key)
-                    cleanup_summary["deleted_video_files"] += 1
-                    print(f"[CLEANUP] Deleted video file: {file_key}")
-                except Exception as e:
-                    error_msg = f"Failed to delete video file {file_key}: {str(e)}"
-                    cleanup_summary["errors"].append(error_msg)
-                    print(f"[CLEANUP] {error_msg}")
-            
-            if thumbnail_key:
-                try:
-                    await wasabi_storage.delete_video(thumbnail_key)
-                    cleanup_summary["deleted_thumbnail_files"] += 1
-                    print(f"[CLEANUP] Deleted thumbnail file: {thumbnail_key}")
-                except Exception as e:
-                    error_msg = f"Failed to delete thumbnail file {thumbnail_key}: {str(e)}"
-                    cleanup_summary["errors"].append(error_msg)
-                    print(f"[CLEANUP] {error_msg}")
-            
-            old_uploads.append(upload_id)
-            del upload_progress[upload_id]
-            cleanup_summary["cleaned_uploads"] += 1
-    
-    cleanup_summary["upload_ids"] = old_uploads
-    
-    return {
-        "message": f"Cleaned up {len(old_uploads)} old uploads and associated files",
-        "summary": cleanup_summary
-    }
+    if _sweeps:
+        raise HTTPException(status_code=409, detail="A sweep is already running")
+    print(f"[CLEANUP] Sweep requested by {current_user.username}")
+    task = asyncio.create_task(run_sweep())
+    _sweeps.add(task)
+    task.add_done_callback(_sweeps.discard)
+    return {"message": "Sweep started", "dry_run": ORPHAN_SWEEP_DRY_RUN}
 
 @router.post("/initiate-chunked-upload", response_model=ChunkedUploadInitResponse)
 async def initiate_chunked_upload(
@@ -938,15 +923,18 @@ async def initiate_chunked_upload(
             upload_info.content_type
         )
         
-        # Get presigned URLs for each chunk
+        # Get presigned URLs for the first window of chunks; the rest come from /part-urls
+        first_window = range(1, min(total_chunks, CHUNK_URL_WINDOW) + 1)
         presigned_urls = await wasabi_storage.get_chunk_upload_urls(
             unique_filename,
             multipart_upload['UploadId'],
-            total_chunks
+            total_chunks,
+            first_window
         )
         
         # Store upload information
-        chunked_uploads[upload_id] = {
+        await upload_store.create(upload_id, {
+            "kind": CHUNKED_UPLOAD,
             "status": "initialized",
             "started_at": time.time(),
             "filename": upload_info.filename,
@@ -954,19 +942,19 @@ async def initiate_chunked_upload(
             "total_size": upload_info.total_size,
             "chunk_size": upload_info.chunk_size,
             "total_chunks": total_chunks,
-            "uploaded_chunks": set(),
             "file_key": unique_filename,
             "wasabi_upload_id": multipart_upload['UploadId'],
             "user_id": current_user.id,
             "etags": {},
             "error": None
-        }
+        })
         
         return ChunkedUploadInitResponse(
             upload_id=upload_id,
             chunk_size=upload_info.chunk_size,
             total_chunks=total_chunks,
-            presigned_urls=presigned_urls
+            presigned_urls=presigned_urls,
+            next_chunk=CHUNK_URL_WINDOW + 1 if total_chunks > CHUNK_URL_WINDOW else None
         )
         
     except Exception as e:
@@ -990,45 +978,57 @@ async def complete_chunked_upload(
         print(f"[CHUNKED_UPLOAD_COMPLETE] ETags value types: {[type(v) for v in completion_info.etags.values()]}")
         
         upload_id = completion_info.upload_id
-        if upload_id not in chunked_uploads:
-            print(f"[CHUNKED_UPLOAD_COMPLETE] Upload {upload_id} not found in chunked_uploads")
-            print(f"[CHUNKED_UPLOAD_COMPLETE] Available uploads: {list(chunked_uploads.keys())}")
-            raise HTTPException(status_code=404, detail="Upload not found")
-        
-        upload_info = chunked_uploads[upload_id]
+        upload_info = await get_upload_session(
+            upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to complete this upload"
+        )
         print(f"[CHUNKED_UPLOAD_COMPLETE] Upload info: {upload_info}")
         
-        # Verify user owns this upload
-        if upload_info["user_id"] != current_user.id:
-            print(f"[CHUNKED_UPLOAD_COMPLETE] User {current_user.id} not authorized for upload {upload_id}")
-            raise HTTPException(status_code=403, detail="Not authorized to complete this upload")
+        # Chunks recorded server-side count too, so a resumed client needn't resend them
+        etags = get_recorded_chunks(upload_info)
+        etags.update(completion_info.etags)
+        total_chunks = upload_info["total_chunks"]
+        
+        if len(etags) < total_chunks:
+            # Fill the gaps from what Wasabi actually holds
+            stored = await wasabi_storage.list_uploaded_parts(upload_info["file_key"], upload_info["wasabi_upload_id"])
+            etags.update(stored)
         
         # Verify all chunks are present
-        if len(completion_info.etags) != upload_info["total_chunks"]:
+        missing_chunks = [i for i in range(1, total_chunks + 1) if i not in etags]
+        if missing_chunks:
             print(f"[CHUNKED_UPLOAD_COMPLETE] Chunk count mismatch:")
-            print(f"  Expected: {upload_info['total_chunks']}")
-            print(f"  Received: {len(completion_info.etags)}")
-            print(f"  ETags: {completion_info.etags}")
+            print(f"  Expected: {total_chunks}")
+            print(f"  Missing: {missing_chunks}")
             raise HTTPException(
                 status_code=400,
-                detail=f"Missing chunks. Expected {upload_info['total_chunks']}, got {len(completion_info.etags)}"
+                detail=f"Missing chunks. Expected {total_chunks}, got {total_chunks - len(missing_chunks)}"
             )
+        etags = {i: etags[i] for i in range(1, total_chunks + 1)}
         
         print(f"[CHUNKED_UPLOAD_COMPLETE] Completing upload {upload_id}")
         
+        # Only one request may complete the multipart upload
+        if await upload_store.transition(upload_id, ["initialized"], {"status": "completing"}) is None:
+            raise HTTPException(status_code=409, detail="Upload is already completing or finished")
+        
         # Complete multipart upload in Wasabi
         try:
             file_key = await wasabi_storage.complete_multipart_upload(
                 upload_info["file_key"],
                 upload_info["wasabi_upload_id"],
-                completion_info.etags
+                etags
             )
             
             print(f"[CHUNKED_UPLOAD_COMPLETE] Upload completed: {file_key}")
             
             # Update upload status
-            upload_info["status"] = "completed"
-            upload_info["completed_at"] = time.time()
+            await upload_store.update(upload_id, {"status": "completed", "completed_at": time.time()})
+            await upload_notifier.publish(upload_id, {
+                "status": "completed",
+                "progress": 100,
+                "file_key": file_key,
+                "user_id": current_user.id
+            })
             
             return {"status": "success", "file_key": file_key}
             
@@ -1047,6 +1047,14 @@ async def complete_chunked_upload(
             except Exception as abort_error:
                 print(f"[CHUNKED_UPLOAD_COMPLETE] Error aborting upload: {str(abort_error)}")
             
+            await upload_store.update(upload_id, {"status": "error", "error": str(e)})
+            await upload_notifier.publish(upload_id, {
+                "status": "error",
+                "progress": 0,
+                "error": str(e),
+                "user_id": current_user.id
+            })
+            
             raise HTTPException(status_code=500, detail=f"Failed to complete upload: {str(e)}")
             
     except HTTPException:
@@ -1058,6 +1066,41 @@ async def complete_chunked_upload(
         print(f"[CHUNKED_UPLOAD_COMPLETE] Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+def get_recorded_chunks(upload_info: dict) -> Dict[int, str]:
+    """ETags recorded for a chunked upload as chunk_number -> ETag"""
+    return {int(number): etag for number, etag in (upload_info.get("etags") or {}).items()}
+
+def build_chunked_upload_status(upload_id: str, upload_info: dict) -> ChunkedUploadStatus:
+    total_chunks = upload_info["total_chunks"]
+    recorded = get_recorded_chunks(upload_info)
+    uploaded_chunks = sorted(recorded)
+    remaining_chunks = [i for i in range(1, total_chunks + 1) if i not in recorded]
+    progress = (len(uploaded_chunks) / total_chunks) * 100 if total_chunks > 0 else 0
+    
+    return ChunkedUploadStatus(
+        upload_id=upload_id,
+        status=upload_info["status"],
+        progress=progress,
+        uploaded_chunks=uploaded_chunks,
+        remaining_chunks=remaining_chunks,
+        error=upload_info.get("error")
+    )
+
+async def sync_uploaded_parts(upload_id: str, upload_info: dict) -> Tuple[dict, Dict[int, str]]:
+    """
+    Merge the parts Wasabi actually holds into a chunked upload's recorded ETags,
+    so clients that never report their ETags can still resume. Merging keeps
+    chunks recorded through /parts in the meantime. Returns the updated session
+    and Wasabi's part list; raises if the listing fails.
+    """
+    stored = await wasabi_storage.list_uploaded_parts(upload_info["file_key"], upload_info["wasabi_upload_id"])
+    updated = await upload_store.merge_field(
+        upload_id, "etags", {str(number): etag for number, etag in stored.items()}
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return updated, stored
+
 @router.get("/chunked-upload-status/{upload_id}", response_model=ChunkedUploadStatus)
 async def get_chunked_upload_status(
     upload_id: str,
@@ -1065,29 +1108,121 @@ async def get_chunked_upload_status(
 ):
     """
     Get the status of a chunked upload.
+    Reports the chunks recorded through /parts; /resume reconciles them with Wasabi.
+    """
+    upload_info = await get_upload_session(
+        upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to view this upload"
+    )
+    return build_chunked_upload_status(upload_id, upload_info)
+
+@router.post("/chunked-upload/{upload_id}/parts", response_model=ChunkedUploadStatus)
+async def record_chunked_upload_parts(
+    upload_id: str,
+    parts: ChunkedUploadParts,
+    current_user: User = Depends(get_current_user)
+):
     """
-    if upload_id not in chunked_uploads:
+    Record the ETags of chunks the client has finished uploading.
+    Chunks can be reported one at a time or in batches as they complete.
+    """
+    upload_info = await get_upload_session(
+        upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to update this upload"
+    )
+    
+    if upload_info["status"] != "initialized":
+        raise HTTPException(status_code=400, detail="Upload is not in progress")
+    
+    invalid_chunks = [n for n in parts.etags if not 1 <= n <= upload_info["total_chunks"]]
+    if invalid_chunks:
+        raise HTTPException(status_code=400, detail=f"Invalid chunk numbers: {invalid_chunks}")
+    
+    upload_info = await upload_store.merge_field(upload_id, "etags", {
+        str(number): etag.strip('"') for number, etag in parts.etags.items()
+    })
+    if upload_info is None:
         raise HTTPException(status_code=404, detail="Upload not found")
     
-    upload_info = chunked_uploads[upload_id]
+    return build_chunked_upload_status(upload_id, upload_info)
+
+@router.post("/chunked-upload/{upload_id}/resume", response_model=ChunkedUploadResumeResponse)
+async def resume_chunked_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resume an interrupted chunked upload.
+    Reconciles the recorded chunks with the parts Wasabi actually holds and
+    returns fresh presigned URLs for the missing chunks only.
+    """
+    upload_info = await get_upload_session(
+        upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to resume this upload"
+    )
+    
+    if upload_info["status"] != "initialized":
+        raise HTTPException(status_code=400, detail="Upload is not in progress")
+    
+    # A recorded chunk that Wasabi doesn't hold must be re-sent
+    try:
+        upload_info, stored = await sync_uploaded_parts(upload_id, upload_info)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[CHUNKED_UPLOAD_RESUME] Error listing parts for {upload_id}: {str(e)}")
+        raise HTTPException(status_code=502, detail="Failed to check uploaded chunks")
     
-    # Verify user owns this upload
-    if upload_info["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view this upload")
+    total_chunks = upload_info["total_chunks"]
+    missing_chunks = [i for i in range(1, total_chunks + 1) if i not in stored]
+    print(f"[CHUNKED_UPLOAD_RESUME] Upload {upload_id}: {len(stored)} of {total_chunks} chunks stored")
+    
+    presigned_urls = await wasabi_storage.get_chunk_upload_urls(
+        upload_info["file_key"],
+        upload_info["wasabi_upload_id"],
+        total_chunks,
+        missing_chunks[:CHUNK_URL_WINDOW]
+    )
+    
+    return ChunkedUploadResumeResponse(
+        upload_id=upload_id,
+        chunk_size=upload_info["chunk_size"],
+        total_chunks=total_chunks,
+        uploaded_chunks=sorted(stored),
+        presigned_urls=presigned_urls,
+        missing_chunks=missing_chunks
+    )
+
+@router.get("/chunked-upload/{upload_id}/part-urls", response_model=ChunkedUploadPartUrls)
+async def get_chunked_upload_part_urls(
+    upload_id: str,
+    start: int = 1,
+    count: int = CHUNK_URL_WINDOW,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get presigned URLs for the chunks from ``start`` on, at most CHUNK_URL_WINDOW at a time.
+    """
+    upload_info = await get_upload_session(
+        upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to access this upload"
+    )
+    
+    if upload_info["status"] != "initialized":
+        raise HTTPException(status_code=400, detail="Upload is not in progress")
     
-    # Calculate progress
     total_chunks = upload_info["total_chunks"]
-    uploaded_chunks = list(upload_info["uploaded_chunks"])
-    remaining_chunks = [i for i in range(1, total_chunks + 1) if i not in upload_info["uploaded_chunks"]]
-    progress = (len(uploaded_chunks) / total_chunks) * 100 if total_chunks > 0 else 0
+    if not 1 <= start <= total_chunks:
+        raise HTTPException(status_code=400, detail=f"start must be between 1 and {total_chunks}")
+    
+    end = min(total_chunks, start + max(1, min(count, CHUNK_URL_WINDOW)) - 1)
+    presigned_urls = await wasabi_storage.get_chunk_upload_urls(
+        upload_info["file_key"],
+        upload_info["wasabi_upload_id"],
+        total_chunks,
+        range(start, end + 1)
+    )
     
-    return ChunkedUploadStatus(
+    return ChunkedUploadPartUrls(
         upload_id=upload_id,
-        status=upload_info["status"],
-        progress=progress,
-        uploaded_chunks=uploaded_chunks,
-        remaining_chunks=remaining_chunks,
-        error=upload_info.get("error")
+        presigned_urls=presigned_urls,
+        next_chunk=end + 1 if end < total_chunks else None
     )
 
 @router.post("/complete-chunked-upload-details", response_model=VideoResponse)
@@ -1109,18 +1244,15 @@ async def complete_chunked_upload_details(
     """
     print(f"[CHUNKED_UPLOAD_DETAILS] Completing upload {upload_id}")
     
-    if upload_id not in chunked_uploads:
-        raise HTTPException(status_code=404, detail="Upload not found")
-    
-    upload_info = chunked_uploads[upload_id]
-    
-    # Check if user owns this upload
-    if upload_info["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to complete this upload")
+    upload_info = await get_upload_session(
+        upload_id, CHUNKED_UPLOAD, current_user, "Not authorized to complete this upload"
+    )
     
-    # Check if upload is completed
+    # Check if upload is completed, and claim it so it can't be saved twice
     if upload_info["status"] != "completed":
         raise HTTPException(status_code=400, detail="Upload is not completed")
+    if await upload_store.transition(upload_id, ["completed"], {"status": "saving"}) is None:
+        raise HTTPException(status_code=409, detail="Upload is already being saved")
     
     file_key = upload_info["file_key"]
     if not file_key:
@@ -1153,7 +1285,8 @@ async def complete_chunked_upload_details(
         db.refresh(new_video)
         
         # Clean up upload info
-        del chunked_uploads[upload_id]
+        await upload_store.delete(upload_id)
+        await upload_notifier.discard(upload_id)
         
         # Generate fresh URLs for the response
         response_video = VideoResponse.model_validate(new_video)
@@ -1167,12 +1300,14 @@ async def complete_chunked_upload_details(
             except Exception as e:
                 print(f"[CHUNKED_UPLOAD_DETAILS] Error generating fresh video URL: {str(e)}")
         
-        # Start thumbnail generation in the background
-        asyncio.create_task(generate_thumbnail_async(new_video.id, file_key))
+        # Queue probing and thumbnail generation for the job worker
+        enqueue_ingest(db, new_video.id, file_key)
         
         return VideoResponse.model_validate(response_dict)
         
     except Exception as e:
+        # Release the claim so the details can be submitted again
+        await upload_store.transition(upload_id, ["saving"], {"status": "completed"})
         print(f"[CHUNKED_UPLOAD_DETAILS] Error completing upload: {str(e)}")
         import traceback
         print(f"[CHUNKED_UPLOAD_DETAILS] Traceback: {traceback.format_exc()}")
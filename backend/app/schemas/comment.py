@@ -43,7 +43,7 @@ class CommentResponse(BaseModel):
     event_id: Optional[uuid.UUID] = None  # Optional link to an event
     video_timestamp: Optional[float] = None  # Timestamp in the video where the comment refers to
     replies: List['CommentResponse'] = []
-    effective_timestamp: Optional[int] = None
+    effective_timestamp: Optional[float] = None  # Own, linked event's or parent's timestamp
 
     class Config:
         from_attributes = True
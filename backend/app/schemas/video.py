@@ -48,6 +48,11 @@ class VideoInDB(VideoBase):
     video_url: Optional[str] = None
     thumbnail_url: Optional[str] = None
     duration: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    bitrate: Optional[int] = None
+    keyframe_interval: Optional[float] = None
     game_version: Optional[str] = None
     composition: Optional[List[str]] = None
     rank: Optional[str] = None
@@ -67,6 +72,12 @@ class VideoResponse(BaseModel):
     file_path: Optional[str] = None
     video_url: Optional[str] = None
     thumbnail_url: Optional[str] = None
+    duration: Optional[int] = None  # Seconds, None until probed
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    bitrate: Optional[int] = None
+    keyframe_interval: Optional[float] = None
     game_version: Optional[str] = None
     composition: Optional[List[str]] = None
     rank: Optional[str] = None
@@ -100,7 +111,14 @@ class ChunkedUploadInitResponse(BaseModel):
     upload_id: str
     chunk_size: int
     total_chunks: int
+    presigned_urls: Dict[int, str]  # chunk_number -> presigned_url, first window only
+    next_chunk: Optional[int] = None  # First chunk without a URL; fetch it from /part-urls
+
+class ChunkedUploadPartUrls(BaseModel):
+    """Response with the next window of presigned chunk URLs"""
+    upload_id: str
     presigned_urls: Dict[int, str]  # chunk_number -> presigned_url
+    next_chunk: Optional[int] = None
 
 class ChunkedUploadComplete(BaseModel):
     """Request body for completing a chunked upload"""
@@ -108,6 +126,19 @@ class ChunkedUploadComplete(BaseModel):
     total_chunks: int
     etags: Dict[int, str]  # chunk_number -> ETag
 
+class ChunkedUploadParts(BaseModel):
+    """Request body for recording uploaded chunks"""
+    etags: Dict[int, str]  # chunk_number -> ETag
+
+class ChunkedUploadResumeResponse(BaseModel):
+    """Response for resuming a chunked upload"""
+    upload_id: str
+    chunk_size: int
+    total_chunks: int
+    uploaded_chunks: List[int]
+    presigned_urls: Dict[int, str]  # First window of the chunks still missing
+    missing_chunks: List[int]
+
 class ChunkedUploadStatus(BaseModel):
     """Response for upload status"""
     upload_id: str
@@ -0,0 +1,75 @@
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+
+from ..models.comment import Comment
+from ..models.event import Event
+from ..models.user import User
+from .video_detail import COMMENT_FIELDS
+
+
+def thread_cte(video_id: uuid.UUID):
+    """
+    Recursive CTE of (id, effective_timestamp) for every comment on a video
+    that hangs off a top-level comment.
+
+    The effective timestamp follows Comment.effective_timestamp: a linked
+    event's timestamp wins, then a top-level comment's own timestamp, and
+    replies inherit their parent's.
+    """
+    event = aliased(Event)
+    thread = (
+        select(Comment.id.label("id"), func.coalesce(event.video_timestamp, Comment.video_timestamp).label("effective_timestamp"))
+        .outerjoin(event, event.id == Comment.event_id)
+        .where(Comment.video_id == video_id, Comment.parent_id.is_(None))
+        .cte("thread", recursive=True)
+    )
+
+    reply = aliased(Comment)
+    reply_event = aliased(Event)
+    return thread.union_all(
+        select(reply.id, func.coalesce(reply_event.video_timestamp, thread.c.effective_timestamp))
+        .join(thread, reply.parent_id == thread.c.id)
+        .outerjoin(reply_event, reply_event.id == reply.event_id)
+    )
+
+
+def load_comment_thread(db: Session, video_id: uuid.UUID) -> List[Dict]:
+    """
+    Every comment on a video as a tree of dicts shaped like CommentResponse,
+    read in one query.
+
+    Top-level comments are newest first and replies oldest first under
+    their parent.
+    """
+    thread = thread_cte(video_id)
+    rows = db.execute(
+        select(
+            *(getattr(Comment, name) for name in COMMENT_FIELDS),
+            User.username, User.profile_picture, thread.c.effective_timestamp
+        )
+        .join(thread, thread.c.id == Comment.id)
+        .outerjoin(User, User.id == Comment.user_id)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+    ).all()
+
+    nodes: Dict[uuid.UUID, dict] = {}
+    for row in rows:
+        node = dict(zip(COMMENT_FIELDS, row))
+        node["user_username"] = row.username or "Unknown"
+        node["user_profile_picture"] = row.profile_picture
+        node["effective_timestamp"] = row.effective_timestamp
+        node["replies"] = []
+        nodes[node["id"]] = node
+
+    # Rows are in creation order, so appending keeps every replies list sorted
+    roots = []
+    for node in nodes.values():
+        if node["parent_id"] is None:
+            roots.append(node)
+        else:
+            nodes[node["parent_id"]]["replies"].append(node)
+    roots.reverse()
+    return roots
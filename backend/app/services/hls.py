@@ -0,0 +1,218 @@
+import os
+import hmac
+import time
+import uuid
+import asyncio
+import hashlib
+import tempfile
+import subprocess
+from functools import partial
+from typing import List, Optional
+
+from .wasabi_storage import wasabi_storage
+from .media_executor import media_executor
+from .thumbnail import THUMBNAIL_URL_EXPIRES, ffmpeg_input_options
+
+HLS_SEGMENT_SECONDS = int(os.getenv("HLS_SEGMENT_SECONDS", "6"))
+HLS_TRANSCODE_TIMEOUT = int(os.getenv("HLS_TRANSCODE_TIMEOUT", "3300"))
+# Extra transcode time allowed per second of video, so long VODs get a budget that fits them
+HLS_TRANSCODE_FACTOR = float(os.getenv("HLS_TRANSCODE_FACTOR", "2"))
+# Lifetime of signed playlist URLs and of the segment URLs inside them
+HLS_URL_EXPIRES = int(os.getenv("HLS_URL_EXPIRES", str(6 * 3600)))
+# Key for playlist signatures; without it /stream serves the MP4 only
+HLS_URL_SECRET = os.getenv("HLS_URL_SECRET", "")
+
+# (height, video kbps, audio kbps), highest first; renditions above the source are skipped
+HLS_LADDER = [
+    (1080, 5000, 128),
+    (720, 2800, 128),
+    (480, 1400, 96),
+    (360, 800, 96),
+]
+
+CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+
+def select_renditions(width: Optional[int], height: Optional[int]) -> List[dict]:
+    """Pick the ladder rungs that don't upscale the source"""
+    rungs = [rung for rung in HLS_LADDER if not height or rung[0] <= height] or [HLS_LADDER[-1]]
+    renditions = []
+    for rung_height, video_bitrate, audio_bitrate in rungs:
+        if width and height:
+            rung_width = max(2, round(rung_height * width / height / 2) * 2)
+        else:
+            rung_width = rung_height * 16 // 9
+        renditions.append({
+            "width": rung_width,
+            "height": rung_height,
+            "video_bitrate": video_bitrate,
+            "audio_bitrate": audio_bitrate
+        })
+    return renditions
+
+
+def hls_transcode_timeout(duration: Optional[float]) -> int:
+    """Seconds ffmpeg may spend on a video of ``duration`` seconds (unknown gets the base timeout)"""
+    return HLS_TRANSCODE_TIMEOUT + int((duration or 0) * HLS_TRANSCODE_FACTOR)
+
+
+def transcode_hls(
+    video_path: str, output_dir: str, input_options: dict, renditions: List[dict], segment_seconds: int, timeout: int
+) -> None:
+    """
+    Decode the source once and encode every rendition as a segmented HLS stream
+    into output_dir/v{i}/ (runs in a media worker process).
+
+    Keyframes are forced on segment boundaries so renditions switch cleanly.
+    """
+    args = ["ffmpeg", "-y", "-v", "error"]
+    for key, value in input_options.items():
+        args += [f"-{key}", str(value)]
+    args += ["-i", video_path]
+
+    outputs = "".join(f"[v{i}]" for i in range(len(renditions)))
+    filters = [f"[0:v]split={len(renditions)}{outputs}"]
+    filters += [f"[v{i}]scale={r['width']}:{r['height']}[o{i}]" for i, r in enumerate(renditions)]
+    args += ["-filter_complex", ";".join(filters)]
+
+    for i, rendition in enumerate(renditions):
+        rendition_dir = os.path.join(output_dir, f"v{i}")
+        os.makedirs(rendition_dir, exist_ok=True)
+        args += [
+            "-map", f"[o{i}]", "-map", "0:a:0?",
+            "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+            "-b:v", f"{rendition['video_bitrate']}k",
+            "-maxrate", f"{rendition['video_bitrate'] * 107 // 100}k",
+            "-bufsize", f"{rendition['video_bitrate'] * 2}k",
+            "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+            "-sc_threshold", "0",
+            "-c:a", "aac", "-b:a", f"{rendition['audio_bitrate']}k", "-ac", "2",
+            "-f", "hls",
+            "-hls_time", str(segment_seconds),
+            "-hls_playlist_type", "vod",
+            "-hls_segment_filename", os.path.join(rendition_dir, "seg_%05d.ts"),
+            os.path.join(rendition_dir, "index.m3u8")
+        ]
+
+    subprocess.run(args, check=True, capture_output=True, timeout=timeout)
+
+
+def build_master_playlist(renditions: List[dict]) -> str:
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for i, rendition in enumerate(renditions):
+        bandwidth = (rendition["video_bitrate"] + rendition["audio_bitrate"]) * 1000
+        lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={rendition['width']}x{rendition['height']}")
+        lines.append(f"v{i}/index.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+async def _upload_directory(local_dir: str, key_prefix: str) -> int:
+    """Upload every file under local_dir concurrently, returns the number of files"""
+    loop = asyncio.get_event_loop()
+    window = asyncio.Semaphore(wasabi_storage.upload_concurrency)
+
+    async def upload(path: str, key: str):
+        async with window:
+            content_type = CONTENT_TYPES.get(os.path.splitext(path)[1], "application/octet-stream")
+            await loop.run_in_executor(None, partial(
+                wasabi_storage.s3_client.upload_file,
+                path,
+                wasabi_storage.bucket_name,
+                key,
+                ExtraArgs={"ContentType": content_type}
+            ))
+
+    uploads = []
+    for root, _, files in os.walk(local_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, local_dir).replace(os.sep, "/")
+            uploads.append(upload(path, f"{key_prefix}/{relative}"))
+    await asyncio.gather(*uploads)
+    return len(uploads)
+
+
+async def generate_hls_from_file_key(
+    file_key: str, width: Optional[int] = None, height: Optional[int] = None, duration: Optional[float] = None
+) -> str:
+    """
+    Transcode a stored video into an HLS ladder and upload it under hls/{uuid}/.
+
+    Segments and rendition playlists are uploaded in parallel before the
+    master playlist, so the master key returned here only ever points at a
+    complete stream. Raises MediaExecutorSaturated when the media workers are full
+    and subprocess.TimeoutExpired when ffmpeg overruns its duration-based budget.
+    """
+    renditions = select_renditions(width, height)
+    timeout = hls_transcode_timeout(duration)
+    key_prefix = f"hls/{uuid.uuid4()}"
+    print(f"[HLS] Transcoding {file_key} into {', '.join(str(r['height']) + 'p' for r in renditions)}")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start_time = time.time()
+        video_url = wasabi_storage.presign_get(file_key, max(THUMBNAIL_URL_EXPIRES, timeout))
+        await media_executor.run(
+            transcode_hls, video_url, output_dir, ffmpeg_input_options(video_url), renditions, HLS_SEGMENT_SECONDS, timeout
+        )
+        print(f"[HLS] Transcode finished in {time.time() - start_time:.2f}s")
+
+        start_time = time.time()
+        count = await _upload_directory(output_dir, key_prefix)
+        print(f"[HLS] Uploaded {count} files in {time.time() - start_time:.2f}s")
+
+    master_key = f"{key_prefix}/master.m3u8"
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, partial(
+        wasabi_storage.s3_client.put_object,
+        Bucket=wasabi_storage.bucket_name,
+        Key=master_key,
+        Body=build_master_playlist(renditions).encode("utf-8"),
+        ContentType=CONTENT_TYPES[".m3u8"]
+    ))
+    return master_key
+
+
+def playlist_signature(video_id: str, expires: int) -> str:
+    """HMAC that lets a player fetch a video's playlists without a bearer token"""
+    if not HLS_URL_SECRET:
+        raise RuntimeError("HLS_URL_SECRET is not set")
+    message = f"{video_id}:{expires}".encode("utf-8")
+    return hmac.new(HLS_URL_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def signed_playlist_query(video_id: str) -> str:
+    expires = int(time.time()) + HLS_URL_EXPIRES
+    return f"expires={expires}&sig={playlist_signature(video_id, expires)}"
+
+
+def hls_signing_enabled() -> bool:
+    return bool(HLS_URL_SECRET)
+
+
+def verify_playlist_signature(video_id: str, expires: int, sig: str) -> bool:
+    if not HLS_URL_SECRET or expires < time.time():
+        return False
+    return hmac.compare_digest(playlist_signature(video_id, expires), sig)
+
+
+def sign_master_playlist(playlist: str, query: str) -> str:
+    """Carry the signature onto the variant playlist URIs"""
+    lines = []
+    for line in playlist.splitlines():
+        if line and not line.startswith("#"):
+            line = f"{line}?{query}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def sign_media_playlist(playlist: str, segment_prefix: str) -> str:
+    """Replace relative segment URIs with pre-signed Wasabi URLs"""
+    lines = []
+    for line in playlist.splitlines():
+        if line and not line.startswith("#"):
+            line = wasabi_storage.presign_get(f"{segment_prefix}/{line}", HLS_URL_EXPIRES)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,28 @@
+import os
+import aiohttp
+from typing import Optional
+
+# Shared connection-pooled client for outbound HTTP on the request path
+_session: Optional[aiohttp.ClientSession] = None
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "5"))
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the shared aiohttp client session"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session (called on application shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
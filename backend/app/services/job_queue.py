@@ -0,0 +1,204 @@
+import os
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.job import Job, JobStatus
+
+# Lease on a claimed job; a job still running after this is assumed lost
+JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_BASE = int(os.getenv("JOB_BACKOFF_BASE", "10"))
+JOB_BACKOFF_MAX = int(os.getenv("JOB_BACKOFF_MAX", "900"))
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# kind -> coroutine taking the job payload, registered with @job_handler
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+# kind -> lease/run timeout for kinds that need longer than JOB_VISIBILITY_TIMEOUT,
+# either fixed or computed from the job's payload
+JobTimeout = Union[int, Callable[[Dict[str, Any]], int]]
+JOB_TIMEOUTS: Dict[str, JobTimeout] = {}
+
+
+class RetryLater(Exception):
+    """Raised by a handler to defer its job without using up an attempt"""
+
+    def __init__(self, delay: int = 30, reason: str = ""):
+        super().__init__(reason or f"Deferred for {delay}s")
+        self.delay = delay
+
+
+class JobFailed(Exception):
+    """Raised by a handler for a failure that retrying won't fix; the job fails without further attempts"""
+
+
+def job_handler(kind: str, timeout: Optional[JobTimeout] = None):
+    """Register a coroutine as the handler for jobs of ``kind``, optionally with its own timeout"""
+    def decorator(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        if timeout:
+            JOB_TIMEOUTS[kind] = timeout
+        return func
+    return decorator
+
+
+def job_timeout(kind: str, payload: Optional[Dict[str, Any]] = None) -> int:
+    """Seconds a job of ``kind`` may run before its lease expires"""
+    timeout = JOB_TIMEOUTS.get(kind, JOB_VISIBILITY_TIMEOUT)
+    return timeout(payload or {}) if callable(timeout) else timeout
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    delay: int = 0,
+    max_attempts: Optional[int] = None,
+    dedupe_key: Optional[str] = None
+) -> Job:
+    """
+    Add a job to the queue and commit it.
+
+    Enqueue after the rows the job depends on have been committed, so a worker
+    never picks up a job for data it can't see yet. With ``dedupe_key`` the
+    job is only added once: later calls return the existing job, whatever
+    its status.
+    """
+    if dedupe_key is not None:
+        existing = db.query(Job).filter(Job.dedupe_key == dedupe_key).first()
+        if existing is not None:
+            print(f"[JOBS] {kind} job for {dedupe_key} already queued as {existing.id}")
+            return existing
+
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status=JobStatus.PENDING.value,
+        max_attempts=max_attempts or JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+        dedupe_key=dedupe_key
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        if dedupe_key is None:
+            raise
+        # Another worker enqueued the same key between the check and the insert
+        db.rollback()
+        return db.query(Job).filter(Job.dedupe_key == dedupe_key).one()
+    print(f"[JOBS] Enqueued {kind} job {job.id}")
+    return job
+
+
+def claim_job(db: Session) -> Optional[Job]:
+    """
+    Claim the next due job, or return None if there is nothing to do.
+
+    Pending jobs whose run_at has passed and running jobs whose lease expired
+    are eligible. SKIP LOCKED lets many workers poll without blocking on rows
+    another worker is claiming.
+    """
+    now = datetime.utcnow()
+    job = (
+        db.query(Job)
+        .filter(or_(
+            (Job.status == JobStatus.PENDING.value) & (Job.run_at <= now),
+            (Job.status == JobStatus.RUNNING.value) & (Job.locked_until < now)
+        ))
+        .order_by(Job.run_at)
+        .with_for_update(skip_locked=True)
+        .limit(1)
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        return None
+
+    if job.status == JobStatus.RUNNING.value and job.attempts >= job.max_attempts:
+        # Its worker died on the last attempt; give up rather than run it again
+        job.status = JobStatus.FAILED.value
+        job.locked_until = None
+        job.last_error = "Visibility timeout expired on the final attempt"
+        db.commit()
+        return claim_job(db)
+
+    job.status = JobStatus.RUNNING.value
+    job.attempts += 1
+    job.locked_until = now + timedelta(seconds=job_timeout(job.kind, job.payload))
+    db.commit()
+    return job
+
+
+def _leased_job(db: Session, job_id, attempt: int) -> Optional[Job]:
+    """
+    Lock a job only if it's still running under the lease taken on ``attempt``.
+
+    A worker whose lease expired may finish after another worker re-claimed
+    the job; the re-claim bumped ``attempts``, so the stale worker gets None.
+    """
+    job = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.status == JobStatus.RUNNING.value, Job.attempts == attempt)
+        .with_for_update()
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        print(f"[JOBS] Lost the lease on job {job_id} (attempt {attempt}), dropping its result")
+    return job
+
+
+def complete_job(db: Session, job_id, attempt: int) -> bool:
+    """Mark a claimed job as done, returns False if the lease was lost"""
+    job = _leased_job(db, job_id, attempt)
+    if job is None:
+        return False
+    job.status = JobStatus.DONE.value
+    job.locked_until = None
+    job.last_error = None
+    db.commit()
+    return True
+
+
+def fail_job(db: Session, job_id, attempt: int, error: BaseException) -> bool:
+    """
+    Reschedule a failed job with exponential backoff, or give up after
+    max_attempts (or at once on JobFailed). Returns False if the lease was lost.
+    """
+    job = _leased_job(db, job_id, attempt)
+    if job is None:
+        return False
+
+    job.locked_until = None
+
+    if isinstance(error, RetryLater):
+        # Not a failure (e.g. no capacity right now): give the attempt back
+        job.attempts = max(0, job.attempts - 1)
+        job.status = JobStatus.PENDING.value
+        job.run_at = datetime.utcnow() + timedelta(seconds=error.delay)
+        print(f"[JOBS] {job.kind} job {job.id} deferred for {error.delay}s: {str(error)}")
+        db.commit()
+        return True
+
+    job.last_error = "".join(traceback.format_exception(type(error), error, error.__traceback__))[-4000:]
+
+    if isinstance(error, JobFailed):
+        job.status = JobStatus.FAILED.value
+        print(f"[JOBS] {job.kind} job {job.id} failed permanently: {str(error)}")
+    elif job.attempts >= job.max_attempts:
+        job.status = JobStatus.FAILED.value
+        print(f"[JOBS] {job.kind} job {job.id} failed permanently after {job.attempts} attempts")
+    else:
+        backoff = min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * 2 ** (job.attempts - 1))
+        job.status = JobStatus.PENDING.value
+        job.run_at = datetime.utcnow() + timedelta(seconds=backoff)
+        print(f"[JOBS] {job.kind} job {job.id} failed (attempt {job.attempts}), retrying in {backoff}s")
+    db.commit()
+    return True
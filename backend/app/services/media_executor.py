@@ -0,0 +1,112 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", "2"))
+MEDIA_QUEUE_SIZE = int(os.getenv("MEDIA_QUEUE_SIZE", "8"))
+
+
+class MediaExecutorSaturated(Exception):
+    """Raised when every media worker is busy and the wait queue is full"""
+
+
+def _timed_call(func: Callable, args: tuple) -> tuple:
+    """Runs in the worker process; reports when the job actually started"""
+    started_at = time.time()
+    return started_at, func(*args)
+
+
+class MediaExecutor:
+    """
+    Process pool for CPU-heavy media work (ffmpeg).
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more
+    wait for a free process. Anything beyond that is rejected with
+    MediaExecutorSaturated so callers can defer it instead of piling up work.
+    Functions passed to ``run`` must be picklable (module-level).
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted but still waiting for a process"""
+        return max(0, self._pending - self.max_workers)
+
+    def has_capacity(self) -> bool:
+        return self._pending < self.max_workers + self.max_queue
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """Run ``func(*args)`` in a worker process, raising MediaExecutorSaturated when full"""
+        if not self.has_capacity():
+            self.rejected += 1
+            raise MediaExecutorSaturated(
+                f"Media executor full ({self._pending} jobs for {self.max_workers} workers)"
+            )
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        name = getattr(func, "__name__", "job")
+        submitted_at = time.time()
+        # The slot is held until the process is done with the job, not just
+        # until the caller stops waiting: a timed out or cancelled caller
+        # leaves ffmpeg running and that process isn't free yet.
+        future = self._pool.submit(_timed_call, func, args)
+        with self._lock:
+            self._pending += 1
+        future.add_done_callback(self._release)
+        try:
+            started_at, result = await asyncio.wrap_future(future)
+        except Exception:
+            self.failed += 1
+            raise
+
+        finished_at = time.time()
+        wait, run = started_at - submitted_at, finished_at - started_at
+        self.completed += 1
+        self.total_wait += wait
+        self.total_run += run
+        print(f"[MEDIA] {name} waited {wait:.2f}s, ran {run:.2f}s (queue depth {self.queue_depth})")
+        return result
+
+    def _release(self, future) -> None:
+        # Called from the pool's management thread once the process is done
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Return queue depth and timing counters for monitoring"""
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.max_queue,
+            "running": min(self._pending, self.max_workers),
+            "queued": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.completed if self.completed else 0.0,
+            "avg_run": self.total_run / self.completed if self.completed else 0.0
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+# Global instance
+media_executor = MediaExecutor(MEDIA_WORKERS, MEDIA_QUEUE_SIZE)
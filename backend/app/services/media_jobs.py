@@ -0,0 +1,149 @@
+import os
+import uuid
+import subprocess
+from typing import Any, Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from ..db.database import SessionLocal
+from ..models.video import Video
+from .job_queue import JobFailed, RetryLater, enqueue_job, job_handler
+from .media_executor import MediaExecutorSaturated
+from .hls import HLS_TRANSCODE_FACTOR, generate_hls_from_file_key
+from .media_probe import probe_file_key
+from .sprites import generate_sprites_from_file_key
+from .thumbnail import generate_thumbnail_from_file_key
+
+INGEST_JOB = "ingest"
+SPRITES_JOB = "sprites"
+HLS_JOB = "hls"
+
+# How long a job waits before retrying when the media workers are full
+MEDIA_DEFER_SECONDS = int(os.getenv("MEDIA_DEFER_SECONDS", "15"))
+# Transcoding a full ladder takes far longer than a thumbnail; long videos get
+# HLS_TRANSCODE_FACTOR seconds more per second of duration on top of this
+HLS_JOB_TIMEOUT = int(os.getenv("HLS_JOB_TIMEOUT", "3600"))
+
+
+def _update_video(video_id: uuid.UUID, values: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        video = db.get(Video, video_id)
+        if video:
+            for key, value in values.items():
+                setattr(video, key, value)
+            db.commit()
+            print(f"[MEDIA_JOBS] Updated video {video_id}: {', '.join(values)}")
+        else:
+            print(f"[MEDIA_JOBS] Video {video_id} not found in database")
+    finally:
+        db.close()
+
+
+def _enqueue(kind: str, payload: Dict[str, Any]) -> None:
+    """Queue a per-video follow-up job, at most once per (kind, video)"""
+    db = SessionLocal()
+    try:
+        enqueue_job(db, kind, payload, dedupe_key=f"{kind}:{payload['video_id']}")
+    finally:
+        db.close()
+
+
+@job_handler(INGEST_JOB)
+async def ingest_video(payload: Dict[str, Any]) -> None:
+    """
+    Probe a stored video's media info and extract its thumbnail, saving both
+    on the video row. Sprites and HLS are queued once the probe is in; a
+    retried ingest doesn't queue them twice.
+    """
+    video_id = uuid.UUID(payload["video_id"])
+    file_key = payload["file_key"]
+
+    try:
+        info = await probe_file_key(file_key)
+    except MediaExecutorSaturated as e:
+        raise RetryLater(MEDIA_DEFER_SECONDS, str(e))
+    except Exception as e:
+        # Media info is best effort; don't hold the thumbnail back for it
+        print(f"[MEDIA_JOBS] Probe failed for video {video_id}: {str(e)}")
+        info = {}
+
+    # Saved before the thumbnail so a failing thumbnail doesn't lose it
+    if info:
+        await run_in_threadpool(_update_video, video_id, info)
+
+    # Scrub previews need the duration, so they're queued once it's known
+    if info.get("duration"):
+        await run_in_threadpool(_enqueue, SPRITES_JOB, {
+            "video_id": str(video_id),
+            "file_key": file_key,
+            "duration": info["duration"],
+            "width": info.get("width"),
+            "height": info.get("height")
+        })
+
+    # Only transcode sources ffprobe could read; others keep playing the original
+    if info.get("height"):
+        await run_in_threadpool(_enqueue, HLS_JOB, {
+            "video_id": str(video_id),
+            "file_key": file_key,
+            "width": info.get("width"),
+            "height": info["height"],
+            "duration": info.get("duration")
+        })
+
+    try:
+        thumbnail_key = await generate_thumbnail_from_file_key(file_key)
+    except MediaExecutorSaturated as e:
+        raise RetryLater(MEDIA_DEFER_SECONDS, str(e))
+    if not thumbnail_key:
+        # Raise so the queue retries with backoff
+        raise RuntimeError(f"Thumbnail generation failed for video {video_id}")
+    await run_in_threadpool(_update_video, video_id, {"thumbnail_url": thumbnail_key})
+
+
+@job_handler(SPRITES_JOB)
+async def generate_video_sprites(payload: Dict[str, Any]) -> None:
+    """Build the sprite sheet and WebVTT scrub index for a video"""
+    video_id = uuid.UUID(payload["video_id"])
+    try:
+        vtt_key = await generate_sprites_from_file_key(
+            payload["file_key"], payload["duration"], payload.get("width"), payload.get("height")
+        )
+    except MediaExecutorSaturated as e:
+        raise RetryLater(MEDIA_DEFER_SECONDS, str(e))
+
+    if not vtt_key:
+        raise RuntimeError(f"Sprite generation failed for video {video_id}")
+    await run_in_threadpool(_update_video, video_id, {"sprite_vtt_key": vtt_key})
+
+
+def hls_job_timeout(payload: Dict[str, Any]) -> int:
+    """Lease for an HLS job, scaled like the transcode timeout it has to outlast"""
+    return HLS_JOB_TIMEOUT + int((payload.get("duration") or 0) * HLS_TRANSCODE_FACTOR)
+
+
+@job_handler(HLS_JOB, timeout=hls_job_timeout)
+async def package_video_hls(payload: Dict[str, Any]) -> None:
+    """Transcode a video into the HLS ladder; /stream serves it once hls_master_key is set"""
+    video_id = uuid.UUID(payload["video_id"])
+    try:
+        master_key = await generate_hls_from_file_key(
+            payload["file_key"], payload.get("width"), payload.get("height"), payload.get("duration")
+        )
+    except MediaExecutorSaturated as e:
+        raise RetryLater(MEDIA_DEFER_SECONDS, str(e))
+    except subprocess.TimeoutExpired as e:
+        # The budget already scales with the duration, so another attempt would time out too
+        raise JobFailed(f"HLS transcode for video {video_id} timed out after {e.timeout}s")
+
+    await run_in_threadpool(_update_video, video_id, {"hls_master_key": master_key})
+
+
+def enqueue_ingest(db, video_id, file_key: str) -> None:
+    """Queue ingest (probe + thumbnail) for a committed video; failures here don't fail the upload"""
+    try:
+        enqueue_job(db, INGEST_JOB, {"video_id": str(video_id), "file_key": file_key})
+    except Exception as e:
+        db.rollback()
+        print(f"[MEDIA_JOBS] Could not enqueue ingest for video {video_id}: {str(e)}")
@@ -0,0 +1,84 @@
+import os
+import json
+import math
+import subprocess
+from typing import Optional
+
+from .wasabi_storage import wasabi_storage
+from .media_executor import media_executor
+from .thumbnail import THUMBNAIL_URL_EXPIRES, ffmpeg_input_options
+
+# Seconds of packets scanned from the start to measure the keyframe interval
+KEYFRAME_PROBE_SECONDS = int(os.getenv("KEYFRAME_PROBE_SECONDS", "30"))
+PROBE_TIMEOUT = int(os.getenv("PROBE_TIMEOUT", "120"))
+
+
+def parse_probe(info: dict) -> dict:
+    """Turn ffprobe JSON output into the media columns stored on Video"""
+    stream = (info.get("streams") or [{}])[0]
+    fmt = info.get("format") or {}
+
+    def number(*values, cast=float) -> Optional[float]:
+        for value in values:
+            try:
+                if value not in (None, "", "N/A"):
+                    return cast(value)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    duration = number(fmt.get("duration"), stream.get("duration"))
+    bitrate = number(fmt.get("bit_rate"), stream.get("bit_rate"), cast=int)
+
+    keyframes = sorted(
+        float(packet["pts_time"])
+        for packet in info.get("packets") or []
+        if "K" in packet.get("flags", "") and number(packet.get("pts_time")) is not None
+    )
+    intervals = sorted(b - a for a, b in zip(keyframes, keyframes[1:]) if b > a)
+    keyframe_interval = round(intervals[len(intervals) // 2], 3) if intervals else None
+
+    return {
+        "duration": math.ceil(duration) if duration else None,
+        "width": stream.get("width"),
+        "height": stream.get("height"),
+        "video_codec": stream.get("codec_name"),
+        "bitrate": bitrate,
+        "keyframe_interval": keyframe_interval
+    }
+
+
+def probe_video(video_path: str, input_options: dict) -> dict:
+    """
+    Run a single ffprobe for container, stream and keyframe info (runs in a media worker process).
+
+    Only the packets of the first KEYFRAME_PROBE_SECONDS are read, so over
+    HTTP this costs the index plus a short range, not the whole file.
+    """
+    args = ["ffprobe", "-v", "error"]
+    for key, value in input_options.items():
+        args += [f"-{key}", str(value)]
+    args += [
+        "-select_streams", "v:0",
+        "-show_format",
+        "-show_streams",
+        "-show_entries", "packet=pts_time,flags",
+        "-read_intervals", f"%+{KEYFRAME_PROBE_SECONDS}",
+        "-of", "json",
+        video_path
+    ]
+    result = subprocess.run(args, capture_output=True, check=True, timeout=PROBE_TIMEOUT)
+    return parse_probe(json.loads(result.stdout or b"{}"))
+
+
+async def probe_file_key(file_key: str) -> dict:
+    """
+    Probe a video stored in Wasabi through a presigned URL.
+
+    The ingest thumbnail reads the same URL again; both are range reads of
+    the index and the first seconds, so an upload is never fetched in full.
+    """
+    video_url = wasabi_storage.presign_get(file_key, THUMBNAIL_URL_EXPIRES)
+    info = await media_executor.run(probe_video, video_url, ffmpeg_input_options(video_url))
+    print(f"[PROBE] {file_key}: {info}")
+    return info
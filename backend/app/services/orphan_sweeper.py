@@ -0,0 +1,242 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from ..db.database import SessionLocal, engine
+from ..models.video import Video
+from .sprites import sprite_image_key
+from .upload_store import UPLOAD_SESSION_TTL, upload_store
+from .wasabi_storage import wasabi_storage
+
+# Seconds between sweeps in the worker (0 disables the sweeper)
+ORPHAN_SWEEP_INTERVAL = int(os.getenv("ORPHAN_SWEEP_INTERVAL", str(6 * 3600)))
+# Anything younger than this may still belong to an upload or job in flight
+ORPHAN_MIN_AGE = int(os.getenv("ORPHAN_MIN_AGE", str(UPLOAD_SESSION_TTL)))
+# Pause between Wasabi API calls so a sweep never competes with user traffic
+ORPHAN_SWEEP_PAUSE = float(os.getenv("ORPHAN_SWEEP_PAUSE", "0.5"))
+ORPHAN_SWEEP_MAX_DELETES = int(os.getenv("ORPHAN_SWEEP_MAX_DELETES", "10000"))
+# Dry run (log only) unless explicitly turned off, until the referenced key set has been checked in production
+ORPHAN_SWEEP_DRY_RUN = os.getenv("ORPHAN_SWEEP_DRY_RUN", "true").lower() == "true"
+
+SWEPT_PREFIXES = ("videos/", "thumbnails/", "hls/")
+DELETE_BATCH_SIZE = 1000  # delete_objects limit
+SWEEP_LOCK_KEY = 72_410_020  # pg advisory lock shared by every worker
+
+
+def _normalize_key(value: str) -> Optional[str]:
+    """Stored references are file keys, or full URLs on older rows (None if the URL can't be parsed)"""
+    if value.startswith("http"):
+        return wasabi_storage._extract_key_from_url(value.split("?", 1)[0])
+    return value
+
+
+def load_referenced_keys() -> Tuple[Set[str], Set[str], List[str]]:
+    """
+    Return (object keys, key prefixes) that some Video row still points at,
+    plus the references that couldn't be turned into a key.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            Video.video_url, Video.thumbnail_url, Video.sprite_vtt_key, Video.hls_master_key
+        ).all()
+    finally:
+        db.close()
+
+    keys: Set[str] = set()
+    prefixes: Set[str] = set()
+    unresolved: List[str] = []
+    for video_url, thumbnail_url, sprite_vtt_key, hls_master_key in rows:
+        for value in (video_url, thumbnail_url, sprite_vtt_key):
+            if not value:
+                continue
+            key = _normalize_key(value)
+            if key:
+                keys.add(key)
+            else:
+                unresolved.append(value)
+        if sprite_vtt_key:
+            keys.add(sprite_image_key(sprite_vtt_key))
+        if hls_master_key:
+            # Segments and rendition playlists live next to the master
+            prefixes.add(hls_master_key.rsplit("/", 1)[0] + "/")
+    return keys, prefixes, unresolved
+
+
+class OrphanSweeper:
+    """
+    Reclaims storage that no Video row references.
+
+    Aborts incomplete multipart uploads and batch-deletes unreferenced objects
+    under SWEPT_PREFIXES, skipping anything younger than ``min_age``. Wasabi
+    calls are paced by ``pause`` and each run stops after ``max_deletes``.
+    Deletes are skipped entirely if any stored reference can't be resolved
+    to a key, since its object would otherwise look orphaned.
+    """
+
+    def __init__(
+        self,
+        min_age: int = ORPHAN_MIN_AGE,
+        pause: float = ORPHAN_SWEEP_PAUSE,
+        max_deletes: int = ORPHAN_SWEEP_MAX_DELETES,
+        dry_run: bool = ORPHAN_SWEEP_DRY_RUN
+    ):
+        self.min_age = min_age
+        self.pause = pause
+        self.max_deletes = max_deletes
+        self.dry_run = dry_run
+
+    async def _call(self, func, **kwargs):
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(None, partial(func, **kwargs))
+        await asyncio.sleep(self.pause)
+        return response
+
+    async def abort_stale_multipart_uploads(self, cutoff: datetime, report: dict) -> None:
+        s3 = wasabi_storage.s3_client
+        bucket = wasabi_storage.bucket_name
+        params = {"Bucket": bucket}
+        # A resumable upload can outlive min_age while its session is still being extended
+        in_use = await upload_store.multipart_upload_ids()
+        while True:
+            response = await self._call(s3.list_multipart_uploads, **params)
+            for upload in response.get("Uploads", []):
+                if upload["Initiated"] >= cutoff or upload["UploadId"] in in_use:
+                    continue
+                print(f"[SWEEPER] Aborting multipart upload {upload['UploadId']} for {upload['Key']}")
+                if not self.dry_run:
+                    try:
+                        await self._call(s3.abort_multipart_upload, Bucket=bucket, Key=upload["Key"], UploadId=upload["UploadId"])
+                    except Exception as e:
+                        report["errors"].append(f"abort {upload['Key']}: {str(e)}")
+                        continue
+                report["aborted_multipart_uploads"] += 1
+            if not response.get("IsTruncated"):
+                return
+            params["KeyMarker"] = response.get("NextKeyMarker")
+            params["UploadIdMarker"] = response.get("NextUploadIdMarker")
+
+    async def _delete_batch(self, batch: List[Tuple[str, int]], report: dict) -> None:
+        if not batch:
+            return
+        if self.dry_run:
+            deleted = {key for key, _ in batch}
+        else:
+            response = await self._call(
+                wasabi_storage.s3_client.delete_objects,
+                Bucket=wasabi_storage.bucket_name,
+                Delete={"Objects": [{"Key": key} for key, _ in batch], "Quiet": False}
+            )
+            deleted = {item["Key"] for item in response.get("Deleted", [])}
+            for error in response.get("Errors", []):
+                report["errors"].append(f"delete {error.get('Key')}: {error.get('Message')}")
+        for key, size in batch:
+            if key in deleted:
+                report["deleted_objects"] += 1
+                report["reclaimed_bytes"] += size
+
+    async def delete_orphaned_objects(self, cutoff: datetime, report: dict) -> None:
+        keys, prefixes, unresolved = await run_in_threadpool(load_referenced_keys)
+        if unresolved:
+            # The object behind an unparseable reference would look orphaned, so delete nothing
+            print(f"[SWEEPER] {len(unresolved)} references can't be resolved to keys, skipping deletes: {unresolved[:5]}")
+            report["errors"].append(f"unresolved references: {len(unresolved)}")
+            report["deletes_skipped"] = True
+            return
+        s3 = wasabi_storage.s3_client
+        batch: List[Tuple[str, int]] = []
+
+        for prefix in SWEPT_PREFIXES:
+            params = {"Bucket": wasabi_storage.bucket_name, "Prefix": prefix}
+            while True:
+                response = await self._call(s3.list_objects_v2, **params)
+                for obj in response.get("Contents", []):
+                    key = obj["Key"]
+                    if obj["LastModified"] >= cutoff or key in keys or any(key.startswith(p) for p in prefixes):
+                        continue
+                    if report["deleted_objects"] + len(batch) >= self.max_deletes:
+                        report["limit_reached"] = True
+                        break
+                    batch.append((key, obj.get("Size", 0)))
+                    if len(batch) == DELETE_BATCH_SIZE:
+                        await self._delete_batch(batch, report)
+                        batch = []
+                if report["limit_reached"] or not response.get("IsTruncated"):
+                    break
+                params["ContinuationToken"] = response["NextContinuationToken"]
+            if report["limit_reached"]:
+                break
+
+        await self._delete_batch(batch, report)
+
+    async def sweep(self) -> dict:
+        """Run one sweep and return what it reclaimed"""
+        start_time = time.time()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.min_age)
+        report = {
+            "dry_run": self.dry_run,
+            "aborted_multipart_uploads": 0,
+            "deleted_objects": 0,
+            "reclaimed_bytes": 0,
+            "expired_upload_sessions": 0,
+            "limit_reached": False,
+            "deletes_skipped": False,
+            "errors": []
+        }
+
+        for step in (self.abort_stale_multipart_uploads, self.delete_orphaned_objects):
+            try:
+                await step(cutoff, report)
+            except Exception as e:
+                print(f"[SWEEPER] {step.__name__} failed: {str(e)}")
+                report["errors"].append(f"{step.__name__}: {str(e)}")
+        try:
+            report["expired_upload_sessions"] = await upload_store.purge_expired()
+        except Exception as e:
+            report["errors"].append(f"purge_expired: {str(e)}")
+
+        report["duration_seconds"] = round(time.time() - start_time, 2)
+        print(
+            f"[SWEEPER] Aborted {report['aborted_multipart_uploads']} multipart uploads, "
+            f"deleted {report['deleted_objects']} objects ({report['reclaimed_bytes'] / (1024 * 1024):.1f}MB), "
+            f"{len(report['errors'])} errors in {report['duration_seconds']}s"
+            + (" [dry run]" if self.dry_run else "")
+        )
+        return report
+
+
+def _try_lock():
+    """Take the sweep advisory lock on a dedicated connection, None if another worker holds it"""
+    if engine.dialect.name != "postgresql":
+        return False
+    conn = engine.connect()
+    if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SWEEP_LOCK_KEY}).scalar():
+        return conn
+    conn.close()
+    return None
+
+
+def _unlock(conn) -> None:
+    try:
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SWEEP_LOCK_KEY})
+    finally:
+        conn.close()
+
+
+async def run_sweep(sweeper: Optional[OrphanSweeper] = None) -> Optional[dict]:
+    """Sweep unless another worker is already sweeping"""
+    lock = await run_in_threadpool(_try_lock)
+    if lock is None:
+        print("[SWEEPER] Another worker is sweeping, skipping")
+        return None
+    try:
+        return await (sweeper or OrphanSweeper()).sweep()
+    finally:
+        if lock is not False:
+            await run_in_threadpool(_unlock, lock)
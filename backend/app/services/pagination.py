@@ -0,0 +1,49 @@
+import json
+import uuid
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    """Opaque token for the position just after a row"""
+    payload = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor, raises ValueError on a malformed token"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+def keyset_page(model, queries: list, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    One page of rows, newest first, ordered by (created_at, id).
+
+    Each query is one index-friendly branch of the filter (e.g. public videos
+    and the user's own private ones); every branch is read in index order
+    from the cursor onwards and the branches are merged here, so a deep page
+    costs the same as the first. Returns the rows and the cursor of the next
+    page (None on the last page).
+    """
+    position = decode_cursor(cursor) if cursor else None
+    rows = {}
+    for query in queries:
+        if position is not None:
+            query = query.filter(tuple_(model.created_at, model.id) < tuple_(*position))
+        query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+        for row in query.all():
+            rows[row.id] = row
+
+    ordered = sorted(rows.values(), key=lambda row: (row.created_at, row.id), reverse=True)
+    if len(ordered) <= limit:
+        return ordered, None
+    page = ordered[:limit]
+    return page, encode_cursor(page[-1].created_at, page[-1].id)
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class PresignedURLCache:
+    """
+    Bounded LRU of signed GET URLs keyed by ``(key, expires_in, expiry bucket)``.
+
+    Time is cut into buckets of ``reuse_window`` seconds and a URL signed in one
+    bucket is reused until the next one starts. The window is capped at half of
+    ``expires_in`` so a cached URL always has at least half its lifetime left,
+    e.g. a 7-day URL gets re-signed every few hours instead of on every request.
+    """
+
+    def __init__(self, reuse_window: int = 6 * 3600, max_entries: int = 10000):
+        self.reuse_window = reuse_window
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_key(self, key: str, expires_in: int) -> Optional[tuple]:
+        window = min(self.reuse_window, expires_in // 2)
+        if window <= 0:
+            return None
+        return (key, expires_in, int(time.time() // window))
+
+    def get(self, key: str, expires_in: int) -> Optional[str]:
+        """Return a URL signed in the current bucket, or None"""
+        cache_key = self._cache_key(key, expires_in)
+        if cache_key is None:
+            return None
+        with self._lock:
+            url = self._entries.get(cache_key)
+            if url is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return url
+
+    def set(self, key: str, expires_in: int, url: str) -> None:
+        cache_key = self._cache_key(key, expires_in)
+        if cache_key is None:
+            return
+        with self._lock:
+            self._entries[cache_key] = url
+            self._entries.move_to_end(cache_key)
+            # URLs from previous buckets are never hit again and age out here
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached URLs and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def create_presigned_url_cache() -> PresignedURLCache:
+    """Build the signed URL cache using environment overrides (PRESIGN_REUSE_WINDOW=0 disables it)"""
+    return PresignedURLCache(
+        reuse_window=int(os.getenv("PRESIGN_REUSE_WINDOW", str(6 * 3600))),
+        max_entries=int(os.getenv("PRESIGN_CACHE_SIZE", "10000"))
+    )
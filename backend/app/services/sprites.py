@@ -0,0 +1,142 @@
+import os
+import math
+import uuid
+import asyncio
+import tempfile
+from functools import partial
+from typing import Optional
+
+import ffmpeg
+
+from .wasabi_storage import wasabi_storage
+from .media_executor import media_executor
+from .thumbnail import THUMBNAIL_URL_EXPIRES, ffmpeg_input_options
+
+SPRITE_INTERVAL = int(os.getenv("SPRITE_INTERVAL", "10"))  # Seconds between previews
+SPRITE_TILE_WIDTH = int(os.getenv("SPRITE_TILE_WIDTH", "160"))
+SPRITE_COLUMNS = int(os.getenv("SPRITE_COLUMNS", "10"))
+SPRITE_MAX_FRAMES = int(os.getenv("SPRITE_MAX_FRAMES", "400"))  # Longer videos get a wider interval
+
+# VTT cues point at the sprite image by this placeholder; the API swaps in a signed URL
+SPRITE_IMAGE_REF = "sprite.jpg"
+
+
+def extract_sprite_sheet(
+    video_path: str,
+    output_path: str,
+    input_options: dict,
+    interval: float,
+    columns: int,
+    rows: int,
+    tile_width: int,
+    tile_height: int
+) -> None:
+    """Tile one frame every ``interval`` seconds into a single JPEG (runs in a media worker process)"""
+    (
+        # Only keyframes are decoded; previews don't need frame accuracy
+        ffmpeg.input(video_path, skip_frame="nokey", **input_options)
+        .filter("fps", fps=f"1/{interval}")
+        .filter("scale", tile_width, tile_height)
+        .filter("tile", f"{columns}x{rows}")
+        .output(output_path, vframes=1, format="image2", vcodec="mjpeg", q=5)
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def _format_timestamp(seconds: float) -> str:
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+
+
+def build_sprite_vtt(duration: float, interval: float, columns: int, tile_width: int, tile_height: int) -> str:
+    """WebVTT index mapping each interval to its tile in the sprite sheet"""
+    lines = ["WEBVTT", ""]
+    count = math.ceil(duration / interval)
+    for index in range(count):
+        start = index * interval
+        end = min(duration, start + interval)
+        x = (index % columns) * tile_width
+        y = (index // columns) * tile_height
+        lines.append(f"{_format_timestamp(start)} --> {_format_timestamp(end)}")
+        lines.append(f"{SPRITE_IMAGE_REF}#xywh={x},{y},{tile_width},{tile_height}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def sprite_image_key(vtt_key: str) -> str:
+    """The sprite sheet is stored next to its VTT with the same name"""
+    return vtt_key[:-len(".vtt")] + ".jpg"
+
+
+async def generate_sprites_from_file_key(
+    file_key: str,
+    duration: float,
+    width: Optional[int] = None,
+    height: Optional[int] = None
+) -> Optional[str]:
+    """
+    Build the scrub-preview sprite sheet and WebVTT index for a stored video.
+
+    Both are uploaded under thumbnails/sprites/ and the VTT key is returned
+    (None if ffmpeg produced no image). Raises MediaExecutorSaturated when
+    the media workers are full.
+    """
+    if not duration or duration <= 0:
+        return None
+
+    interval = max(SPRITE_INTERVAL, math.ceil(duration / SPRITE_MAX_FRAMES))
+    count = math.ceil(duration / interval)
+    columns = min(SPRITE_COLUMNS, count)
+    rows = math.ceil(count / columns)
+    tile_width = SPRITE_TILE_WIDTH
+    tile_height = SPRITE_TILE_WIDTH * 9 // 16
+    if width and height:
+        tile_height = max(2, round(tile_width * height / width / 2) * 2)
+
+    print(f"[SPRITES] {file_key}: {count} frames every {interval}s in a {columns}x{rows} sheet")
+
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_sprite:
+        temp_sprite_path = temp_sprite.name
+
+    try:
+        video_url = wasabi_storage.presign_get(file_key, THUMBNAIL_URL_EXPIRES)
+        await media_executor.run(
+            extract_sprite_sheet, video_url, temp_sprite_path, ffmpeg_input_options(video_url),
+            interval, columns, rows, tile_width, tile_height
+        )
+
+        if not os.path.exists(temp_sprite_path) or os.path.getsize(temp_sprite_path) == 0:
+            print(f"[SPRITES] No sprite sheet produced for {file_key}")
+            return None
+
+        vtt_key = f"thumbnails/sprites/{uuid.uuid4()}.vtt"
+        vtt = build_sprite_vtt(duration, interval, columns, tile_width, tile_height)
+
+        loop = asyncio.get_event_loop()
+        with open(temp_sprite_path, "rb") as sprite_file:
+            await loop.run_in_executor(None, partial(
+                wasabi_storage.s3_client.upload_fileobj,
+                sprite_file,
+                wasabi_storage.bucket_name,
+                sprite_image_key(vtt_key),
+                ExtraArgs={"ContentType": "image/jpeg"}
+            ))
+        await loop.run_in_executor(None, partial(
+            wasabi_storage.s3_client.put_object,
+            Bucket=wasabi_storage.bucket_name,
+            Key=vtt_key,
+            Body=vtt.encode("utf-8"),
+            ContentType="text/vtt"
+        ))
+
+        print(f"[SPRITES] Uploaded sprite sheet and VTT: {vtt_key}")
+        return vtt_key
+
+    finally:
+        try:
+            if os.path.exists(temp_sprite_path):
+                os.unlink(temp_sprite_path)
+        except OSError:
+            pass
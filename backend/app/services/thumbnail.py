@@ -4,9 +4,14 @@ import os
 import tempfile
 import uuid
 import asyncio
+import time
 from functools import partial
 from typing import Optional
 from .wasabi_storage import wasabi_storage
+from .media_executor import media_executor, MediaExecutorSaturated
+
+# Lifetime of the presigned URL ffmpeg reads a stored video through
+THUMBNAIL_URL_EXPIRES = int(os.getenv("THUMBNAIL_URL_EXPIRES", "900"))
 
 async def generate_thumbnail(video_url: str) -> Optional[str]:
     """
@@ -27,6 +32,74 @@ async def generate_thumbnail(video_url: str) -> Optional[str]:
     # Return None - frontend should show a default video placeholder
     return None
 
+def ffmpeg_input_options(video_path: str) -> dict:
+    """Input options for ffmpeg/ffprobe; URLs are read with seekable range requests"""
+    if video_path.startswith(("http://", "https://")):
+        # Keep one connection for the range requests, give up on a stalled read
+        return {"seekable": 1, "multiple_requests": 1, "rw_timeout": 30000000}
+    return {}
+
+def extract_frame(video_path: str, output_path: str, input_options: dict, offset: float = 1) -> None:
+    """Write the frame at ``offset`` seconds of ``video_path`` to ``output_path`` as a JPEG (runs in a media worker process)"""
+    (
+        ffmpeg.input(video_path, ss=offset, **input_options)
+        .output(output_path, vframes=1, format='image2', vcodec='mjpeg')
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+async def _extract_and_upload_thumbnail(video_path: str, offset: float = 1) -> Optional[str]:
+    """
+    Extract a frame at ``offset`` seconds from a local video file or HTTP(S) URL,
+    upload it to Wasabi and return the thumbnail key (None if no frame could be extracted).
+
+    For URLs ffmpeg seeks with range requests, so only the container index
+    (moov atom) and the data around the first keyframe are fetched.
+    """
+    with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_thumb:
+        temp_thumb_path = temp_thumb.name
+
+    try:
+        print(f"[THUMBNAIL] Extracting frame using FFmpeg...")
+
+        # Extract the frame using FFmpeg in the media process pool
+        await media_executor.run(extract_frame, video_path, temp_thumb_path, ffmpeg_input_options(video_path), offset)
+
+        # Check if thumbnail was created
+        if not os.path.exists(temp_thumb_path) or os.path.getsize(temp_thumb_path) == 0:
+            print(f"[THUMBNAIL] Failed to extract frame")
+            return None
+
+        print(f"[THUMBNAIL] Frame extracted, uploading to Wasabi...")
+        loop = asyncio.get_event_loop()
+
+        # Upload thumbnail to Wasabi (without ACL since public access not allowed)
+        thumbnail_key = f"thumbnails/{uuid.uuid4()}.jpg"
+
+        # Create a file-like object for upload
+        with open(temp_thumb_path, 'rb') as thumb_file:
+            upload_func = partial(
+                wasabi_storage.s3_client.upload_fileobj,
+                thumb_file,
+                wasabi_storage.bucket_name,
+                thumbnail_key,
+                ExtraArgs={
+                    'ContentType': 'image/jpeg'
+                }
+            )
+
+            await loop.run_in_executor(None, upload_func)
+
+        print(f"[THUMBNAIL] Thumbnail uploaded successfully, returning key: {thumbnail_key}")
+        return thumbnail_key  # Return the key, not the full URL
+
+    finally:
+        try:
+            if os.path.exists(temp_thumb_path):
+                os.unlink(temp_thumb_path)
+        except:
+            pass
+
 async def generate_thumbnail_from_file(video_file: UploadFile) -> Optional[str]:
     """
     Generate thumbnail directly from uploaded video file using FFmpeg.
@@ -37,11 +110,9 @@ async def generate_thumbnail_from_file(video_file: UploadFile) -> Optional[str]:
     try:
         print(f"[THUMBNAIL] Starting thumbnail generation for: {video_file.filename}")
         
-        # Create temporary files
+        # Create temporary file
         with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_thumb:
-                temp_video_path = temp_video.name
-                temp_thumb_path = temp_thumb.name
+            temp_video_path = temp_video.name
         
         try:
             # Reset file pointer and stream video to temp file (avoid loading entire file into memory)
@@ -64,55 +135,13 @@ async def generate_thumbnail_from_file(video_file: UploadFile) -> Optional[str]:
                 print(f"[THUMBNAIL] Warning: Could not reset file pointer: {e}")
                 # Continue anyway, as the temp file has the data we need
             
-            print(f"[THUMBNAIL] Extracting frame using FFmpeg...")
-            
-            # Extract frame at 1 second using FFmpeg
-            loop = asyncio.get_event_loop()
-            extract_func = partial(
-                ffmpeg.input(temp_video_path, ss=1)
-                .output(temp_thumb_path, vframes=1, format='image2', vcodec='mjpeg')
-                .overwrite_output()
-                .run,
-                quiet=True
-            )
-            
-            await loop.run_in_executor(None, extract_func)
-            
-            # Check if thumbnail was created
-            if not os.path.exists(temp_thumb_path) or os.path.getsize(temp_thumb_path) == 0:
-                print(f"[THUMBNAIL] Failed to extract frame")
-                return None
-            
-            print(f"[THUMBNAIL] Frame extracted, uploading to Wasabi...")
-            
-            # Upload thumbnail to Wasabi (without ACL since public access not allowed)
-            thumbnail_key = f"thumbnails/{uuid.uuid4()}.jpg"
-            
-            # Create a file-like object for upload
-            with open(temp_thumb_path, 'rb') as thumb_file:
-                upload_func = partial(
-                    wasabi_storage.s3_client.upload_fileobj,
-                    thumb_file,
-                    wasabi_storage.bucket_name,
-                    thumbnail_key,
-                    ExtraArgs={
-                        'ContentType': 'image/jpeg'
-                        # Removed ACL since account doesn't allow public access
-                    }
-                )
-                
-                await loop.run_in_executor(None, upload_func)
-            
-            print(f"[THUMBNAIL] Thumbnail uploaded successfully, returning key: {thumbnail_key}")
-            return thumbnail_key  # Return the key, not the full URL
+            return await _extract_and_upload_thumbnail(temp_video_path)
             
         finally:
-            # Clean up temporary files
+            # Clean up temporary file
             try:
                 if os.path.exists(temp_video_path):
                     os.unlink(temp_video_path)
-                if os.path.exists(temp_thumb_path):
-                    os.unlink(temp_thumb_path)
             except:
                 pass
                 
@@ -131,81 +160,24 @@ async def generate_thumbnail_from_file(video_file: UploadFile) -> Optional[str]:
 async def generate_thumbnail_from_file_key(file_key: str) -> Optional[str]:
     """
     Generate thumbnail from a video file stored in Wasabi.
-    Downloads the video temporarily, generates the thumbnail, and uploads it back to Wasabi.
+    
+    FFmpeg reads the video through a presigned URL using range requests, so
+    the cost doesn't grow with the video size. Clips shorter than a second
+    are retried at the first frame; other failures are raised to the caller.
+    
+    Raises MediaExecutorSaturated when the media workers are full so the
+    caller can retry later.
     """
-    try:
-        print(f"[THUMBNAIL] Starting thumbnail generation for file key: {file_key}")
-        
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_thumb:
-                temp_video_path = temp_video.name
-                temp_thumb_path = temp_thumb.name
-        
-        try:
-            # Download video from Wasabi
-            print(f"[THUMBNAIL] Downloading video from Wasabi...")
-            loop = asyncio.get_event_loop()
-            download_func = partial(
-                wasabi_storage.s3_client.download_file,
-                wasabi_storage.bucket_name,
-                file_key,
-                temp_video_path
-            )
-            await loop.run_in_executor(None, download_func)
-            
-            print(f"[THUMBNAIL] Extracting frame using FFmpeg...")
-            
-            # Extract frame at 1 second using FFmpeg
-            extract_func = partial(
-                ffmpeg.input(temp_video_path, ss=1)
-                .output(temp_thumb_path, vframes=1, format='image2', vcodec='mjpeg')
-                .overwrite_output()
-                .run,
-                quiet=True
-            )
-            
-            await loop.run_in_executor(None, extract_func)
-            
-            # Check if thumbnail was created
-            if not os.path.exists(temp_thumb_path) or os.path.getsize(temp_thumb_path) == 0:
-                print(f"[THUMBNAIL] Failed to extract frame")
-                return None
-            
-            print(f"[THUMBNAIL] Frame extracted, uploading to Wasabi...")
-            
-            # Upload thumbnail to Wasabi
-            thumbnail_key = f"thumbnails/{uuid.uuid4()}.jpg"
-            
-            # Create a file-like object for upload
-            with open(temp_thumb_path, 'rb') as thumb_file:
-                upload_func = partial(
-                    wasabi_storage.s3_client.upload_fileobj,
-                    thumb_file,
-                    wasabi_storage.bucket_name,
-                    thumbnail_key,
-                    ExtraArgs={
-                        'ContentType': 'image/jpeg'
-                    }
-                )
-                
-                await loop.run_in_executor(None, upload_func)
-            
-            print(f"[THUMBNAIL] Thumbnail uploaded successfully, returning key: {thumbnail_key}")
-            return thumbnail_key
-            
-        finally:
-            # Clean up temporary files
-            try:
-                if os.path.exists(temp_video_path):
-                    os.unlink(temp_video_path)
-                if os.path.exists(temp_thumb_path):
-                    os.unlink(temp_thumb_path)
-            except:
-                pass
-                
-    except Exception as e:
-        print(f"[THUMBNAIL] Error generating thumbnail from file key: {str(e)}")
-        import traceback
-        print(f"[THUMBNAIL] Traceback: {traceback.format_exc()}")
-        return None 
\ No newline at end of file
+    if not media_executor.has_capacity():
+        raise MediaExecutorSaturated("Media executor full, thumbnail deferred")
+    
+    print(f"[THUMBNAIL] Starting thumbnail generation for file key: {file_key}")
+    start_time = time.time()
+    video_url = wasabi_storage.presign_get(file_key, THUMBNAIL_URL_EXPIRES)
+    thumbnail_key = await _extract_and_upload_thumbnail(video_url)
+    if not thumbnail_key:
+        print(f"[THUMBNAIL] No frame at 1s, retrying at the first frame")
+        thumbnail_key = await _extract_and_upload_thumbnail(video_url, offset=0)
+    if thumbnail_key:
+        print(f"[THUMBNAIL] Range-read thumbnail done in {time.time() - start_time:.2f}s")
+    return thumbnail_key
@@ -0,0 +1,103 @@
+import os
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from ..models.comment import Comment
+from ..models.event import Event
+from ..models.user import User
+from .video_detail import COMMENT_FIELDS
+
+# Default and smallest bin width of the density heatmap, in seconds
+DENSITY_BUCKET_SECONDS = int(os.getenv("DENSITY_BUCKET_SECONDS", "10"))
+MIN_DENSITY_BUCKET_SECONDS = 1
+
+
+def _in_range(column, start: float, end: Optional[float]) -> list:
+    conditions = [column >= start]
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+
+def positioned_comments(video_id: uuid.UUID, start: float = 0, end: Optional[float] = None):
+    """
+    Subquery of (id, effective_timestamp) for top-level comments placed in
+    [start, end) on a video's timeline.
+
+    Comments linked to an event sit at the event's timestamp, the others at
+    their own. Each branch is a range scan on its (video_id, video_timestamp)
+    index.
+    """
+    own = select(Comment.id.label("id"), Comment.video_timestamp.label("effective_timestamp")).where(
+        Comment.video_id == video_id,
+        Comment.parent_id.is_(None),
+        Comment.event_id.is_(None),
+        *_in_range(Comment.video_timestamp, start, end)
+    )
+    linked = select(Comment.id, Event.video_timestamp).join(Event, Event.id == Comment.event_id).where(
+        Event.video_id == video_id,
+        Comment.parent_id.is_(None),
+        *_in_range(Event.video_timestamp, start, end)
+    )
+    return union_all(own, linked).subquery("positioned")
+
+
+def load_comments_in_range(db: Session, video_id: uuid.UUID, start: float = 0, end: Optional[float] = None) -> List[Dict]:
+    """Top-level comments in [start, end) as dicts shaped like CommentResponse, in timeline order"""
+    positioned = positioned_comments(video_id, start, end)
+    rows = db.execute(
+        select(
+            *(getattr(Comment, name) for name in COMMENT_FIELDS),
+            User.username, User.profile_picture, positioned.c.effective_timestamp
+        )
+        .join(positioned, positioned.c.id == Comment.id)
+        .outerjoin(User, User.id == Comment.user_id)
+        .order_by(positioned.c.effective_timestamp.asc(), Comment.created_at.asc())
+    ).all()
+    return [
+        {
+            **dict(zip(COMMENT_FIELDS, row)),
+            "user_username": row.username or "Unknown",
+            "user_profile_picture": row.profile_picture,
+            "effective_timestamp": row.effective_timestamp
+        }
+        for row in rows
+    ]
+
+
+def timeline_density(
+    db: Session,
+    video_id: uuid.UUID,
+    bucket_seconds: int = DENSITY_BUCKET_SECONDS,
+    start: float = 0,
+    end: Optional[float] = None
+) -> List[Dict]:
+    """
+    Count comments and events per ``bucket_seconds`` bin in one query.
+
+    Only non-empty bins are returned, as {"start", "comments", "events"}
+    sorted by start.
+    """
+    positioned = positioned_comments(video_id, start, end)
+    points = union_all(
+        select(positioned.c.effective_timestamp.label("timestamp"), literal("comments").label("kind")),
+        select(Event.video_timestamp, literal("events")).where(
+            Event.video_id == video_id,
+            *_in_range(Event.video_timestamp, start, end)
+        )
+    ).subquery("points")
+
+    bucket = func.floor(points.c.timestamp / bucket_seconds).label("bucket")
+    rows = db.execute(
+        select(bucket, points.c.kind, func.count()).group_by(bucket, points.c.kind)
+    ).all()
+
+    bins: Dict[int, Dict] = {}
+    for index, kind, count in rows:
+        index = int(index)
+        entry = bins.setdefault(index, {"start": index * bucket_seconds, "comments": 0, "events": 0})
+        entry[kind] = count
+    return [bins[index] for index in sorted(bins)]
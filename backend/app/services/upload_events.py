@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from ..db.database import engine
+
+UPLOAD_CHANNEL = "upload_events"
+# How long /complete-upload long-polls for the upload to finish
+UPLOAD_WAIT_TIMEOUT = int(os.getenv("UPLOAD_WAIT_TIMEOUT", "300"))
+# How long a finished upload's outcome is kept for a late /complete-upload
+UPLOAD_RESULT_TTL = int(os.getenv("UPLOAD_RESULT_TTL", "3600"))
+# Upload progress is written to the upload store at most this often
+UPLOAD_PROGRESS_INTERVAL = float(os.getenv("UPLOAD_PROGRESS_INTERVAL", "0.5"))
+LISTEN_RETRY_SECONDS = 5
+
+# Terminal states; "discarded" means the upload was saved or cancelled
+FINAL_STATUSES = ("completed", "error", "discarded")
+
+
+class UploadNotifier:
+    """
+    Completion signal for uploads.
+
+    Waiters block on a per-upload asyncio.Event that is set the moment the
+    upload finishes. On Postgres, outcomes are also broadcast with NOTIFY and
+    picked up by a LISTEN connection in every API process, so /complete-upload
+    wakes up even when another worker handled /start-upload.
+    """
+
+    def __init__(self, channel: str = UPLOAD_CHANNEL, result_ttl: int = UPLOAD_RESULT_TTL):
+        self.channel = channel
+        self.result_ttl = result_ttl
+        self.enabled = engine.dialect.name == "postgresql"
+        self._events: Dict[str, asyncio.Event] = {}
+        self._results: Dict[str, Tuple[float, dict]] = {}
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        for upload_id, (stored_at, _) in list(self._results.items()):
+            if stored_at < cutoff:
+                del self._results[upload_id]
+
+    def _resolve(self, upload_id: str, state: dict) -> None:
+        self._prune()
+        self._results[upload_id] = (time.monotonic(), state)
+        event = self._events.pop(upload_id, None)
+        if event is not None:
+            event.set()
+
+    def result(self, upload_id: str) -> Optional[dict]:
+        """The final state of an upload if it's known to this process"""
+        entry = self._results.get(upload_id)
+        return entry[1] if entry else None
+
+    def _notify(self, payload: str) -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            conn.commit()
+
+    async def _broadcast(self, upload_id: str, state: dict) -> None:
+        try:
+            payload = json.dumps({"upload_id": upload_id, **state}, default=str)
+            await run_in_threadpool(self._notify, payload)
+        except Exception as e:
+            # Local waiters are already woken; remote ones fall back to their timeout
+            print(f"[UPLOAD_EVENTS] Failed to notify for upload {upload_id}: {str(e)}")
+
+    async def publish(self, upload_id: str, state: dict) -> None:
+        """Record an upload's final state and wake its waiters here and on other workers"""
+        self._resolve(upload_id, state)
+        if self.enabled:
+            await self._broadcast(upload_id, state)
+
+    async def discard(self, upload_id: str) -> None:
+        """Mark an upload as consumed so it can't be completed twice"""
+        await self.publish(upload_id, {"status": "discarded"})
+
+    async def wait(self, upload_id: str, timeout: float = UPLOAD_WAIT_TIMEOUT) -> Optional[dict]:
+        """Wait for an upload's final state, returns None on timeout"""
+        state = self.result(upload_id)
+        if state is not None:
+            return state
+
+        event = self._events.setdefault(upload_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            if self._events.get(upload_id) is event and not event.is_set():
+                del self._events[upload_id]
+            return None
+        return self.result(upload_id)
+
+    def _on_notify(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception as e:
+            print(f"[UPLOAD_EVENTS] Listener connection lost: {str(e)}")
+            self._close_listener()
+            self._loop.call_later(LISTEN_RETRY_SECONDS, lambda: asyncio.ensure_future(self.start()))
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            try:
+                state = json.loads(notify.payload)
+                upload_id = state.pop("upload_id")
+                if state.get("status") in FINAL_STATUSES:
+                    self._resolve(upload_id, state)
+            except (ValueError, KeyError) as e:
+                print(f"[UPLOAD_EVENTS] Ignoring malformed notification: {str(e)}")
+
+    def _connect(self):
+        # A dedicated connection detached from the pool, held open in LISTEN mode
+        raw = engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return conn
+
+    async def start(self) -> None:
+        """Start listening for other workers' notifications (no-op off Postgres)"""
+        if not self.enabled or self._conn is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._conn = await run_in_threadpool(self._connect)
+        except Exception as e:
+            print(f"[UPLOAD_EVENTS] Could not LISTEN, retrying in {LISTEN_RETRY_SECONDS}s: {str(e)}")
+            self._loop.call_later(LISTEN_RETRY_SECONDS, lambda: asyncio.ensure_future(self.start()))
+            return
+        self._loop.add_reader(self._conn.fileno(), self._on_notify)
+        print(f"[UPLOAD_EVENTS] Listening on {self.channel}")
+
+    def _close_listener(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    async def stop(self) -> None:
+        self._close_listener()
+
+
+# Global instance
+upload_notifier = UploadNotifier()
@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, text
+from starlette.concurrency import run_in_threadpool
+
+from ..db.database import engine
+
+# Sessions untouched for this long are treated as abandoned; every write extends it
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", str(24 * 3600)))
+
+
+def _jsonable(data: dict) -> dict:
+    """Normalize to what a JSON column round-trips (UUIDs become strings, sets lists)"""
+    return json.loads(json.dumps(data, default=lambda value: sorted(value) if isinstance(value, set) else str(value)))
+
+
+class UploadStore(ABC):
+    """
+    Upload sessions keyed by upload_id, shared by the upload routes.
+
+    Every operation is a single atomic step (one round-trip for the Postgres
+    backend), and sessions expire ``ttl`` seconds after their last write.
+    ``transition`` only applies changes when the session is in one of the
+    expected statuses, so two workers can't both act on the same upload.
+    """
+
+    def __init__(self, ttl: int = UPLOAD_SESSION_TTL):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def create(self, upload_id: str, data: dict) -> bool:
+        """Store a new session, returns False if the id is already in use"""
+
+    @abstractmethod
+    async def get(self, upload_id: str) -> Optional[dict]:
+        """A session's current state, None if it doesn't exist or has expired"""
+
+    @abstractmethod
+    async def update(self, upload_id: str, changes: dict) -> Optional[dict]:
+        """Merge changes into a session, returns the new state or None if it's gone"""
+
+    @abstractmethod
+    async def transition(self, upload_id: str, from_statuses: Iterable[str], changes: dict) -> Optional[dict]:
+        """Merge changes only if the session's status is one of from_statuses"""
+
+    @abstractmethod
+    async def merge_field(self, upload_id: str, field: str, values: dict) -> Optional[dict]:
+        """Merge values into the dict stored under ``field`` (safe against concurrent merges)"""
+
+    @abstractmethod
+    async def delete(self, upload_id: str) -> Optional[dict]:
+        """Remove a session, returns its last state (None if another caller got there first)"""
+
+    @abstractmethod
+    async def multipart_upload_ids(self) -> Set[str]:
+        """Wasabi multipart upload ids that live sessions still own"""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Drop expired sessions, returns how many were removed"""
+
+
+class MemoryUploadStore(UploadStore):
+    """Process-local store for single-worker deployments and development"""
+
+    def __init__(self, ttl: int = UPLOAD_SESSION_TTL):
+        super().__init__(ttl)
+        # upload_id -> (expires_at, data)
+        self._sessions: Dict[str, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, upload_id: str, now: float) -> Optional[Tuple[float, dict]]:
+        entry = self._sessions.get(upload_id)
+        if entry is not None and entry[0] <= now:
+            del self._sessions[upload_id]
+            return None
+        return entry
+
+    async def create(self, upload_id: str, data: dict) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._live(upload_id, now) is not None:
+                return False
+            self._sessions[upload_id] = (now + self.ttl, _jsonable(data))
+            return True
+
+    async def get(self, upload_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._live(upload_id, time.time())
+            return dict(entry[1]) if entry else None
+
+    def _merge(self, upload_id: str, from_statuses: Optional[Iterable[str]], changes: dict, field: Optional[str] = None) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._live(upload_id, now)
+            if entry is None:
+                return None
+            data = entry[1]
+            if from_statuses is not None and data.get("status") not in from_statuses:
+                return None
+            if field is not None:
+                changes = {field: {**(data.get(field) or {}), **changes}}
+            data = {**data, **_jsonable(changes)}
+            self._sessions[upload_id] = (now + self.ttl, data)
+            return dict(data)
+
+    async def update(self, upload_id: str, changes: dict) -> Optional[dict]:
+        return self._merge(upload_id, None, changes)
+
+    async def transition(self, upload_id: str, from_statuses: Iterable[str], changes: dict) -> Optional[dict]:
+        return self._merge(upload_id, list(from_statuses), changes)
+
+    async def merge_field(self, upload_id: str, field: str, values: dict) -> Optional[dict]:
+        return self._merge(upload_id, None, values, field)
+
+    async def delete(self, upload_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._live(upload_id, time.time())
+            if entry is None:
+                return None
+            del self._sessions[upload_id]
+            return entry[1]
+
+    async def multipart_upload_ids(self) -> Set[str]:
+        now = time.time()
+        with self._lock:
+            return {
+                data["wasabi_upload_id"]
+                for expires_at, data in self._sessions.values()
+                if expires_at > now and data.get("wasabi_upload_id")
+            }
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [upload_id for upload_id, entry in self._sessions.items() if entry[0] <= now]
+            for upload_id in expired:
+                del self._sessions[upload_id]
+            return len(expired)
+
+
+# Timestamps match the naive UTC datetimes the models write
+NOW = "(now() at time zone 'utc')"
+EXPIRES = f"{NOW} + make_interval(secs => :ttl)"
+
+
+class PostgresUploadStore(UploadStore):
+    """
+    Store backed by the uploadsession table, so any worker can serve any upload.
+
+    Each operation is one statement; merges use jsonb ``||`` and transitions
+    check the status in the UPDATE's WHERE clause.
+    """
+
+    def _execute(self, statement, params: dict) -> list:
+        with engine.begin() as conn:
+            result = conn.execute(statement, params)
+            return result.fetchall() if result.returns_rows else []
+
+    async def _run(self, statement, **params) -> list:
+        return await run_in_threadpool(self._execute, statement, params)
+
+    async def create(self, upload_id: str, data: dict) -> bool:
+        # An expired row with the same id is taken over in the same statement
+        rows = await self._run(text(f"""
+            INSERT INTO uploadsession (id, data, expires_at, created_at, updated_at)
+            VALUES (:id, CAST(:data AS jsonb), {EXPIRES}, {NOW}, {NOW})
+            ON CONFLICT (id) DO UPDATE
+                SET data = EXCLUDED.data, expires_at = EXCLUDED.expires_at,
+                    created_at = EXCLUDED.created_at, updated_at = EXCLUDED.updated_at
+                WHERE uploadsession.expires_at <= {NOW}
+            RETURNING id
+        """), id=upload_id, data=json.dumps(_jsonable(data)), ttl=self.ttl)
+        return bool(rows)
+
+    async def get(self, upload_id: str) -> Optional[dict]:
+        rows = await self._run(
+            text(f"SELECT data FROM uploadsession WHERE id = :id AND expires_at > {NOW}"),
+            id=upload_id
+        )
+        return rows[0][0] if rows else None
+
+    async def update(self, upload_id: str, changes: dict) -> Optional[dict]:
+        rows = await self._run(text(f"""
+            UPDATE uploadsession
+            SET data = data || CAST(:changes AS jsonb), expires_at = {EXPIRES}, updated_at = {NOW}
+            WHERE id = :id AND expires_at > {NOW}
+            RETURNING data
+        """), id=upload_id, changes=json.dumps(_jsonable(changes)), ttl=self.ttl)
+        return rows[0][0] if rows else None
+
+    async def transition(self, upload_id: str, from_statuses: Iterable[str], changes: dict) -> Optional[dict]:
+        statement = text(f"""
+            UPDATE uploadsession
+            SET data = data || CAST(:changes AS jsonb), expires_at = {EXPIRES}, updated_at = {NOW}
+            WHERE id = :id AND expires_at > {NOW} AND data->>'status' IN :statuses
+            RETURNING data
+        """).bindparams(bindparam("statuses", expanding=True))
+        rows = await self._run(
+            statement, id=upload_id, changes=json.dumps(_jsonable(changes)),
+            statuses=list(from_statuses), ttl=self.ttl
+        )
+        return rows[0][0] if rows else None
+
+    async def merge_field(self, upload_id: str, field: str, values: dict) -> Optional[dict]:
+        # The row lock taken by UPDATE serializes concurrent merges into the same field
+        rows = await self._run(text(f"""
+            UPDATE uploadsession
+            SET data = jsonb_set(
+                    data, ARRAY[:field],
+                    COALESCE(data->:field, CAST('{{}}' AS jsonb)) || CAST(:values AS jsonb)
+                ),
+                expires_at = {EXPIRES}, updated_at = {NOW}
+            WHERE id = :id AND expires_at > {NOW}
+            RETURNING data
+        """), id=upload_id, field=field, values=json.dumps(_jsonable(values)), ttl=self.ttl)
+        return rows[0][0] if rows else None
+
+    async def delete(self, upload_id: str) -> Optional[dict]:
+        rows = await self._run(
+            text(f"DELETE FROM uploadsession WHERE id = :id AND expires_at > {NOW} RETURNING data"),
+            id=upload_id
+        )
+        return rows[0][0] if rows else None
+
+    async def multipart_upload_ids(self) -> Set[str]:
+        rows = await self._run(text(f"""
+            SELECT data->>'wasabi_upload_id' FROM uploadsession
+            WHERE expires_at > {NOW} AND data->>'wasabi_upload_id' IS NOT NULL
+        """))
+        return {row[0] for row in rows}
+
+    async def purge_expired(self) -> int:
+        rows = await self._run(text(f"DELETE FROM uploadsession WHERE expires_at <= {NOW} RETURNING id"))
+        return len(rows)
+
+
+def create_upload_store() -> UploadStore:
+    """Pick the backend from UPLOAD_STORE (memory|postgres), defaulting to Postgres when that's the database"""
+    backend = os.getenv("UPLOAD_STORE") or ("postgres" if engine.dialect.name == "postgresql" else "memory")
+    if backend == "postgres":
+        return PostgresUploadStore()
+    if backend == "memory":
+        return MemoryUploadStore()
+    raise ValueError(f"Unknown UPLOAD_STORE backend: {backend}")
+
+
+# Global instance
+upload_store = create_upload_store()
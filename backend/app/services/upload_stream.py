@@ -0,0 +1,146 @@
+from collections import deque
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+# Non-file form fields are small; cap them so a bad client can't grow memory
+MAX_FIELD_SIZE = 64 * 1024
+
+
+class StreamingFormFile:
+    """
+    Reads one file field of a multipart/form-data request as a stream.
+
+    Unlike UploadFile, nothing is spooled: the body is pulled from the ASGI
+    receive channel on demand and file bytes are handed to the caller as
+    they arrive, so memory stays at one network chunk regardless of size.
+
+    Usage:
+        form_file = StreamingFormFile(request)
+        await form_file.open()              # parses up to the file's headers
+        async for chunk in form_file.chunks():
+            ...
+    """
+
+    def __init__(self, request: Request, field_name: str = "file"):
+        self.request = request
+        self.field_name = field_name
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.fields: Dict[str, str] = {}
+        self.bytes_received = 0
+        self.total_size = int(request.headers.get("content-length") or 0)
+
+        self._stream = request.stream()
+        self._parser: Optional[MultipartParser] = None
+        self._pending: deque = deque()
+        self._file_started = False
+        self._file_finished = False
+        self._exhausted = False
+
+        # State of the part currently being parsed
+        self._header_name = b""
+        self._header_value = b""
+        self._part_headers: Dict[bytes, bytes] = {}
+        self._part_name: Optional[str] = None
+        self._part_data = bytearray()
+        self._in_file = False
+        self._in_target = False
+
+    def _create_parser(self) -> None:
+        content_type = self.request.headers.get("content-type", "")
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not content_type.startswith("multipart/form-data") or not boundary:
+            raise ValueError("Expected a multipart/form-data body")
+
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    def _on_part_begin(self) -> None:
+        self._part_headers = {}
+        self._part_name = None
+        self._part_data = bytearray()
+        self._in_file = False
+        self._in_target = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._part_headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._part_headers.get(b"content-disposition", b""))
+        self._part_name = options.get(b"name", b"").decode("utf-8", "replace")
+        self._in_file = b"filename" in options
+
+        if self._in_file and self._part_name == self.field_name and not self._file_started:
+            self._in_target = True
+            self._file_started = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            self.content_type = self._part_headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_target:
+            self._pending.append(data[start:end])
+        elif not self._in_file and len(self._part_data) < MAX_FIELD_SIZE:
+            self._part_data += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._in_target:
+            self._in_target = False
+            self._file_finished = True
+        elif not self._in_file and self._part_name:
+            self.fields[self._part_name] = self._part_data.decode("utf-8", "replace")
+
+    async def _read_more(self) -> bool:
+        """Feed the next body chunk to the parser, returns False at end of body"""
+        if self._exhausted:
+            return False
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            self._parser.finalize()
+            self._exhausted = True
+            return False
+
+        self.bytes_received += len(chunk)
+        if chunk:
+            self._parser.write(chunk)
+        return True
+
+    async def open(self) -> "StreamingFormFile":
+        """Read the body until the file field's headers have been parsed"""
+        self._create_parser()
+        while not self._file_started:
+            if not await self._read_more():
+                raise ValueError(f"No '{self.field_name}' file field in upload")
+        return self
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the file's bytes as they arrive, then drain the rest of the body"""
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if self._file_finished:
+                break
+            if not await self._read_more():
+                raise ValueError("Upload ended before the file was complete")
+
+        # Parse any trailing form fields
+        while await self._read_more():
+            pass
@@ -0,0 +1,84 @@
+import uuid
+from itertools import chain
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.orm import Session, aliased
+
+from ..models.comment import Comment
+from ..models.event import Event
+from ..models.user import User
+from ..models.video import Video
+
+# Fields of CommentResponse / EventResponse, read straight off each row
+COMMENT_FIELDS = ["id", "content", "created_at", "updated_at", "parent_id", "event_id", "video_timestamp"]
+EVENT_FIELDS = [
+    "id", "title", "description", "event_type", "user_id", "video_id",
+    "created_at", "updated_at", "video_timestamp"
+]
+
+
+def _json_children(model, fields: List[str], order_by):
+    """Correlated subquery aggregating a video's rows (with their author) into a JSON array"""
+    author = aliased(User)
+    columns = {name: getattr(model, name) for name in fields}
+    columns["user_username"] = func.coalesce(author.username, "Unknown")
+    columns["user_profile_picture"] = author.profile_picture
+    row = func.json_build_object(*chain.from_iterable((literal_column(f"'{name}'"), column) for name, column in columns.items()))
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(row, order_by)), literal_column("'[]'::json"), type_=JSON))
+        .select_from(model)
+        .outerjoin(author, author.id == model.user_id)
+        .where(model.video_id == Video.id)
+        .scalar_subquery()
+    )
+
+
+def _orm_children(db: Session, model, fields: List[str], video_id: uuid.UUID, order_by) -> List[dict]:
+    """Fallback for databases without json_agg (one query per list)"""
+    rows = db.query(model, User.username, User.profile_picture).outerjoin(User, User.id == model.user_id) \
+        .filter(model.video_id == video_id).order_by(order_by).all()
+    return [
+        {
+            **{name: getattr(item, name) for name in fields},
+            "user_username": username or "Unknown",
+            "user_profile_picture": profile_picture
+        }
+        for item, username, profile_picture in rows
+    ]
+
+
+def load_video_detail(db: Session, video_id: uuid.UUID) -> Optional[Dict]:
+    """
+    Load a video with its author, comments and events as one dict shaped like
+    VideoDetailResponse, or None if it doesn't exist.
+
+    On Postgres this is a single round-trip: comments and events are
+    aggregated into JSON arrays by correlated subqueries next to the video row.
+    """
+    comment_order = Comment.created_at.desc()
+    event_order = Event.video_timestamp.asc()
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    columns = [Video, User.username]
+    if postgres:
+        columns += [
+            _json_children(Comment, COMMENT_FIELDS, comment_order),
+            _json_children(Event, EVENT_FIELDS, event_order)
+        ]
+    row = db.execute(
+        select(*columns).outerjoin(User, User.id == Video.user_id).where(Video.id == video_id)
+    ).first()
+    if row is None:
+        return None
+
+    video = row[0]
+    detail = {column.key: getattr(video, column.key) for column in Video.__table__.columns}
+    detail["user_username"] = row[1] or "Unknown"
+    if postgres:
+        detail["comments"], detail["events"] = row[2], row[3]
+    else:
+        detail["comments"] = _orm_children(db, Comment, COMMENT_FIELDS, video_id, comment_order)
+        detail["events"] = _orm_children(db, Event, EVENT_FIELDS, video_id, event_order)
+    return detail
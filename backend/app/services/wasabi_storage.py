@@ -7,7 +7,13 @@ import asyncio
 from functools import partial
 import time
 import uuid
-from typing import Optional, Dict
+from typing import Optional, Dict, AsyncIterator, Iterable
+from .presign import create_presigned_url_cache
+
+# S3 requires every part except the last to be at least 5MB
+MIN_PART_SIZE = 5 * 1024 * 1024
+# ...and allows at most 10,000 parts per upload
+MAX_PARTS = 10000
 
 class WasabiStorageService:
     def __init__(self):
@@ -54,6 +60,13 @@ class WasabiStorageService:
             )
         )
         
+        # Multipart tuning: parts in flight per upload and attempts per part
+        self.upload_concurrency = max(1, int(os.getenv('WASABI_UPLOAD_CONCURRENCY', '8')))
+        self.part_retries = max(1, int(os.getenv('WASABI_PART_RETRIES', '3')))
+        
+        # Presigning is local HMAC work; recently signed GET URLs are reused
+        self.url_cache = create_presigned_url_cache()
+        
         print(f"[WASABI] Initialized with bucket: {self.bucket_name}, region: {self.region}")
 
     async def upload_video(self, file: UploadFile) -> str:
@@ -160,81 +173,168 @@ class WasabiStorageService:
         """Multipart upload for larger files"""
         print(f"[WASABI] Starting multipart upload")
         
-        try:
-            # Initiate multipart upload
-            loop = asyncio.get_event_loop()
-            
-            create_func = partial(
-                self.s3_client.create_multipart_upload,
-                Bucket=self.bucket_name,
-                Key=unique_filename,
-                ContentType=file.content_type or 'video/mp4'
-            )
-            
-            response = await loop.run_in_executor(None, create_func)
-            upload_id = response['UploadId']
-            print(f"[WASABI] Multipart upload initiated: {upload_id}")
-            
-            # Upload parts (5MB each)
-            part_size = 5 * 1024 * 1024  # 5MB
-            parts = []
-            part_number = 1
-            
+        part_size = self._choose_part_size(file_size)
+        
+        async def read_parts():
             await file.seek(0)
-            
             while True:
                 chunk = await file.read(part_size)
                 if not chunk:
                     break
-                
-                print(f"[WASABI] Uploading part {part_number} ({len(chunk)} bytes)")
-                
-                # Upload this part
-                upload_part_func = partial(
-                    self.s3_client.upload_part,
-                    Bucket=self.bucket_name,
-                    Key=unique_filename,
-                    PartNumber=part_number,
-                    UploadId=upload_id,
-                    Body=chunk
-                )
-                
+                yield chunk
+        
+        await self._run_multipart_upload(unique_filename, file.content_type, read_parts())
+        return unique_filename
+
+    def _choose_part_size(self, file_size: int) -> int:
+        """Smallest part size (rounded up to 1MB) that keeps the upload under MAX_PARTS"""
+        if not file_size or file_size <= MIN_PART_SIZE * MAX_PARTS:
+            return MIN_PART_SIZE
+        mb = 1024 * 1024
+        part_size = -(-file_size // MAX_PARTS)
+        return -(-part_size // mb) * mb
+
+    async def _upload_part(self, file_key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        """Upload a single multipart part with retries and return its entry for completion"""
+        loop = asyncio.get_event_loop()
+        upload_part_func = partial(
+            self.s3_client.upload_part,
+            Bucket=self.bucket_name,
+            Key=file_key,
+            PartNumber=part_number,
+            UploadId=upload_id,
+            Body=body
+        )
+        
+        for attempt in range(self.part_retries):
+            try:
                 part_response = await loop.run_in_executor(None, upload_part_func)
-                parts.append({
+                return {
                     'ETag': part_response['ETag'],
                     'PartNumber': part_number
-                })
-                
-                part_number += 1
+                }
+            except Exception as e:
+                print(f"[WASABI] Part {part_number} attempt {attempt + 1}/{self.part_retries} failed: {str(e)}")
+                if attempt == self.part_retries - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt)  # 1s, 2s, 4s
+
+    async def _upload_parts(self, file_key: str, upload_id: str, bodies: AsyncIterator[bytes]) -> list:
+        """
+        Upload parts from ``bodies`` with up to ``upload_concurrency`` in flight.
+        
+        The next body is only pulled once a slot is free, so at most
+        ``upload_concurrency`` parts are held in memory. The first failed part
+        cancels the rest.
+        """
+        window = asyncio.Semaphore(self.upload_concurrency)
+        tasks = []
+        
+        async def send(part_number: int, body: bytes) -> dict:
+            try:
+                return await self._upload_part(file_key, upload_id, part_number, body)
+            finally:
+                window.release()
+        
+        try:
+            async for body in self._windowed(bodies, window, tasks):
+                part_number = len(tasks) + 1
+                if part_number > MAX_PARTS:
+                    raise ValueError(f"Upload exceeds {MAX_PARTS} parts")
+                tasks.append(asyncio.create_task(send(part_number, body)))
+            
+            return list(await asyncio.gather(*tasks))
+        
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _windowed(self, bodies: AsyncIterator[bytes], window: asyncio.Semaphore, tasks: list) -> AsyncIterator[bytes]:
+        """Yield bodies only when a window slot is free, surfacing part failures early"""
+        iterator = bodies.__aiter__()
+        while True:
+            await window.acquire()
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    window.release()
+                    raise task.exception()
+            try:
+                body = await iterator.__anext__()
+            except StopAsyncIteration:
+                window.release()
+                return
+            yield body
+
+    async def _run_multipart_upload(self, file_key: str, content_type: Optional[str], bodies: AsyncIterator[bytes]) -> int:
+        """
+        Create a multipart upload, send ``bodies`` as its parts and complete it.
+        Aborts the upload on any failure. Returns the number of parts.
+        """
+        response = await self.create_multipart_upload(file_key, content_type)
+        upload_id = response['UploadId']
+        loop = asyncio.get_event_loop()
+        
+        try:
+            parts = await self._upload_parts(file_key, upload_id, bodies)
             
-            # Complete multipart upload
             complete_func = partial(
                 self.s3_client.complete_multipart_upload,
                 Bucket=self.bucket_name,
-                Key=unique_filename,
+                Key=file_key,
                 UploadId=upload_id,
                 MultipartUpload={'Parts': parts}
             )
-            
             await loop.run_in_executor(None, complete_func)
-            print(f"[WASABI] Multipart upload completed")
+            print(f"[WASABI] Multipart upload completed: {len(parts)} parts")
             
-            return unique_filename
+            return len(parts)
             
-        except Exception as e:
-            # Abort multipart upload on error
+        except BaseException:
+            # Abort so the stored parts don't keep billing
             try:
-                abort_func = partial(
-                    self.s3_client.abort_multipart_upload,
-                    Bucket=self.bucket_name,
-                    Key=unique_filename,
-                    UploadId=upload_id
-                )
-                await loop.run_in_executor(None, abort_func)
-                print(f"[WASABI] Aborted multipart upload due to error")
-            except:
-                pass
-            raise e
+                await self.abort_multipart_upload(file_key, upload_id)
+            except Exception as abort_error:
+                print(f"[WASABI] Error aborting multipart upload: {str(abort_error)}")
+            raise
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_key: str,
+        content_type: Optional[str] = None,
+        expected_size: int = 0
+    ) -> int:
+        """
+        Upload an async stream of bytes as a multipart upload.
+
+        Incoming chunks are regrouped into parts and sent concurrently, so
+        memory use is bounded by the part window rather than the total size.
+        ``expected_size`` (if known) picks a part size that stays under the
+        part limit. Returns the number of bytes uploaded.
+        """
+        print(f"[WASABI] Starting streamed multipart upload: {file_key}")
+        part_size = self._choose_part_size(expected_size)
+        total_bytes = 0
+        
+        async def split_parts():
+            nonlocal total_bytes
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                total_bytes += len(chunk)
+                while len(buffer) >= part_size:
+                    body = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    yield body
+            # Final (possibly short) part; an empty stream still needs one part
+            if buffer or total_bytes == 0:
+                yield bytes(buffer)
+        
+        await self._run_multipart_upload(file_key, content_type, split_parts())
+        print(f"[WASABI] Streamed upload completed: {total_bytes} bytes")
+        return total_bytes
 
     def _get_file_extension(self, filename: Optional[str]) -> str:
         """Extract file extension from filename"""
@@ -301,6 +401,19 @@ class WasabiStorageService:
             print(f"[WASABI] Error deleting file by key {file_key}: {str(e)}")
             return False
 
+    async def get_object_bytes(self, file_key: str) -> bytes:
+        """
+        Read a (small) object from the bucket into memory
+        """
+        loop = asyncio.get_event_loop()
+        get_func = partial(
+            self.s3_client.get_object,
+            Bucket=self.bucket_name,
+            Key=file_key
+        )
+        response = await loop.run_in_executor(None, get_func)
+        return await loop.run_in_executor(None, response['Body'].read)
+
     def _extract_key_from_url(self, url: str) -> Optional[str]:
         """Extract the object key from a Wasabi URL"""
         try:
@@ -321,6 +434,23 @@ class WasabiStorageService:
         except:
             return None
 
+    def presign_get(self, file_key: str, expires_in: int = 604800) -> str:
+        """
+        Sign a GET URL for ``file_key`` inline, reusing a cached URL when possible.
+        
+        Presigning never touches the network, so it runs on the calling thread
+        instead of an executor.
+        """
+        url = self.url_cache.get(file_key, expires_in)
+        if url is None:
+            url = self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': self.bucket_name, 'Key': file_key},
+                ExpiresIn=expires_in
+            )
+            self.url_cache.set(file_key, expires_in, url)
+        return url
+
     async def get_video_url(self, file_key: str, expires_in: int = 604800) -> str:
         """
         Generate a fresh pre-signed URL for an existing video file
@@ -333,19 +463,7 @@ class WasabiStorageService:
             Pre-signed URL for the video
         """
         try:
-            print(f"[WASABI] Generating fresh pre-signed URL for: {file_key}")
-            
-            loop = asyncio.get_event_loop()
-            url_func = partial(
-                self.s3_client.generate_presigned_url,
-                'get_object',
-                Params={'Bucket': self.bucket_name, 'Key': file_key},
-                ExpiresIn=expires_in
-            )
-            
-            file_url = await loop.run_in_executor(None, url_func)
-            print(f"[WASABI] Generated fresh URL (expires in {expires_in} seconds)")
-            return file_url
+            return self.presign_get(file_key, expires_in)
             
         except Exception as e:
             print(f"[WASABI] Error generating pre-signed URL: {str(e)}")
@@ -362,41 +480,14 @@ class WasabiStorageService:
         Returns:
             Dictionary mapping file_key -> pre-signed URL
         """
-        try:
-            print(f"[WASABI] Generating {len(file_keys)} pre-signed URLs...")
-            
-            loop = asyncio.get_event_loop()
-            
-            # Create tasks for all URL generations
-            tasks = []
-            for file_key in file_keys:
-                url_func = partial(
-                    self.s3_client.generate_presigned_url,
-                    'get_object',
-                    Params={'Bucket': self.bucket_name, 'Key': file_key},
-                    ExpiresIn=expires_in
-                )
-                tasks.append(loop.run_in_executor(None, url_func))
-            
-            # Execute all tasks concurrently
-            urls = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Build result dictionary
-            result = {}
-            for i, file_key in enumerate(file_keys):
-                if isinstance(urls[i], Exception):
-                    print(f"[WASABI] Error generating URL for {file_key}: {urls[i]}")
-                    result[file_key] = file_key  # Fallback to original key
-                else:
-                    result[file_key] = urls[i]
-            
-            print(f"[WASABI] Generated {len([u for u in urls if not isinstance(u, Exception)])} URLs successfully")
-            return result
-            
-        except Exception as e:
-            print(f"[WASABI] Error generating multiple URLs: {str(e)}")
-            # Return fallback mapping
-            return {key: key for key in file_keys}
+        result = {}
+        for file_key in file_keys:
+            try:
+                result[file_key] = self.presign_get(file_key, expires_in)
+            except Exception as e:
+                print(f"[WASABI] Error generating URL for {file_key}: {e}")
+                result[file_key] = file_key  # Fallback to original key
+        return result
 
     async def create_multipart_upload(self, file_key: str, content_type: str) -> dict:
         """
@@ -422,19 +513,27 @@ class WasabiStorageService:
             print(f"[WASABI] Error initiating multipart upload: {str(e)}")
             raise Exception(f"Failed to initiate multipart upload: {str(e)}")
 
-    async def get_chunk_upload_urls(self, file_key: str, upload_id: str, total_chunks: int) -> Dict[int, str]:
+    async def get_chunk_upload_urls(
+        self,
+        file_key: str,
+        upload_id: str,
+        total_chunks: int,
+        part_numbers: Optional[Iterable[int]] = None
+    ) -> Dict[int, str]:
         """
-        Generate presigned URLs for uploading each chunk
+        Generate presigned URLs for uploading each chunk (or only ``part_numbers``)
         """
         try:
-            print(f"[WASABI] Generating presigned URLs for {total_chunks} chunks")
+            if part_numbers is None:
+                part_numbers = range(1, total_chunks + 1)
+            part_numbers = list(part_numbers)
+            print(f"[WASABI] Generating presigned URLs for {len(part_numbers)} of {total_chunks} chunks")
             
             urls = {}
-            loop = asyncio.get_event_loop()
             
-            for chunk_number in range(1, total_chunks + 1):
-                url_func = partial(
-                    self.s3_client.generate_presigned_url,
+            # Signed inline: each part URL is unique, so there's nothing to cache
+            for chunk_number in part_numbers:
+                urls[chunk_number] = self.s3_client.generate_presigned_url(
                     'upload_part',
                     Params={
                         'Bucket': self.bucket_name,
@@ -444,9 +543,6 @@ class WasabiStorageService:
                     },
                     ExpiresIn=3600  # URL valid for 1 hour
                 )
-                
-                presigned_url = await loop.run_in_executor(None, url_func)
-                urls[chunk_number] = presigned_url
             
             print(f"[WASABI] Generated {len(urls)} presigned URLs")
             return urls
@@ -455,6 +551,30 @@ class WasabiStorageService:
             print(f"[WASABI] Error generating chunk upload URLs: {str(e)}")
             raise Exception(f"Failed to generate chunk upload URLs: {str(e)}")
 
+    async def list_uploaded_parts(self, file_key: str, upload_id: str) -> Dict[int, str]:
+        """
+        List the parts Wasabi already holds for a multipart upload as part_number -> ETag
+        """
+        loop = asyncio.get_event_loop()
+        parts = {}
+        marker = 0
+        while True:
+            response = await loop.run_in_executor(None, partial(
+                self.s3_client.list_parts,
+                Bucket=self.bucket_name,
+                Key=file_key,
+                UploadId=upload_id,
+                PartNumberMarker=marker
+            ))
+            for part in response.get('Parts', []):
+                parts[part['PartNumber']] = part['ETag'].strip('"')
+            if not response.get('IsTruncated'):
+                break
+            marker = response['NextPartNumberMarker']
+        
+        print(f"[WASABI] {len(parts)} parts already uploaded for {file_key}")
+        return parts
+
     async def complete_multipart_upload(self, file_key: str, upload_id: str, etags: Dict[int, str]) -> str:
         """
         Complete a multipart upload with the ETags from all chunks
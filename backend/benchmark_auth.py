@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark auth latency under concurrent requests.
+
+Compares the previous blocking auth path (requests.get + synchronous
+SQLAlchemy query on the event loop) with the async get_current_user.
+A local mock of Auth0 /userinfo with configurable latency runs in a
+separate thread, and users are looked up in a throwaway SQLite database.
+
+Requests arrive at a fixed rate and latency is measured from the scheduled
+arrival, so time spent queued behind a blocked event loop is included.
+
+Usage:
+    python benchmark_auth.py --rate 100 --requests 500 --auth0-latency 50
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+import threading
+import contextlib
+import io
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import requests
+from aiohttp import web
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import UUID
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth import auth as auth_module
+from app.models.user import User
+from app.services.http_client import close_http_session
+
+USER_COUNT = 100
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    # The models use the Postgres UUID type; SQLite only needs a column
+    return "CHAR(32)"
+
+
+def start_mock_auth0(latency_ms: int) -> str:
+    """Serve a fake /userinfo from a background thread and return its URL"""
+    ready = threading.Event()
+    address = {}
+
+    async def userinfo(request):
+        await asyncio.sleep(latency_ms / 1000)
+        token = request.headers["Authorization"].split(" ", 1)[1]
+        index = int(token.split(":")[1]) % USER_COUNT
+        return web.json_response({"sub": f"auth0|bench{index}", "email": f"bench{index}@example.com"})
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get("/userinfo", userinfo)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        loop.run_until_complete(site.start())
+        address["port"] = site._server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{address['port']}/userinfo"
+
+
+def create_database():
+    """Create a SQLite user table seeded with the benchmark users"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    User.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    for i in range(USER_COUNT):
+        db.add(User(id=uuid.uuid4(), auth0_id=f"auth0|bench{i}", email=f"bench{i}@example.com", username=f"bench{i}"))
+    db.commit()
+    db.close()
+    return Session
+
+
+async def legacy_get_current_user(token: str, db, userinfo_url: str):
+    """The previous auth path: blocking HTTP and DB calls inside a coroutine"""
+    response = requests.get(userinfo_url, headers={"Authorization": f"Bearer {token}"})
+    payload = response.json()
+    return db.query(User).filter(User.auth0_id == payload["sub"]).first()
+
+
+async def async_get_current_user(token: str, db, userinfo_url: str):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return await auth_module.get_current_user(request=None, credentials=credentials, db=db)
+
+
+async def run_round(name, resolver, Session, userinfo_url, total, rate):
+    # Opaque tokens unique per request so every call reaches /userinfo
+    auth_module.token_cache.clear()
+    latencies = []
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+
+    async def one(i):
+        arrival = t0 + i / rate
+        await asyncio.sleep(max(0.0, arrival - loop.time()))
+        db = Session()
+        try:
+            user = await resolver(f"bench:{i}:{uuid.uuid4().hex}", db, userinfo_url)
+            assert user is not None
+        finally:
+            latencies.append((loop.time() - arrival) * 1000)
+            db.close()
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    wall = loop.time() - t0
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"{name:<8} p50={p50:8.1f}ms  p99={p99:8.1f}ms  throughput={total / wall:8.1f} req/s"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark auth latency under concurrency")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100, help="Request arrivals per second")
+    parser.add_argument("--auth0-latency", type=int, default=50, help="Mock /userinfo latency in ms")
+    args = parser.parse_args()
+
+    userinfo_url = start_mock_auth0(args.auth0_latency)
+    auth_module.AUTH0_USERINFO_URL = userinfo_url
+    Session = create_database()
+
+    # Keep the auth module's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        before = await run_round("before", legacy_get_current_user, Session, userinfo_url, args.requests, args.rate)
+        after = await run_round("after", async_get_current_user, Session, userinfo_url, args.requests, args.rate)
+        await close_http_session()
+
+    print(f"{args.requests} requests at {args.rate:g} req/s, Auth0 latency {args.auth0_latency}ms")
+    print(before)
+    print(after)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
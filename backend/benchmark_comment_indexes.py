@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark the video page queries with and without the foreign-key indexes.
+
+Seeds a scratch schema in a Postgres database with ``--comments`` comments
+(a third of them replies) spread over ``--videos`` videos and their events.
+Then it runs the queries behind GET /videos/{id}, /comments/video/{id},
+/comments/event/{id}, /events/video/{id} and delete_video's cascade twice:
+once with only the primary keys, and once after creating the indexes from
+the models. The plan's root access path and the median execution time of
+EXPLAIN ANALYZE are reported for each.
+
+The planner only behaves like production on Postgres, so SQLite isn't
+supported. Everything lives in the scratch schema, which is dropped at the
+end (pass --keep to inspect it). Requires Postgres 13+ for gen_random_uuid().
+
+Usage:
+    python benchmark_comment_indexes.py --database-url postgresql://localhost/tft_bench --comments 1000000
+"""
+
+import os
+import json
+import random
+import argparse
+import statistics
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("WASABI_BUCKET_NAME", "benchmark")
+
+from sqlalchemy import create_engine, text
+
+from app.models.base import Base
+from app.models.user import User
+from app.models.video import Video
+from app.models.event import Event
+from app.models.comment import Comment
+
+SCHEMA = "bench_comment_indexes"
+TABLES = [User.__table__, Video.__table__, Event.__table__, Comment.__table__]
+# Everything except the primary key and unique indexes the tables had before
+BENCHMARKED_INDEXES = [
+    index
+    for table in (Video.__table__, Event.__table__, Comment.__table__)
+    for index in table.indexes
+    if not index.unique and [column.name for column in index.columns] != ["id"]
+]
+
+QUERIES = [
+    ("comments by video", "SELECT * FROM comment WHERE video_id = :video_id ORDER BY created_at DESC", "video_id"),
+    ("comments by event", "SELECT * FROM comment WHERE event_id = :event_id ORDER BY created_at DESC", "event_id"),
+    ("replies of comment", "SELECT * FROM comment WHERE parent_id = :comment_id", "comment_id"),
+    ("events by video", "SELECT * FROM event WHERE video_id = :video_id ORDER BY video_timestamp", "video_id"),
+    ("videos by user", "SELECT * FROM video WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 11", "user_id"),
+]
+
+ANALYZE = 'ANALYZE "user", video, event, comment'
+
+SEED = [
+    """
+    INSERT INTO "user" (id, auth0_id, email, username, verified_riot_account, discord_connected, created_at, updated_at)
+    SELECT gen_random_uuid(), 'auth0|bench' || n, 'bench' || n || '@example.com', 'bench' || n, false, false, now(), now()
+    FROM generate_series(0, :users - 1) AS n
+    """,
+    """
+    INSERT INTO video (id, user_id, title, views, visibility, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'Video ' || n, 0, 'PUBLIC', now() - n * interval '1 minute', now()
+    FROM generate_series(0, :videos - 1) AS n
+    JOIN (SELECT id, row_number() OVER () - 1 AS rn FROM "user") AS u ON u.rn = n % :users
+    """,
+    """
+    INSERT INTO event (id, user_id, video_id, video_timestamp, title, created_at, updated_at)
+    SELECT gen_random_uuid(), v.user_id, v.id, random() * 1800, 'Event', now(), now()
+    FROM video AS v, generate_series(1, :events_per_video)
+    """,
+    # Top-level comments, every fourth one attached to one of the video's events
+    """
+    INSERT INTO comment (id, user_id, video_id, event_id, content, video_timestamp, created_at, updated_at)
+    SELECT gen_random_uuid(), v.user_id, v.id, CASE WHEN n % 4 = 0 THEN e.id END,
+           'Comment ' || n, random() * 1800, now() - n * interval '1 second', now()
+    FROM generate_series(0, :top_level - 1) AS n
+    JOIN (SELECT id, user_id, row_number() OVER () - 1 AS rn FROM video) AS v ON v.rn = n % :videos
+    LEFT JOIN (SELECT DISTINCT ON (video_id) video_id, id FROM event) AS e ON e.video_id = v.id
+    """,
+    # Replies to random top-level comments on the same video
+    """
+    INSERT INTO comment (id, user_id, video_id, parent_id, content, created_at, updated_at)
+    SELECT gen_random_uuid(), p.user_id, p.video_id, p.id, 'Reply', now(), now()
+    FROM (SELECT id, user_id, video_id FROM comment ORDER BY random() LIMIT :replies) AS p
+    """,
+]
+
+
+def explain(conn, sql: str, params: dict) -> dict:
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def access_path(node: dict) -> str:
+    """The first scan below the root, e.g. 'Index Scan on comment'"""
+    while node.get("Plans") and "Scan" not in node["Node Type"]:
+        node = node["Plans"][0]
+    relation = node.get("Relation Name")
+    return f"{node['Node Type']} on {relation}" if relation else node["Node Type"]
+
+
+def run_queries(conn, samples: dict, repeat: int) -> dict:
+    results = {}
+    for name, sql, key in QUERIES:
+        timings = []
+        path = None
+        for value in random.sample(samples[key], min(repeat, len(samples[key]))):
+            plan = explain(conn, sql, {key: value})
+            timings.append(plan["Execution Time"])
+            path = access_path(plan["Plan"])
+        results[name] = (path, statistics.median(timings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare video page query plans with and without FK indexes")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"), help="Postgres URL of a scratch database")
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--videos", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--events-per-video", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20, help="Sampled ids per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        parser.error("--database-url (or BENCHMARK_DATABASE_URL) must point at a Postgres database")
+
+    engine = create_engine(args.database_url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.commit()
+
+    try:
+        with engine.connect() as conn:
+            Base.metadata.create_all(conn, tables=TABLES)
+            for index in BENCHMARKED_INDEXES:
+                index.drop(conn)
+            conn.commit()
+
+            replies = args.comments // 3
+            params = {
+                "users": args.users,
+                "videos": args.videos,
+                "events_per_video": args.events_per_video,
+                "top_level": args.comments - replies,
+                "replies": replies
+            }
+            print(f"Seeding {args.comments} comments over {args.videos} videos...")
+            for statement in SEED:
+                conn.execute(text(statement), params)
+            conn.execute(text(ANALYZE))
+            conn.commit()
+
+            samples = {
+                "video_id": list(conn.execute(text("SELECT id FROM video ORDER BY random() LIMIT 200")).scalars()),
+                "event_id": list(conn.execute(text("SELECT event_id FROM comment WHERE event_id IS NOT NULL ORDER BY random() LIMIT 200")).scalars()),
+                "comment_id": list(conn.execute(text("SELECT parent_id FROM comment WHERE parent_id IS NOT NULL ORDER BY random() LIMIT 200")).scalars()),
+                "user_id": list(conn.execute(text('SELECT id FROM "user" ORDER BY random() LIMIT 200')).scalars()),
+            }
+
+            before = run_queries(conn, samples, args.repeat)
+            for index in BENCHMARKED_INDEXES:
+                index.create(conn)
+            conn.execute(text(ANALYZE))
+            conn.commit()
+            after = run_queries(conn, samples, args.repeat)
+
+        print(f"\n{'query':<20} {'before':>10}  {'plan':<30} {'after':>10}  {'plan':<30}")
+        for name, _, _ in QUERIES:
+            (path_before, ms_before), (path_after, ms_after) = before[name], after[name]
+            print(f"{name:<20} {ms_before:8.2f}ms  {path_before:<30} {ms_after:8.2f}ms  {path_after:<30}")
+    finally:
+        if not args.keep:
+            with engine.connect() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /videos/ latency as the page size grows.
+
+Compares the previous URL signing (one executor task per presign, 2×N per
+page) with inline signing, both with a cold cache and with a warm one, which
+is what repeated list calls see. Videos are loaded from a throwaway SQLite
+database and presigning uses a real boto3 client with dummy credentials;
+signing is local, so no network access is needed.
+
+Each page size is requested ``--concurrency`` times at once, ``--rounds``
+times, and the median and p99 per-request latency is reported.
+
+Usage:
+    python benchmark_presign.py --sizes 10 100 1000 --concurrency 10
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import io
+from functools import partial
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("WASABI_BUCKET_NAME", "benchmark")
+
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.user import User
+from app.models.video import Video, VideoVisibility
+from app.routes import videos as videos_module
+from app.services.wasabi_storage import wasabi_storage
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    # The models use Postgres types; SQLite only needs the columns to exist
+    return "CHAR(32)"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+def create_database(video_count: int):
+    """Create a SQLite database with one user owning ``video_count`` public videos"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    User.__table__.create(engine)
+    Video.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    user = User(id=uuid.uuid4(), auth0_id="auth0|bench", email="bench@example.com", username="bench")
+    db.add(user)
+    for i in range(video_count):
+        db.add(Video(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            title=f"Video {i}",
+            video_url=f"videos/{uuid.uuid4()}.mp4",
+            thumbnail_url=f"thumbnails/{uuid.uuid4()}.jpg",
+            views=0,
+            visibility=VideoVisibility.PUBLIC
+        ))
+    db.commit()
+    user_id = user.id
+    db.close()
+    return Session, user_id
+
+
+async def legacy_get_multiple_video_urls(file_keys: list, expires_in: int = 604800) -> dict:
+    """The previous implementation: every presign dispatched to the default executor"""
+    loop = asyncio.get_event_loop()
+    tasks = []
+    for file_key in file_keys:
+        url_func = partial(
+            wasabi_storage.s3_client.generate_presigned_url,
+            'get_object',
+            Params={'Bucket': wasabi_storage.bucket_name, 'Key': file_key},
+            ExpiresIn=expires_in
+        )
+        tasks.append(loop.run_in_executor(None, url_func))
+    urls = await asyncio.gather(*tasks, return_exceptions=True)
+    return {file_key: url for file_key, url in zip(file_keys, urls)}
+
+
+async def run_round(Session, user_id, size, concurrency, rounds, before_each=None):
+    latencies = []
+
+    async def one():
+        db = Session()
+        try:
+            user = db.get(User, user_id)
+            start = time.perf_counter()
+            page = await videos_module.get_videos(skip=0, limit=size, current_user=user, db=db)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert len(page) == size
+        finally:
+            db.close()
+
+    for _ in range(rounds):
+        if before_each:
+            before_each()
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return p50, p99
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint latency vs page size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--concurrency", type=int, default=10, help="Simultaneous list requests")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    current = wasabi_storage.get_multiple_video_urls
+    modes = [
+        ("executor", legacy_get_multiple_video_urls, None),
+        ("inline (cold)", current, wasabi_storage.url_cache.clear),
+        ("inline (warm)", current, None),
+    ]
+
+    print(f"{args.concurrency} concurrent requests × {args.rounds} rounds per page size")
+    print(f"{'videos':>7}  {'mode':<14} {'p50':>10} {'p99':>10}")
+    for size in args.sizes:
+        Session, user_id = create_database(size)
+        wasabi_storage.url_cache.clear()
+        for name, implementation, before_each in modes:
+            wasabi_storage.get_multiple_video_urls = implementation
+            # Keep the route's debug prints out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                p50, p99 = await run_round(Session, user_id, size, args.concurrency, args.rounds, before_each)
+            print(f"{size:>7}  {name:<14} {p50:8.1f}ms {p99:8.1f}ms")
+        wasabi_storage.get_multiple_video_urls = current
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
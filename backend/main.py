@@ -12,6 +12,8 @@ from app.db.database import get_db
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.routers.health import router as health_router
+from app.services.http_client import close_http_session
+from app.services.upload_events import upload_notifier
 
 # Load environment variables
 load_dotenv()
@@ -27,11 +29,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Add auth middleware
 app.add_middleware(AuthMiddleware)
 
+@app.on_event("startup")
+async def start_upload_notifier():
+    """Listen for upload completions broadcast by other workers"""
+    await upload_notifier.start()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """Close the shared outbound HTTP connection pool"""
+    await close_http_session()
+
+@app.on_event("shutdown")
+async def stop_upload_notifier():
+    await upload_notifier.stop()
+
 # Root endpoint
 @app.get("/")
 def read_root():
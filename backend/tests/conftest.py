@@ -4,7 +4,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from main import app, Base, get_db
+# Sets the test environment and SQLite column types before the app is imported
+from sqlite_db import create_session
+
+from main import app, get_db
+from app.models import Base
 
 # Create test database in memory
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -31,6 +35,13 @@ def test_db():
     transaction.rollback()
     connection.close()
 
+@pytest.fixture
+def db():
+    """Fresh in-memory database with the query services' tables"""
+    session = create_session()
+    yield session
+    session.close()
+
 @pytest.fixture
 def client(test_db):
     """Fixture for FastAPI test client"""
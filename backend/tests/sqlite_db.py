@@ -0,0 +1,75 @@
+"""
+In-memory SQLite database with the app's tables, for tests of the query
+services. Postgres-only column types are mapped to SQLite ones here; rows
+need explicit uuid.UUID ids because Base.generate_uuid returns strings.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "test")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("WASABI_BUCKET_NAME", "test")
+
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.comment import Comment
+from app.models.event import Event
+from app.models.user import User
+from app.models.video import Video, VideoVisibility
+
+TABLES = [User.__table__, Video.__table__, Event.__table__, Comment.__table__]
+EPOCH = datetime(2024, 1, 1)
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(36)"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array(type_, compiler, **kw):
+    return "TEXT"
+
+
+def create_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    User.metadata.create_all(engine, tables=TABLES)
+    return sessionmaker(bind=engine)()
+
+
+def add_user(db, username: str, **values) -> User:
+    user = User(id=uuid.uuid4(), auth0_id=f"auth0|{username}", email=f"{username}@example.com", username=username, **values)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def add_video(db, user: User, seconds: int = 0, **values) -> Video:
+    values.setdefault("visibility", VideoVisibility.PUBLIC)
+    video = Video(id=uuid.uuid4(), user_id=user.id, title="Video", created_at=EPOCH + timedelta(seconds=seconds), **values)
+    db.add(video)
+    db.commit()
+    return video
+
+
+def add_event(db, video: Video, user: User, video_timestamp: float, **values) -> Event:
+    event = Event(id=uuid.uuid4(), video_id=video.id, user_id=user.id, video_timestamp=video_timestamp, title="Event", **values)
+    db.add(event)
+    db.commit()
+    return event
+
+
+def add_comment(db, video: Video, user: User, seconds: int = 0, **values) -> Comment:
+    comment = Comment(
+        id=uuid.uuid4(), video_id=video.id, user_id=user.id, content="Comment",
+        created_at=EPOCH + timedelta(seconds=seconds), **values
+    )
+    db.add(comment)
+    db.commit()
+    return comment
@@ -0,0 +1,101 @@
+import os
+import asyncio
+import time
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "test")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("WASABI_BUCKET_NAME", "test")
+
+from app.auth import jwks as jwks_module
+from app.auth.jwks import JWKSCache
+from app.auth.token_cache import TokenCache
+
+
+class FakeResponse:
+    def __init__(self, keys, status=200):
+        self.status = status
+        self._keys = keys
+
+    async def json(self):
+        return {"keys": self._keys}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    def __init__(self, state):
+        self.state = state
+
+    def get(self, url):
+        self.state["calls"] += 1
+        return FakeResponse(self.state["keys"])
+
+
+@pytest.fixture
+def jwks_fetches(monkeypatch):
+    """Patch the shared HTTP session in the JWKS module and record each fetch"""
+    state = {"calls": 0, "keys": [{"kid": "a", "kty": "RSA", "n": "n", "e": "e"}]}
+
+    async def fake_get_http_session():
+        return FakeSession(state)
+
+    monkeypatch.setattr(jwks_module, "get_http_session", fake_get_http_session)
+    return state
+
+
+def test_jwks_keys_are_served_from_cache(jwks_fetches):
+    cache = JWKSCache("https://example/jwks.json", ttl=3600, refresh_margin=0)
+
+    async def run():
+        assert (await cache.get_key("a"))["kid"] == "a"
+        assert (await cache.get_key("a"))["kid"] == "a"
+
+    asyncio.run(run())
+    assert jwks_fetches["calls"] == 1
+
+
+def test_jwks_unknown_kid_forces_rate_limited_refetch(jwks_fetches):
+    cache = JWKSCache("https://example/jwks.json", ttl=3600, refresh_margin=0, min_refetch_interval=0)
+
+    async def run():
+        await cache.get_key("a")
+
+        jwks_fetches["keys"] = [{"kid": "b", "kty": "RSA", "n": "n", "e": "e"}]
+        assert (await cache.get_key("b"))["kid"] == "b"
+        assert jwks_fetches["calls"] == 2
+
+        cache.min_refetch_interval = 3600
+        with pytest.raises(ValueError):
+            await cache.get_key("c")
+        assert jwks_fetches["calls"] == 2
+
+    asyncio.run(run())
+
+
+def test_token_cache_expires_at_exp_claim():
+    cache = TokenCache(max_entries=10)
+    cache.set("expired", {"sub": "x", "exp": time.time() - 1})
+    cache.set("live", {"sub": "y", "exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("live")["sub"] == "y"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_entries=2, opaque_ttl=60)
+    cache.set("a", {"sub": "a"}, is_jwt=False)
+    cache.set("b", {"sub": "b"}, is_jwt=False)
+    cache.get("a")
+    cache.set("c", {"sub": "c"}, is_jwt=False)
+
+    assert cache.get("b") is None
+    assert cache.get("a")["sub"] == "a"
+    assert cache.get("c")["sub"] == "c"
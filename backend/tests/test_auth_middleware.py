@@ -0,0 +1,106 @@
+import os
+import json
+import asyncio
+import importlib
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "test")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("WASABI_BUCKET_NAME", "test")
+
+from fastapi import HTTPException
+
+from app.auth.auth import AuthMiddleware
+
+auth_module = importlib.import_module("app.auth.auth")
+
+CLAIMS = {"sub": "auth0|player", "email": "player@example.com"}
+
+
+@pytest.fixture
+def tokens(monkeypatch):
+    """Accept only "good" and record every token that gets verified"""
+    verified = []
+
+    async def get_token_payload(token):
+        verified.append(token)
+        if token != "good":
+            raise HTTPException(status_code=401, detail="Invalid token: bad signature")
+        return CLAIMS
+
+    monkeypatch.setattr(auth_module, "get_token_payload", get_token_payload)
+    return verified
+
+
+def http_scope(path, method="GET", authorization=None):
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return {"type": "http", "method": method, "path": path, "headers": headers}
+
+
+def call(scope):
+    """Run the middleware, returning the scope the app saw (None if blocked) and what was sent"""
+    seen = []
+    sent = []
+
+    async def app(scope, receive, send):
+        seen.append(scope)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(AuthMiddleware(app)(scope, receive, send))
+    return (seen[0] if seen else None), sent
+
+
+def response_of(sent):
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return sent[0]["status"], json.loads(body)
+
+
+@pytest.mark.parametrize("scope", [
+    http_scope("/api/v1/health"),
+    http_scope("/docs"),
+    http_scope("/api/v1/videos/abc/hls/master.m3u8"),
+    http_scope("/api/v1/videos/", method="OPTIONS"),
+    {"type": "websocket", "path": "/ws", "headers": []},
+    {"type": "lifespan"}
+])
+def test_public_requests_pass_through(tokens, scope):
+    seen, sent = call(scope)
+
+    assert seen is scope
+    assert sent == []
+    assert tokens == []
+    assert "auth_claims" not in scope.get("state", {})
+
+
+@pytest.mark.parametrize("authorization", [None, "good", "Basic good"])
+def test_missing_bearer_token_is_rejected(tokens, authorization):
+    seen, sent = call(http_scope("/api/v1/videos/", authorization=authorization))
+
+    assert seen is None
+    assert response_of(sent) == (401, {"detail": "Missing or invalid token format"})
+    assert tokens == []
+
+
+def test_invalid_token_is_rejected(tokens):
+    seen, sent = call(http_scope("/api/v1/videos/", authorization="Bearer forged"))
+
+    assert seen is None
+    assert response_of(sent) == (401, {"detail": "Invalid token: bad signature"})
+    assert tokens == ["forged"]
+
+
+def test_verified_claims_are_stored_on_the_scope(tokens):
+    scope = http_scope("/api/v1/videos/", authorization="Bearer good")
+
+    seen, sent = call(scope)
+
+    assert seen is scope
+    assert sent == []
+    assert scope["state"]["auth_claims"] == CLAIMS
+    assert tokens == ["good"]
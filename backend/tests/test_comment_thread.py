@@ -0,0 +1,80 @@
+import pytest
+
+from sqlite_db import add_comment, add_event, add_user, add_video
+
+from app.schemas.comment import CommentResponse
+from app.services.comment_thread import load_comment_thread
+
+
+@pytest.fixture
+def video(db):
+    return add_video(db, add_user(db, "owner"))
+
+
+def test_replies_nest_under_their_parents(db, video):
+    user = add_user(db, "viewer")
+    first = add_comment(db, video, user, seconds=1)
+    second = add_comment(db, video, user, seconds=2)
+    reply = add_comment(db, video, user, seconds=3, parent_id=first.id)
+    nested = add_comment(db, video, user, seconds=4, parent_id=reply.id)
+
+    roots = load_comment_thread(db, video.id)
+
+    assert [root["id"] for root in roots] == [second.id, first.id]
+    assert roots[0]["replies"] == []
+    assert [node["id"] for node in roots[1]["replies"]] == [reply.id]
+    assert [node["id"] for node in roots[1]["replies"][0]["replies"]] == [nested.id]
+
+
+def test_top_level_newest_first_and_replies_oldest_first(db, video):
+    user = add_user(db, "viewer")
+    root = add_comment(db, video, user, seconds=10)
+    late = add_comment(db, video, user, seconds=30, parent_id=root.id)
+    early = add_comment(db, video, user, seconds=20, parent_id=root.id)
+    newer_root = add_comment(db, video, user, seconds=40)
+
+    roots = load_comment_thread(db, video.id)
+
+    assert [node["id"] for node in roots] == [newer_root.id, root.id]
+    assert [node["id"] for node in roots[1]["replies"]] == [early.id, late.id]
+
+
+def test_effective_timestamp_is_inherited(db, video):
+    user = add_user(db, "viewer")
+    event = add_event(db, video, user, 90.0)
+    timed = add_comment(db, video, user, seconds=1, video_timestamp=15.0)
+    reply = add_comment(db, video, user, seconds=2, parent_id=timed.id)
+    linked = add_comment(db, video, user, seconds=3, event_id=event.id, video_timestamp=5.0)
+    linked_reply = add_comment(db, video, user, seconds=4, parent_id=linked.id)
+    untimed = add_comment(db, video, user, seconds=5)
+    add_comment(db, video, user, seconds=6, parent_id=untimed.id)
+
+    by_id = {}
+
+    def collect(nodes):
+        for node in nodes:
+            by_id[node["id"]] = node
+            collect(node["replies"])
+
+    collect(load_comment_thread(db, video.id))
+
+    assert by_id[timed.id]["effective_timestamp"] == 15.0
+    assert by_id[reply.id]["effective_timestamp"] == 15.0
+    # A linked event's timestamp wins over the comment's own
+    assert by_id[linked.id]["effective_timestamp"] == 90.0
+    assert by_id[linked_reply.id]["effective_timestamp"] == 90.0
+    assert by_id[untimed.id]["effective_timestamp"] is None
+    assert by_id[untimed.id]["replies"][0]["effective_timestamp"] is None
+
+
+def test_only_the_requested_video_is_read(db, video):
+    user = add_user(db, "viewer")
+    other = add_video(db, user)
+    mine = add_comment(db, video, user, seconds=1)
+    add_comment(db, other, user, seconds=2)
+
+    roots = load_comment_thread(db, video.id)
+
+    assert [root["id"] for root in roots] == [mine.id]
+    assert roots[0]["user_username"] == "viewer"
+    CommentResponse.model_validate(roots[0])
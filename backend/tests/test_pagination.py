@@ -0,0 +1,74 @@
+import uuid
+import pytest
+
+from sqlite_db import EPOCH, add_user, add_video
+
+from app.models.video import Video, VideoVisibility
+from app.routes.videos import accessible_video_queries
+from app.services.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def read_all(db, queries_for, limit):
+    """Follow next cursors to the end, returning every page"""
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(Video, queries_for(db), limit, cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(EPOCH, row_id)) == (EPOCH, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd", encode_cursor(EPOCH, "x")])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_are_newest_first_with_ties_broken_by_id(db):
+    user = add_user(db, "owner")
+    # Three videos share each created_at
+    videos = [add_video(db, user, seconds=i // 3) for i in range(9)]
+
+    pages = read_all(db, lambda db: [db.query(Video)], 2)
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 1]
+    assert len({row.id for row in rows}) == 9
+    assert [row.id for row in rows] == [
+        video.id for video in sorted(videos, key=lambda video: (video.created_at, video.id), reverse=True)
+    ]
+
+
+def test_exact_page_has_no_next_cursor(db):
+    user = add_user(db, "owner")
+    for i in range(4):
+        add_video(db, user, seconds=i)
+
+    rows, cursor = keyset_page(Video, [db.query(Video)], 4)
+    assert len(rows) == 4
+    assert cursor is None
+
+
+def test_public_and_private_branches_merge(db):
+    me = add_user(db, "me")
+    other = add_user(db, "other")
+    mine_public = add_video(db, me, seconds=1)
+    mine_private = add_video(db, me, seconds=2, visibility=VideoVisibility.PRIVATE)
+    theirs_public = add_video(db, other, seconds=3)
+    add_video(db, other, seconds=4, visibility=VideoVisibility.PRIVATE)
+    mine_unset = add_video(db, me, seconds=5)
+    theirs_unset = add_video(db, other, seconds=6)
+    # NULL visibility only comes from rows written outside the ORM, which fills in the default
+    db.query(Video).filter(Video.id.in_([mine_unset.id, theirs_unset.id])).update({"visibility": None})
+    db.commit()
+
+    pages = read_all(db, lambda db: accessible_video_queries(db.query(Video), me.id), 2)
+
+    assert [row.id for page in pages for row in page] == [
+        mine_unset.id, theirs_public.id, mine_private.id, mine_public.id
+    ]
@@ -0,0 +1,71 @@
+import pytest
+
+from sqlite_db import add_comment, add_event, add_user, add_video
+
+from app.services.timeline import load_comments_in_range, timeline_density
+
+
+@pytest.fixture
+def timeline(db):
+    """A video with comments at 5s, 15s, 25s (via an event at 25s) and a reply, plus an event at 59.9s"""
+    user = add_user(db, "viewer")
+    video = add_video(db, user)
+    event = add_event(db, video, user, 25.0)
+    add_event(db, video, user, 59.9)
+    comments = {
+        "early": add_comment(db, video, user, seconds=1, video_timestamp=5.0),
+        "middle": add_comment(db, video, user, seconds=2, video_timestamp=15.0),
+        "linked": add_comment(db, video, user, seconds=3, event_id=event.id, video_timestamp=1.0),
+        "untimed": add_comment(db, video, user, seconds=4)
+    }
+    add_comment(db, video, user, seconds=5, parent_id=comments["early"].id, video_timestamp=6.0)
+    return video, comments
+
+
+def test_range_is_half_open_and_in_timeline_order(db, timeline):
+    video, comments = timeline
+
+    rows = load_comments_in_range(db, video.id, 5.0, 25.0)
+
+    assert [row["id"] for row in rows] == [comments["early"].id, comments["middle"].id]
+    assert [row["effective_timestamp"] for row in rows] == [5.0, 15.0]
+
+
+def test_event_linked_comments_sit_at_the_event(db, timeline):
+    video, comments = timeline
+
+    assert [row["id"] for row in load_comments_in_range(db, video.id, 0, 2.0)] == []
+    rows = load_comments_in_range(db, video.id, 20.0)
+    assert [row["id"] for row in rows] == [comments["linked"].id]
+    assert rows[0]["effective_timestamp"] == 25.0
+
+
+def test_open_range_skips_replies_and_untimed_comments(db, timeline):
+    video, comments = timeline
+
+    rows = load_comments_in_range(db, video.id)
+
+    assert [row["id"] for row in rows] == [comments["early"].id, comments["middle"].id, comments["linked"].id]
+
+
+def test_density_buckets(db, timeline):
+    video, _ = timeline
+
+    assert timeline_density(db, video.id, bucket_seconds=10) == [
+        {"start": 0, "comments": 1, "events": 0},
+        {"start": 10, "comments": 1, "events": 0},
+        {"start": 20, "comments": 1, "events": 1},
+        {"start": 50, "comments": 0, "events": 1}
+    ]
+    assert timeline_density(db, video.id, bucket_seconds=30) == [
+        {"start": 0, "comments": 3, "events": 1},
+        {"start": 30, "comments": 0, "events": 1}
+    ]
+
+
+def test_density_respects_the_range(db, timeline):
+    video, _ = timeline
+
+    assert timeline_density(db, video.id, bucket_seconds=10, start=10.0, end=25.0) == [
+        {"start": 10, "comments": 1, "events": 0}
+    ]
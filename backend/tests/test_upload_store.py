@@ -0,0 +1,174 @@
+import os
+import uuid
+import asyncio
+import threading
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("WASABI_ACCESS_KEY_ID", "test")
+os.environ.setdefault("WASABI_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("WASABI_BUCKET_NAME", "test")
+
+from app.services import upload_store as upload_store_module
+from app.services.upload_store import MemoryUploadStore, UploadStore
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the store's time.time() by hand"""
+    fake = FakeClock()
+    monkeypatch.setattr(upload_store_module, "time", fake)
+    return fake
+
+
+def run_in_threads(count, func):
+    """Run func(i) on ``count`` threads at once, each in its own event loop"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def target(i):
+        barrier.wait()
+        results[i] = asyncio.run(func(i))
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_upload_store_is_abstract():
+    with pytest.raises(TypeError):
+        UploadStore()
+
+
+def test_create_is_atomic():
+    store = MemoryUploadStore()
+    results = run_in_threads(16, lambda i: store.create("u1", {"status": "uploading", "owner": i}))
+
+    assert results.count(True) == 1
+    owner = results.index(True)
+    assert asyncio.run(store.get("u1"))["owner"] == owner
+
+
+def test_create_takes_over_an_expired_session(clock):
+    store = MemoryUploadStore(ttl=60)
+
+    async def run():
+        assert await store.create("u1", {"status": "old"})
+        assert not await store.create("u1", {"status": "new"})
+        clock.now += 61
+        assert await store.get("u1") is None
+        assert await store.create("u1", {"status": "new"})
+        assert (await store.get("u1"))["status"] == "new"
+
+    asyncio.run(run())
+
+
+def test_merge_field_keeps_concurrent_merges():
+    store = MemoryUploadStore()
+    asyncio.run(store.create("u1", {"status": "initialized", "etags": {}}))
+
+    run_in_threads(16, lambda i: store.merge_field("u1", "etags", {str(i): f"etag-{i}"}))
+
+    etags = asyncio.run(store.get("u1"))["etags"]
+    assert etags == {str(i): f"etag-{i}" for i in range(16)}
+
+
+def test_transition_only_from_expected_status():
+    store = MemoryUploadStore()
+
+    async def run():
+        await store.create("u1", {"status": "uploading"})
+        assert await store.transition("u1", ["completed"], {"status": "discarded"}) is None
+        assert (await store.transition("u1", ["uploading"], {"status": "completed"}))["status"] == "completed"
+        assert await store.transition("u1", ["uploading"], {"status": "error"}) is None
+        assert await store.transition("missing", ["uploading"], {"status": "completed"}) is None
+
+    asyncio.run(run())
+
+
+def test_transition_has_a_single_winner():
+    store = MemoryUploadStore()
+    asyncio.run(store.create("u1", {"status": "completed"}))
+
+    results = run_in_threads(16, lambda i: store.transition("u1", ["completed"], {"status": "discarded", "by": i}))
+
+    assert sum(result is not None for result in results) == 1
+
+
+def test_delete_returns_the_last_state_once():
+    store = MemoryUploadStore()
+    asyncio.run(store.create("u1", {"status": "completed"}))
+
+    results = run_in_threads(8, lambda i: store.delete("u1"))
+
+    assert [result for result in results if result is not None] == [{"status": "completed"}]
+
+
+def test_writes_extend_expiry(clock):
+    store = MemoryUploadStore(ttl=60)
+
+    async def run():
+        await store.create("u1", {"status": "uploading"})
+        clock.now += 50
+        await store.update("u1", {"progress": 10})
+        clock.now += 50
+        assert (await store.get("u1"))["progress"] == 10
+
+    asyncio.run(run())
+
+
+def test_multipart_upload_ids_only_come_from_live_sessions(clock):
+    store = MemoryUploadStore(ttl=60)
+
+    async def run():
+        await store.create("old", {"status": "initialized", "wasabi_upload_id": "w-old"})
+        clock.now += 30
+        await store.create("new", {"status": "initialized", "wasabi_upload_id": "w-new"})
+        await store.create("stream", {"status": "uploading"})
+        assert await store.multipart_upload_ids() == {"w-old", "w-new"}
+
+        clock.now += 40
+        assert await store.multipart_upload_ids() == {"w-new"}
+
+    asyncio.run(run())
+
+
+def test_purge_expired(clock):
+    store = MemoryUploadStore(ttl=60)
+
+    async def run():
+        await store.create("a", {})
+        await store.create("b", {})
+        clock.now += 30
+        await store.create("c", {})
+        clock.now += 31
+
+        assert await store.purge_expired() == 2
+        assert await store.purge_expired() == 0
+        assert await store.get("c") == {}
+
+    asyncio.run(run())
+
+
+def test_values_are_stored_as_json():
+    store = MemoryUploadStore()
+
+    async def run():
+        user_id = uuid.uuid4()
+        await store.create("u1", {"chunks": {3, 1, 2}, "user_id": user_id})
+        session = await store.get("u1")
+        assert session["chunks"] == [1, 2, 3]
+        assert session["user_id"] == str(user_id)
+
+    asyncio.run(run())
@@ -0,0 +1,98 @@
+import importlib
+import pytest
+from sqlalchemy import event
+
+from sqlite_db import add_user
+
+from app.auth.user_cache import UserCache
+from app.models.user import User
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the cache's time.time() by hand"""
+    fake = FakeClock()
+    # app.auth re-exports the global cache as user_cache, shadowing the module
+    monkeypatch.setattr(importlib.import_module("app.auth.user_cache"), "time", fake)
+    return fake
+
+
+def count_queries(db):
+    """Count statements sent to the session's database from here on"""
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_hit_skips_the_query(db):
+    cache = UserCache(ttl=30)
+    cache.set(add_user(db, "player", riot_region="euw1"))
+    db.expunge_all()
+    statements = count_queries(db)
+
+    user = cache.get(db, "auth0|player")
+
+    assert user.username == "player"
+    assert user.riot_region == "euw1"
+    assert statements == []
+
+
+def test_merged_user_is_attached_to_the_session(db):
+    cache = UserCache(ttl=30)
+    cache.set(add_user(db, "player"))
+    db.expunge_all()
+
+    user = cache.get(db, "auth0|player")
+    assert user in db
+
+    user.riot_region = "na1"
+    db.commit()
+    db.expunge_all()
+    assert db.query(User).filter(User.auth0_id == "auth0|player").one().riot_region == "na1"
+
+
+def test_invalidate_after_an_update(db):
+    cache = UserCache(ttl=30)
+    user = add_user(db, "player")
+    cache.set(user)
+
+    user.username = "renamed"
+    db.commit()
+    cache.invalidate(user.auth0_id)
+    assert cache.get(db, user.auth0_id) is None
+
+    cache.set(user)
+    db.expunge_all()
+    assert cache.get(db, user.auth0_id).username == "renamed"
+
+
+def test_entries_expire(db, clock):
+    cache = UserCache(ttl=30)
+    cache.set(add_user(db, "player"))
+    db.expunge_all()
+
+    clock.now += 29
+    assert cache.get(db, "auth0|player") is not None
+    db.expunge_all()
+    clock.now += 1
+    assert cache.get(db, "auth0|player") is None
+
+
+def test_least_recently_used_entry_is_evicted(db):
+    cache = UserCache(ttl=30, max_entries=2)
+    first, second, third = (add_user(db, name) for name in ("first", "second", "third"))
+    cache.set(first)
+    cache.set(second)
+    cache.get(db, first.auth0_id)
+    cache.set(third)
+
+    assert cache.get(db, second.auth0_id) is None
+    assert cache.get(db, first.auth0_id) is not None
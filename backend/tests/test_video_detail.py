@@ -0,0 +1,58 @@
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from sqlite_db import add_comment, add_event, add_user, add_video
+
+from app.models.comment import Comment
+from app.models.event import Event
+from app.schemas.video import VideoDetailResponse
+from app.services.video_detail import COMMENT_FIELDS, EVENT_FIELDS, _json_children, load_video_detail
+
+
+def as_postgres_json(rows):
+    """What json_agg hands back: UUIDs as strings, timestamps as ISO 8601 without a zone"""
+    def encode(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        raise TypeError(value)
+    return json.loads(json.dumps(rows, default=encode))
+
+
+def test_json_and_orm_children_validate_to_the_same_response(db):
+    owner = add_user(db, "owner", profile_picture="https://example.com/owner.png")
+    viewer = add_user(db, "viewer")
+    video = add_video(db, owner, duration=600)
+    event = add_event(db, video, owner, 42.5, description="Fight", event_type="combat")
+    add_event(db, video, viewer, 12.0)
+    top = add_comment(db, video, viewer, seconds=1, video_timestamp=40.0)
+    add_comment(db, video, owner, seconds=2, parent_id=top.id)
+    add_comment(db, video, viewer, seconds=3, event_id=event.id)
+
+    detail = load_video_detail(db, video.id)
+    json_detail = {**detail, "comments": as_postgres_json(detail["comments"]), "events": as_postgres_json(detail["events"])}
+
+    orm_response = VideoDetailResponse.model_validate(detail)
+    json_response = VideoDetailResponse.model_validate(json_detail)
+
+    assert json_response.model_dump() == orm_response.model_dump()
+    assert [comment.created_at for comment in orm_response.comments] == sorted(
+        (comment.created_at for comment in orm_response.comments), reverse=True
+    )
+    assert [event.video_timestamp for event in orm_response.events] == [12.0, 42.5]
+    assert orm_response.events[1].user_profile_picture == "https://example.com/owner.png"
+
+
+def test_json_children_select_every_response_field():
+    for model, fields in ((Comment, COMMENT_FIELDS), (Event, EVENT_FIELDS)):
+        sql = str(_json_children(model, fields, model.created_at.desc()).compile(dialect=postgresql.dialect()))
+        for name in fields + ["user_username", "user_profile_picture"]:
+            assert f"'{name}'" in sql
+
+
+def test_missing_video_returns_none(db):
+    assert load_video_detail(db, uuid.uuid4()) is None
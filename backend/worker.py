@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Background job worker.
+
+Runs the jobs queued in the ``job`` table (thumbnails and other media
+processing) in a separate process, so heavy ffmpeg work never shares the
+API's event loop or CPU time with request handling.
+
+Usage:
+    python worker.py
+
+Environment:
+    WORKER_CONCURRENCY      jobs run at once by this process (default 2)
+    MEDIA_WORKERS           ffmpeg processes (default 2)
+    MEDIA_QUEUE_SIZE        media jobs allowed to wait for a process (default 8)
+    MEDIA_STATS_INTERVAL    seconds between media executor stats lines, 0 disables (default 300)
+    JOB_POLL_INTERVAL       seconds to sleep when the queue is empty (default 2)
+    JOB_VISIBILITY_TIMEOUT  lease on a claimed job, also its run timeout (default 600)
+    HLS_JOB_TIMEOUT         lease and run timeout for HLS transcodes, plus
+                            HLS_TRANSCODE_FACTOR seconds per second of video (default 3600)
+    ORPHAN_SWEEP_INTERVAL   seconds between orphaned-storage sweeps, 0 disables (default 21600)
+    ORPHAN_SWEEP_DRY_RUN    log what a sweep would delete without deleting it (default true)
+"""
+
+import os
+import time
+import asyncio
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from starlette.concurrency import run_in_threadpool
+
+from app.db.database import SessionLocal
+from app.services import media_jobs  # noqa: F401 - registers the media job handlers
+from app.services.job_queue import JOB_HANDLERS, RetryLater, claim_job, complete_job, fail_job, job_timeout
+from app.services.http_client import close_http_session
+from app.services.media_executor import media_executor
+from app.services.orphan_sweeper import ORPHAN_SWEEP_INTERVAL, run_sweep
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+# Seconds between [MEDIA] stats lines, so queue depth and timings show up in the logs
+MEDIA_STATS_INTERVAL = float(os.getenv("MEDIA_STATS_INTERVAL", "300"))
+# Delay before the first sweep so restarts don't all sweep at once
+SWEEP_STARTUP_DELAY = 60
+
+
+def _claim():
+    """Claim a job and return (id, kind, payload, attempt) detached from the session"""
+    db = SessionLocal()
+    try:
+        job = claim_job(db)
+        if job is None:
+            return None
+        return job.id, job.kind, dict(job.payload or {}), job.attempts
+    finally:
+        db.close()
+
+
+def _finish(job_id, attempt, error=None):
+    db = SessionLocal()
+    try:
+        if error is None:
+            complete_job(db, job_id, attempt)
+        else:
+            fail_job(db, job_id, attempt, error)
+    finally:
+        db.close()
+
+
+async def run_one() -> bool:
+    """Claim and run a single job, returns False when the queue is empty"""
+    claimed = await run_in_threadpool(_claim)
+    if claimed is None:
+        return False
+
+    job_id, kind, payload, attempt = claimed
+    handler = JOB_HANDLERS.get(kind)
+    start_time = time.time()
+    print(f"[WORKER] Running {kind} job {job_id}")
+
+    try:
+        if handler is None:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        # Stop before the lease expires so another worker doesn't run it twice
+        await asyncio.wait_for(handler(payload), timeout=job_timeout(kind, payload))
+    except Exception as e:
+        if not isinstance(e, RetryLater):
+            print(f"[WORKER] {kind} job {job_id} failed after {time.time() - start_time:.2f}s: {str(e)}")
+        await run_in_threadpool(_finish, job_id, attempt, e)
+        return True
+
+    print(f"[WORKER] {kind} job {job_id} done in {time.time() - start_time:.2f}s")
+    await run_in_threadpool(_finish, job_id, attempt)
+    return True
+
+
+async def worker_loop(stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            ran = await run_one()
+        except Exception as e:
+            # Database hiccups shouldn't kill the worker
+            print(f"[WORKER] Error polling for jobs: {str(e)}")
+            ran = False
+        if not ran:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def sweeper_loop(stop: asyncio.Event):
+    """Reclaim orphaned storage every ORPHAN_SWEEP_INTERVAL seconds"""
+    delay = SWEEP_STARTUP_DELAY
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await run_sweep()
+        except Exception as e:
+            print(f"[WORKER] Orphan sweep failed: {str(e)}")
+        delay = ORPHAN_SWEEP_INTERVAL
+
+
+async def stats_loop(stop: asyncio.Event):
+    """Log the media executor's counters every MEDIA_STATS_INTERVAL seconds"""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=MEDIA_STATS_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            pass
+        print(f"[MEDIA] Stats: {media_executor.stats()}")
+
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"[WORKER] Starting {WORKER_CONCURRENCY} job loops for: {', '.join(sorted(JOB_HANDLERS))}")
+    loops = [worker_loop(stop) for _ in range(WORKER_CONCURRENCY)]
+    if ORPHAN_SWEEP_INTERVAL > 0:
+        loops.append(sweeper_loop(stop))
+    if MEDIA_STATS_INTERVAL > 0:
+        loops.append(stats_loop(stop))
+    await asyncio.gather(*loops)
+    await close_http_session()
+    media_executor.shutdown()
+    print(f"[WORKER] Stopped: {media_executor.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,6 +3,7 @@ import { useNavigate, useParams } from "react-router-dom";
 import { useAuthToken } from "../../utils/auth";
 import api from "../../api/axios";
 import styles from "./EventCreation.module.css";
+import { pickStreamUrl } from "../../utils/streamUrl";
 
 interface Event {
   id: string;
@@ -63,7 +64,7 @@ const EventCreation: React.FC = () => {
           }
         );
 
-        setVideoUrl(streamResponse.data.url);
+        setVideoUrl(pickStreamUrl(streamResponse.data));
 
         // Fetch existing events if any
         const eventsResponse = await api.get(`/api/v1/events/${videoId}`, {
@@ -50,8 +50,28 @@ interface ChunkedUploadResponse {
   chunk_size: number;
   total_chunks: number;
   presigned_urls: { [key: number]: string };
+  next_chunk?: number | null;
 }
 
+interface PartUrlsResponse {
+  upload_id: string;
+  presigned_urls: { [key: number]: string };
+  next_chunk?: number | null;
+}
+
+interface ResumeResponse {
+  upload_id: string;
+  chunk_size: number;
+  total_chunks: number;
+  uploaded_chunks: number[];
+  presigned_urls: { [key: number]: string };
+  missing_chunks: number[];
+}
+
+// How often a failed chunked upload is resumed before giving up
+const MAX_RESUME_ATTEMPTS = 3;
+const RESUME_DELAY_MS = 2000;
+
 interface ChunkUploadProgress {
   chunkNumber: number;
   status: "pending" | "uploading" | "completed" | "error";
@@ -197,7 +217,8 @@ const VideoUpload: React.FC<VideoUploadProps> = ({ isOpen, onClose }) => {
       uploadChunks(
         file,
         response.data.presigned_urls,
-        response.data.upload_id
+        response.data.upload_id,
+        response.data.total_chunks
       ).catch((error) => {
         console.error("[UPLOAD] Chunk upload failed:", error);
         setError("Failed to upload video chunks. Please try again.");
@@ -246,7 +267,8 @@ const VideoUpload: React.FC<VideoUploadProps> = ({ isOpen, onClose }) => {
   const uploadChunks = async (
     file: File,
     presignedUrls: { [key: number]: string },
-    newUploadId: string
+    newUploadId: string,
+    chunkCount: number
   ) => {
     setUploadingChunks(true);
     const etags: { [key: number]: string } = {};
@@ -261,111 +283,183 @@ const VideoUpload: React.FC<VideoUploadProps> = ({ isOpen, onClose }) => {
       });
 
       // Upload chunks in parallel with a limit of 3 concurrent uploads
-      const chunkNumbers = Object.keys(presignedUrls).map(Number);
+      const urls: { [key: number]: string } = { ...presignedUrls };
       const concurrentLimit = 3;
+      // Chunks Wasabi holds, including ones sent before a resume
+      const completed = new Set<number>();
+      const authHeaders = async () => ({
+        Authorization: `Bearer ${await getToken()}`,
+      });
+
+      const uploadChunk = async (chunkNumber: number) => {
+        const start = (chunkNumber - 1) * chunkSize;
+        const end = Math.min(start + chunkSize, file.size);
+        const chunk = file.slice(start, end);
 
-      for (let i = 0; i < chunkNumbers.length; i += concurrentLimit) {
-        const chunkBatch = chunkNumbers.slice(i, i + concurrentLimit);
-        console.log(`[UPLOAD] Processing batch ${i / concurrentLimit + 1}`, {
-          chunkBatch,
+        console.log(`[UPLOAD] Uploading chunk ${chunkNumber}`, {
+          start,
+          end,
+          size: chunk.size,
+          type: chunk.type,
         });
 
-        await Promise.all(
-          chunkBatch.map(async (chunkNumber) => {
-            const start = (chunkNumber - 1) * chunkSize;
-            const end = Math.min(start + chunkSize, file.size);
-            const chunk = file.slice(start, end);
-
-            console.log(`[UPLOAD] Uploading chunk ${chunkNumber}`, {
-              start,
-              end,
-              size: chunk.size,
-              type: chunk.type,
+        try {
+          const response = await fetch(urls[chunkNumber], {
+            method: "PUT",
+            body: chunk,
+            headers: {
+              "Content-Type": file.type,
+            },
+          });
+
+          if (!response.ok) {
+            const errorText = await response.text();
+            console.error(`[UPLOAD] Chunk ${chunkNumber} upload failed`, {
+              status: response.status,
+              statusText: response.statusText,
+              responseText: errorText,
+              headers: Object.fromEntries(response.headers.entries()),
             });
+            throw new Error(
+              `Failed to upload chunk ${chunkNumber}: ${response.statusText}`
+            );
+          }
+
+          // Get ETag from response headers and clean it
+          const etag = response.headers.get("ETag");
+          console.log(`[UPLOAD] Chunk ${chunkNumber} response headers:`, {
+            headers: Object.fromEntries(response.headers.entries()),
+            etag,
+          });
 
-            try {
-              const response = await fetch(presignedUrls[chunkNumber], {
-                method: "PUT",
-                body: chunk,
-                headers: {
-                  "Content-Type": file.type,
-                },
-              });
-
-              if (!response.ok) {
-                const errorText = await response.text();
-                console.error(`[UPLOAD] Chunk ${chunkNumber} upload failed`, {
-                  status: response.status,
-                  statusText: response.statusText,
-                  responseText: errorText,
-                  headers: Object.fromEntries(response.headers.entries()),
-                });
-                throw new Error(
-                  `Failed to upload chunk ${chunkNumber}: ${response.statusText}`
-                );
+          if (etag) {
+            // Remove quotes and store with numeric key
+            const cleanEtag = etag.replace(/^"|"$/g, "");
+            etags[chunkNumber] = cleanEtag;
+            setUploadedEtags((prev) => ({
+              ...prev,
+              [chunkNumber]: cleanEtag,
+            }));
+
+            console.log(
+              `[UPLOAD] Chunk ${chunkNumber} uploaded successfully`,
+              {
+                originalEtag: etag,
+                cleanEtag,
+                storedEtags: etags,
               }
+            );
+          } else {
+            console.error(
+              `[UPLOAD] No ETag received for chunk ${chunkNumber}`
+            );
+            throw new Error(`No ETag received for chunk ${chunkNumber}`);
+          }
+
+          // Update chunk status
+          setChunks((prev) =>
+            prev.map((c) =>
+              c.chunkNumber === chunkNumber
+                ? { ...c, status: "completed", progress: 100 }
+                : c
+            )
+          );
+
+          // Update overall progress
+          completed.add(chunkNumber);
+          setUploadProgress((completed.size / chunkCount) * 100);
+        } catch (error: any) {
+          console.error(`[UPLOAD] Error uploading chunk ${chunkNumber}:`, {
+            error,
+            errorMessage: error?.message,
+            errorStack: error?.stack,
+          });
+          setChunks((prev) =>
+            prev.map((c) =>
+              c.chunkNumber === chunkNumber
+                ? { ...c, status: "error", progress: 0 }
+                : c
+            )
+          );
+          throw error;
+        }
+      };
+
+      const uploadPending = async (pending: number[]) => {
+        for (let i = 0; i < pending.length; i += concurrentLimit) {
+          const chunkBatch = pending.slice(i, i + concurrentLimit);
+          console.log(`[UPLOAD] Processing batch ${i / concurrentLimit + 1}`, {
+            chunkBatch,
+          });
 
-              // Get ETag from response headers and clean it
-              const etag = response.headers.get("ETag");
-              console.log(`[UPLOAD] Chunk ${chunkNumber} response headers:`, {
-                headers: Object.fromEntries(response.headers.entries()),
-                etag,
-              });
-
-              if (etag) {
-                // Remove quotes and store with numeric key
-                const cleanEtag = etag.replace(/^"|"$/g, "");
-                etags[chunkNumber] = cleanEtag;
-                setUploadedEtags((prev) => ({
-                  ...prev,
-                  [chunkNumber]: cleanEtag,
-                }));
-
-                console.log(
-                  `[UPLOAD] Chunk ${chunkNumber} uploaded successfully`,
-                  {
-                    originalEtag: etag,
-                    cleanEtag,
-                    storedEtags: etags,
-                  }
-                );
-              } else {
-                console.error(
-                  `[UPLOAD] No ETag received for chunk ${chunkNumber}`
-                );
-                throw new Error(`No ETag received for chunk ${chunkNumber}`);
+          // Part URLs are issued in windows; fetch the next one when we reach it
+          if (chunkBatch.some((chunkNumber) => !urls[chunkNumber])) {
+            const urlResponse = await api.get<PartUrlsResponse>(
+              `/api/v1/videos/chunked-upload/${newUploadId}/part-urls`,
+              {
+                params: { start: chunkBatch[0] },
+                headers: await authHeaders(),
               }
+            );
+            Object.assign(urls, urlResponse.data.presigned_urls);
+          }
 
-              // Update chunk status
-              setChunks((prev) =>
-                prev.map((c) =>
-                  c.chunkNumber === chunkNumber
-                    ? { ...c, status: "completed", progress: 100 }
-                    : c
-                )
-              );
-
-              // Update overall progress
-              const totalProgress =
-                (Object.keys(etags).length / totalChunks) * 100;
-              setUploadProgress(totalProgress);
-            } catch (error: any) {
-              console.error(`[UPLOAD] Error uploading chunk ${chunkNumber}:`, {
-                error,
-                errorMessage: error?.message,
-                errorStack: error?.stack,
-              });
-              setChunks((prev) =>
-                prev.map((c) =>
-                  c.chunkNumber === chunkNumber
-                    ? { ...c, status: "error", progress: 0 }
-                    : c
-                )
-              );
-              throw error;
-            }
-          })
-        );
+          await Promise.all(chunkBatch.map(uploadChunk));
+
+          // Report the batch so the server can track progress and resume
+          const batchEtags: { [key: number]: string } = {};
+          chunkBatch.forEach((chunkNumber) => {
+            batchEtags[chunkNumber] = etags[chunkNumber];
+          });
+          api
+            .post(
+              `/api/v1/videos/chunked-upload/${newUploadId}/parts`,
+              { etags: batchEtags },
+              { headers: await authHeaders() }
+            )
+            .catch((error) =>
+              console.warn("[UPLOAD] Failed to report chunks:", error)
+            );
+        }
+      };
+
+      // After a failure, ask the server which chunks Wasabi already holds and
+      // send only the missing ones
+      let pending = Array.from({ length: chunkCount }, (_, i) => i + 1);
+      for (let attempt = 0; pending.length > 0; attempt++) {
+        try {
+          await uploadPending(pending);
+          pending = [];
+        } catch (error) {
+          if (attempt >= MAX_RESUME_ATTEMPTS) {
+            throw error;
+          }
+          console.warn(
+            `[UPLOAD] Upload interrupted, resuming (attempt ${attempt + 1})`,
+            error
+          );
+          const delay = RESUME_DELAY_MS * (attempt + 1);
+          await new Promise((resolve) => setTimeout(resolve, delay));
+
+          const resume = await api.post<ResumeResponse>(
+            `/api/v1/videos/chunked-upload/${newUploadId}/resume`,
+            {},
+            { headers: await authHeaders() }
+          );
+          Object.assign(urls, resume.data.presigned_urls);
+          pending = resume.data.missing_chunks;
+
+          completed.clear();
+          resume.data.uploaded_chunks.forEach((n) => completed.add(n));
+          setChunks((prev) =>
+            prev.map((c) =>
+              completed.has(c.chunkNumber)
+                ? { ...c, status: "completed", progress: 100 }
+                : { ...c, status: "pending", progress: 0 }
+            )
+          );
+          setUploadProgress((completed.size / chunkCount) * 100);
+        }
       }
 
       // Debug log before completing
@@ -3,6 +3,7 @@ import { useParams } from "react-router-dom";
 import styles from "./VideoAnalysis.module.css";
 import api from "../../api/axios";
 import { useAuthToken } from "../../utils/auth";
+import { pickStreamUrl } from "../../utils/streamUrl";
 import { CommentIcon } from "../../components/Icons/CommentIcon";
 import { FullscreenIcon } from "../../components/Icons/FullScreenIcon";
 import { ExitFullscreenIcon } from "../../components/Icons/ExitFullScreenIcon";
@@ -93,7 +94,7 @@ const VideoAnalysis = ({ userInfo }: { userInfo: User | null }) => {
           }
         );
 
-        setVideoUrl(streamResponse.data.url);
+        setVideoUrl(pickStreamUrl(streamResponse.data));
 
         // Check if current user is the video owner
         if (userInfo && detailsResponse.data.user_id === userInfo.id) {
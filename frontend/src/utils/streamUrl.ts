@@ -0,0 +1,16 @@
+export interface StreamResponse {
+  url: string;
+  format?: "hls" | "mp4";
+  fallback_url?: string;
+}
+
+// Browsers without native HLS (most desktop Chrome/Firefox) get the original MP4
+export const pickStreamUrl = (stream: StreamResponse): string => {
+  if (stream.format === "hls" && stream.fallback_url) {
+    const video = document.createElement("video");
+    if (!video.canPlayType("application/vnd.apple.mpegurl")) {
+      return stream.fallback_url;
+    }
+  }
+  return stream.url;
+};